@@ -0,0 +1,680 @@
+#!/usr/bin/env python3
+"""
+Benchmarks de rendimiento del pipeline de alertas alimentarias.
+
+Cada benchmark genera datos sintéticos a partir de las muestras de data/scraps/,
+comprueba que la ruta optimizada produce el mismo resultado que la ruta original
+(paridad) y muestra los tiempos de ambas.
+
+Uso:
+    python benchmarks.py filter --rows 1000000
+    python benchmarks.py fda_dom --rows 100
+    python benchmarks.py stream --rows 200000
+    python benchmarks.py scoring --rows 500000
+    python benchmarks.py excel --rows 200000
+    python benchmarks.py render --rows 200000
+    python benchmarks.py cube --rows 1000000
+    python benchmarks.py dates --rows 1000000
+    python benchmarks.py startup --rows 5
+"""
+import os
+import sys
+import ast
+import json
+import time
+import random
+import html
+import inspect
+import argparse
+import tempfile
+import subprocess
+import tracemalloc
+
+import pandas as pd
+
+# Añadir directorio raíz al path para importaciones
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from config.settings import SCRAPS_DIR
+from config.product_categories import TARGET_CATEGORIES, RASFF_CATEGORY_MAPPING
+
+FDA_SAMPLE_PATH = os.path.join(SCRAPS_DIR, "fda_alerts_20250430.csv")
+RASFF_SAMPLE_PATH = os.path.join(SCRAPS_DIR, "rasff_alerts_20250430.csv")
+
+RASFF_OTHER_CATEGORIES = [
+    "fruits and vegetables", "fish and fish products", "meat and meat products (other than poultry)",
+    "herbs and spices", "dietetic foods, food supplements and fortified foods", "food contact materials"
+]
+RASFF_HAZARDS = [
+    "Listeria monocytogenes", "Salmonella", "aflatoxins", "undeclared milk", "ethylene oxide",
+    "foreign body", "labelling", "moulds", "pesticide residues", "too high count of Escherichia coli"
+]
+RASFF_COUNTRIES = ["Spain", "France", "Italy", "Germany", "India", "Türkiye", "China", "Poland", "United States"]
+
+def generate_fda_sample(rows, seed=42):
+    """
+    Genera un DataFrame sintético de FDA remuestreando el archivo de ejemplo.
+    
+    Args:
+        rows (int): Número de filas a generar.
+        seed (int, optional): Semilla para reproducibilidad.
+    
+    Returns:
+        pandas.DataFrame: DataFrame con las columnas del scraper de FDA.
+    """
+    base_df = pd.read_csv(FDA_SAMPLE_PATH)
+    return base_df.sample(n=rows, replace=True, random_state=seed).reset_index(drop=True)
+
+def generate_rasff_sample(rows, seed=42):
+    """
+    Genera un DataFrame sintético con el formato de exportación de RASFF Window.
+    
+    Args:
+        rows (int): Número de filas a generar.
+        seed (int, optional): Semilla para reproducibilidad.
+    
+    Returns:
+        pandas.DataFrame: DataFrame con las columnas de RASFF.
+    """
+    rng = random.Random(seed)
+    keywords = [kw for info in TARGET_CATEGORIES.values() for kw in info["keywords"]]
+    categories = list(RASFF_CATEGORY_MAPPING.keys()) + RASFF_OTHER_CATEGORIES
+    products = ["salmon", "chicken", "pepper", "tomatoes", "supplement", "tea", "olive oil"]
+    
+    data = {
+        "reference": [f"2025.{i:06d}" for i in range(rows)],
+        "date": [
+            f"{rng.randint(1, 28):02d}-{rng.randint(1, 12):02d}-{rng.randint(2020, 2025)} "
+            f"{rng.randint(0, 23):02d}:{rng.randint(0, 59):02d}:00"
+            for _ in range(rows)
+        ],
+        "subject": [
+            f"{rng.choice(RASFF_HAZARDS)} in {rng.choice(keywords if rng.random() < 0.4 else products)} from {rng.choice(RASFF_COUNTRIES)}"
+            for _ in range(rows)
+        ],
+        "category": [rng.choice(categories) for _ in range(rows)],
+        "hazards": [rng.choice(RASFF_HAZARDS) for _ in range(rows)],
+        "operator": [f"Operator {rng.randint(1, 500)}" for _ in range(rows)],
+        "origin": [rng.choice(RASFF_COUNTRIES) for _ in range(rows)],
+        "notifying_country": [rng.choice(RASFF_COUNTRIES) for _ in range(rows)],
+        "classification": [rng.choice(["alert notification", "border rejection notification", "information notification for attention"]) for _ in range(rows)],
+        "forAttention": [rng.choice(RASFF_COUNTRIES) for _ in range(rows)],
+        "forFollowUp": [rng.choice(RASFF_COUNTRIES) for _ in range(rows)],
+    }
+    return pd.DataFrame(data)
+
+def _timed(func, *args, **kwargs):
+    """Ejecuta una función y devuelve su resultado junto con el tiempo empleado en segundos."""
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+def _report(name, rows, seconds):
+    """Muestra una línea de resultados de un benchmark."""
+    rate = rows / seconds if seconds > 0 else float("inf")
+    print(f"  {name:<28} {seconds:10.3f} s  {rate:14,.0f} filas/s")
+
+def benchmark_filter(rows=1000000):
+    """
+    Compara el filtrado fila a fila con el filtrado vectorizado de FDA y RASFF.
+    
+    Args:
+        rows (int, optional): Número de filas sintéticas por fuente.
+    
+    Returns:
+        bool: True si ambos modos producen el mismo resultado.
+    """
+    from processors.data_filter import filter_fda_alerts, filter_rasff_alerts
+    
+    ok = True
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        sources = [
+            ("FDA", filter_fda_alerts, generate_fda_sample(rows)),
+            ("RASFF", filter_rasff_alerts, generate_rasff_sample(rows)),
+        ]
+        for source, filter_func, sample_df in sources:
+            file_path = os.path.join(tmp_dir, f"{source.lower()}_sample.csv")
+            sample_df.to_csv(file_path, index=False)
+            
+            print(f"\n[{source}] {rows:,} filas")
+            rowwise_df, rowwise_time = _timed(filter_func, file_path, vectorized=False)
+            vector_df, vector_time = _timed(filter_func, file_path, vectorized=True)
+            _report("fila a fila (apply)", rows, rowwise_time)
+            _report("vectorizado", rows, vector_time)
+            
+            same = rowwise_df.index.equals(vector_df.index) and rowwise_df.equals(vector_df)
+            print(f"  Paridad: {'OK' if same else 'FALLO'} ({len(vector_df):,} filas seleccionadas)")
+            ok = ok and same
+    
+    return ok
+
+def _same_unified(rowwise_df, vector_df):
+    """
+    Compara dos DataFrames con esquema unificado.
+    
+    El JSON original de RASFF se compara por contenido, ya que la ruta fila a fila
+    lo serializaba como representación de un diccionario de Python.
+    """
+    if list(rowwise_df.columns) != list(vector_df.columns) or len(rowwise_df) != len(vector_df):
+        return False
+    
+    is_rasff = rowwise_df['source_database'] == 'RASFF'
+    for column in rowwise_df.columns:
+        left = rowwise_df[column].astype(object)
+        right = vector_df[column].astype(object)
+        if column == 'original_data':
+            left = left.where(~is_rasff, left[is_rasff].map(ast.literal_eval))
+            right = right.where(~is_rasff, right[is_rasff].map(
+                lambda x: {k: v for k, v in json.loads(x).items() if v is not None}))
+        if not left.fillna("<NA>").equals(right.fillna("<NA>")):
+            print(f"  Diferencias en la columna: {column}")
+            return False
+    
+    return True
+
+def benchmark_schema(rows=1000000):
+    """
+    Compara la construcción fila a fila del esquema unificado con la vectorizada.
+    
+    Args:
+        rows (int, optional): Número de filas sintéticas por fuente.
+    
+    Returns:
+        bool: True si ambos modos producen el mismo resultado.
+    """
+    from processors.data_filter import map_to_unified_schema
+    
+    fda_df = generate_fda_sample(rows)
+    rasff_df = generate_rasff_sample(rows)
+    total_rows = len(fda_df) + len(rasff_df)
+    
+    print(f"\n[map_to_unified_schema] {total_rows:,} filas (FDA + RASFF)")
+    rowwise_df, rowwise_time = _timed(map_to_unified_schema, fda_df.copy(), rasff_df.copy(), vectorized=False)
+    vector_df, vector_time = _timed(map_to_unified_schema, fda_df.copy(), rasff_df.copy(), vectorized=True)
+    _report("fila a fila (apply)", total_rows, rowwise_time)
+    _report("vectorizado", total_rows, vector_time)
+    
+    same = _same_unified(rowwise_df, vector_df)
+    print(f"  Paridad: {'OK' if same else 'FALLO'}")
+    return same
+
+def write_fda_html_fixture(path, rows):
+    """
+    Guarda una página HTML con la tabla de retiradas de FDA tal como la renderiza DataTables.
+    
+    Args:
+        path (str): Ruta del archivo HTML.
+        rows (int): Número de filas de la tabla.
+    """
+    from scrapers.fda_http_scraper import FDA_COLUMNS
+    from scrapers.fda_fixture_server import render_fixture_row
+    
+    sample_df = generate_fda_sample(rows).astype(object)
+    sample_df = sample_df.where(sample_df.notna(), "").astype(str)
+    header = "".join(f"<th>{html.escape(column)}</th>" for column in FDA_COLUMNS)
+    body = "".join(
+        f'<tr role="row">{"".join(f"<td>{cell}</td>" for cell in render_fixture_row(record))}</tr>'
+        for record in sample_df.to_dict('records')
+    )
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(
+            '<!DOCTYPE html><html><head><meta charset="utf-8"></head><body>'
+            f'<table id="datatable"><thead><tr role="row">{header}</tr></thead>'
+            f'<tbody>{body}</tbody></table></body></html>'
+        )
+
+def benchmark_fda_dom(rows=100, pages=5):
+    """
+    Compara la extracción celda a celda con la extracción en bloque del scraper de Selenium.
+    
+    Carga en Chrome (headless) una página HTML guardada con la tabla de FDA y cuenta
+    las llamadas a WebDriver y el tiempo por página de cada modo.
+    
+    Args:
+        rows (int, optional): Filas de la página de fixture.
+        pages (int, optional): Número de repeticiones (páginas) por modo.
+    
+    Returns:
+        bool: True si ambos modos producen los mismos registros.
+    """
+    from selenium import webdriver
+    from selenium.webdriver.common.by import By
+    from scrapers.fda_extraction import EXTRACTION_MODES, extract_page_records
+    
+    options = webdriver.ChromeOptions()
+    options.add_argument("--headless")
+    driver = webdriver.Chrome(options=options)
+    
+    # Contar los comandos enviados a WebDriver (los WebElement también usan driver.execute)
+    calls = {"count": 0}
+    execute = driver.execute
+    def counting_execute(*args, **kwargs):
+        calls["count"] += 1
+        return execute(*args, **kwargs)
+    driver.execute = counting_execute
+    
+    results = {}
+    try:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            fixture_path = os.path.join(tmp_dir, "fda_datatable.html")
+            write_fda_html_fixture(fixture_path, rows)
+            driver.get(f"file://{fixture_path}")
+            table = driver.find_element(By.ID, "datatable")
+            
+            print(f"\n[FDA Selenium] {rows:,} filas por página, {pages} páginas")
+            for mode in EXTRACTION_MODES:
+                calls["count"] = 0
+                start = time.perf_counter()
+                for _ in range(pages):
+                    records = extract_page_records(driver, mode=mode, table=table)
+                seconds = (time.perf_counter() - start) / pages
+                results[mode] = records
+                print(f"  {mode:<28} {seconds:10.3f} s/página  {calls['count'] / pages:10,.0f} llamadas/página")
+    finally:
+        driver.quit()
+    
+    same = results["bulk"] == results["cells"] and len(results["bulk"]) == rows
+    print(f"  Paridad: {'OK' if same else 'FALLO'} ({len(results['bulk']):,} registros por página)")
+    return same
+
+def _peak_memory(func, *args, **kwargs):
+    """Ejecuta una función y devuelve su resultado, el tiempo empleado y el pico de memoria (tracemalloc)."""
+    tracemalloc.start()
+    try:
+        result, seconds = _timed(func, *args, **kwargs)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return result, seconds, peak
+
+def benchmark_stream(rows=200000, chunksize=20000):
+    """
+    Compara el procesamiento por lotes con el procesamiento por bloques (streaming).
+    
+    Ambos modos cargan los mismos CSV sintéticos en almacenes consolidados vacíos;
+    se comparan su contenido y el pico de memoria de Python.
+    
+    Args:
+        rows (int, optional): Número de filas sintéticas por fuente.
+        chunksize (int, optional): Filas por bloque en el modo streaming.
+    
+    Returns:
+        bool: True si ambos almacenes contienen las mismas alertas.
+    """
+    from processors.alert_store import AlertStore
+    from processors.data_filter import process_and_filter_data, iter_unified_chunks
+    from processors.data_merger import update_consolidated_dataset, stream_into_consolidated_dataset
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        fda_path = os.path.join(tmp_dir, "fda_alerts_sample.csv")
+        rasff_path = os.path.join(tmp_dir, "rasff_window_sample.csv")
+        generate_fda_sample(rows).to_csv(fda_path, index=False)
+        generate_rasff_sample(rows).to_csv(rasff_path, index=False)
+        batch_dir = os.path.join(tmp_dir, "batch_store")
+        stream_dir = os.path.join(tmp_dir, "stream_store")
+        
+        def run_batch():
+            processed_path = process_and_filter_data(fda_path, rasff_path, output_dir=tmp_dir)
+            return update_consolidated_dataset(processed_path, store_dir=batch_dir)
+        
+        def run_stream():
+            chunks = iter_unified_chunks(fda_path, rasff_path, chunksize=chunksize)
+            return stream_into_consolidated_dataset(chunks, store_dir=stream_dir)
+        
+        total_rows = rows * 2
+        print(f"\n[pipeline] {total_rows:,} filas (FDA + RASFF), bloques de {chunksize:,} filas")
+        _, batch_time, batch_peak = _peak_memory(run_batch)
+        _, stream_time, stream_peak = _peak_memory(run_stream)
+        _report("por lotes (batch)", total_rows, batch_time)
+        print(f"  {'':<28} pico de memoria: {batch_peak / 2**20:10.1f} MiB")
+        _report("por bloques (stream)", total_rows, stream_time)
+        print(f"  {'':<28} pico de memoria: {stream_peak / 2**20:10.1f} MiB")
+        
+        batch_df = AlertStore(batch_dir).read(sort=False)
+        stream_df = AlertStore(stream_dir).read(sort=False)
+        same = (
+            list(batch_df.columns) == list(stream_df.columns) and
+            batch_df.sort_values('alert_id').reset_index(drop=True).astype(str).equals(
+                stream_df.sort_values('alert_id').reset_index(drop=True).astype(str))
+        )
+        print(f"  Paridad: {'OK' if same else 'FALLO'} ({len(stream_df):,} alertas en el almacén)")
+    
+    return same
+
+def _score(unified_df, vectorized):
+    """Clasifica los riesgos de un DataFrame unificado y devuelve las columnas resultantes."""
+    from scripts.report_generator import AlertReportGenerator
+    
+    generator = AlertReportGenerator(use_cache=False)
+    generator.df = unified_df.copy()
+    generator.score_dataset(vectorized=vectorized)
+    return generator.df
+
+def _same_scores(rowwise_df, vector_df):
+    """Compara las columnas de clasificación de riesgos de dos DataFrames puntuados."""
+    columns = ['year', 'severidad_num', 'probabilidad_num', 'severidad', 'probabilidad',
+               'nivel_riesgo_num', 'nivel_riesgo']
+    for column in columns:
+        left = rowwise_df[column].astype(object).fillna("<NA>").astype(str)
+        right = vector_df[column].astype(object).fillna("<NA>").astype(str)
+        if not left.equals(right):
+            print(f"  Diferencias en la columna: {column}")
+            return False
+    return True
+
+def benchmark_scoring(rows=500000):
+    """
+    Compara la clasificación de riesgos fila a fila con la vectorizada.
+    
+    La paridad se comprueba sobre las muestras completas de data/scraps/ (FDA y
+    RASFF en el esquema unificado) y los tiempos sobre una muestra remuestreada.
+    
+    Args:
+        rows (int, optional): Número de filas para medir los tiempos.
+    
+    Returns:
+        bool: True si ambos modos producen la misma clasificación.
+    """
+    from processors.data_filter import map_to_unified_schema, _read_rasff_csv
+    
+    unified_df = map_to_unified_schema(pd.read_csv(FDA_SAMPLE_PATH), _read_rasff_csv(RASFF_SAMPLE_PATH))
+    
+    print(f"\n[paridad] {len(unified_df):,} alertas de las muestras de data/scraps/")
+    same = _same_scores(_score(unified_df, vectorized=False), _score(unified_df, vectorized=True))
+    print(f"  Paridad: {'OK' if same else 'FALLO'}")
+    
+    sample_df = unified_df.sample(n=rows, replace=True, random_state=42).reset_index(drop=True)
+    print(f"\n[clasificación de riesgos] {rows:,} filas")
+    rowwise_df, rowwise_time = _timed(_score, sample_df, vectorized=False)
+    vector_df, vector_time = _timed(_score, sample_df, vectorized=True)
+    _report("fila a fila (apply)", rows, rowwise_time)
+    _report("vectorizado", rows, vector_time)
+    
+    same_sample = _same_scores(rowwise_df, vector_df)
+    print(f"  Paridad: {'OK' if same_sample else 'FALLO'}")
+    return same and same_sample
+
+def _trim_row(row):
+    """Elimina las celdas vacías del final de una fila."""
+    row = list(row)
+    while row and row[-1] in (None, ""):
+        row.pop()
+    return tuple(row)
+
+def _sheet_values(excel_path):
+    """Lee los valores de todas las hojas de un libro Excel (sin estilos ni celdas vacías finales)."""
+    import openpyxl
+    
+    wb = openpyxl.load_workbook(excel_path, read_only=True)
+    try:
+        return {
+            ws.title: [_trim_row(row) for row in ws.iter_rows(values_only=True)]
+            for ws in wb.worksheets
+        }
+    finally:
+        wb.close()
+
+def benchmark_excel(rows=200000):
+    """
+    Compara el informe Excel construido en memoria con el generado en streaming (write_only).
+    
+    Args:
+        rows (int, optional): Número de alertas puntuadas del dataset sintético.
+    
+    Returns:
+        bool: True si ambos libros contienen los mismos valores en las mismas celdas.
+    """
+    from processors.data_filter import map_to_unified_schema, _read_rasff_csv
+    from scripts.report_generator import AlertReportGenerator
+    
+    unified_df = map_to_unified_schema(pd.read_csv(FDA_SAMPLE_PATH), _read_rasff_csv(RASFF_SAMPLE_PATH))
+    scored_df = _score(unified_df.sample(n=rows, replace=True, random_state=42).reset_index(drop=True),
+                       vectorized=True)
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        paths = {}
+        print(f"\n[informe Excel] {rows:,} alertas")
+        for engine, label in [("openpyxl", "libro en memoria (openpyxl)"), ("streaming", "streaming (write_only)")]:
+            generator = AlertReportGenerator(output_dir=os.path.join(tmp_dir, engine), use_cache=False,
+                                             excel_engine=engine)
+            generator.df = scored_df
+            paths[engine], seconds = _timed(generator.generate_excel_report)
+            _report(label, rows, seconds)
+        
+        same = _sheet_values(paths["openpyxl"]) == _sheet_values(paths["streaming"])
+        print(f"  Paridad: {'OK' if same else 'FALLO'}")
+    
+    return same
+
+def _file_bytes(paths):
+    """Lee el contenido de varios archivos."""
+    contents = {}
+    for name, path in paths.items():
+        with open(path, 'rb') as f:
+            contents[name] = f.read()
+    return contents
+
+def benchmark_render(rows=200000, workers=4):
+    """
+    Compara el dibujo en serie de las figuras de la presentación con el dibujo en un pool de procesos.
+    
+    Args:
+        rows (int, optional): Número de alertas puntuadas del dataset sintético.
+        workers (int, optional): Procesos del modo paralelo.
+    
+    Returns:
+        bool: True si las figuras son idénticas.
+    """
+    from processors.data_filter import map_to_unified_schema, _read_rasff_csv
+    from scripts.report_figures import presentation_figure_data, render_presentation_figures
+    from processors.alert_cube import AlertCube, REPORT_CUBE_DIMENSIONS
+    
+    unified_df = map_to_unified_schema(pd.read_csv(FDA_SAMPLE_PATH), _read_rasff_csv(RASFF_SAMPLE_PATH))
+    scored_df = _score(unified_df.sample(n=rows, replace=True, random_state=42).reset_index(drop=True),
+                       vectorized=True)
+    cube = AlertCube.build(scored_df, REPORT_CUBE_DIMENSIONS)
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        figures = {}
+        print(f"\n[figuras de la presentación] {rows:,} alertas, {workers} procesos")
+        for mode, mode_workers in [("serie", 1), ("paralelo", workers)]:
+            figure_dir = os.path.join(tmp_dir, mode)
+            os.makedirs(figure_dir)
+            paths, seconds = _timed(render_presentation_figures, presentation_figure_data(cube),
+                                    figure_dir, workers=mode_workers)
+            figures[mode] = _file_bytes(paths)
+            _report(f"figuras ({mode})", rows, seconds)
+            
+        same_figures = figures["serie"] == figures["paralelo"]
+        print(f"  Paridad de figuras: {'OK' if same_figures else 'FALLO'}")
+        
+    return same_figures
+
+def benchmark_cube(rows=1000000):
+    """
+    Compara los agregados calculados sobre las alertas con los leídos del cubo pre-agregado.
+    
+    Args:
+        rows (int, optional): Número de alertas puntuadas del dataset sintético.
+    
+    Returns:
+        bool: True si los conteos y las tablas cruzadas del cubo coinciden con los de pandas.
+    """
+    from processors.data_filter import map_to_unified_schema, _read_rasff_csv
+    from processors.alert_cube import AlertCube, REPORT_CUBE_DIMENSIONS
+    
+    unified_df = map_to_unified_schema(pd.read_csv(FDA_SAMPLE_PATH), _read_rasff_csv(RASFF_SAMPLE_PATH))
+    scored_df = _score(unified_df.sample(n=rows, replace=True, random_state=42).reset_index(drop=True),
+                       vectorized=True)
+    
+    def from_alerts():
+        return {
+            'risk': scored_df['nivel_riesgo'].value_counts(),
+            'countries': scored_df['country_origin'].value_counts(),
+            'hazards': scored_df['hazard_type'].dropna().value_counts(),
+            'by_category': pd.crosstab(scored_df['category'], scored_df['nivel_riesgo']),
+            'high_risk': scored_df.loc[scored_df['nivel_riesgo'] == 'Alto', 'category'].value_counts(),
+        }
+    
+    def from_cube(cube):
+        return {
+            'risk': cube.counts('nivel_riesgo'),
+            'countries': cube.counts('country_origin'),
+            'hazards': cube.counts('hazard_type'),
+            'by_category': cube.crosstab('category', 'nivel_riesgo'),
+            'high_risk': cube.filter(nivel_riesgo='Alto').counts('category'),
+        }
+    
+    print(f"\n[agregados de los informes] {rows:,} alertas")
+    expected, alerts_time = _timed(from_alerts)
+    cube, build_time = _timed(AlertCube.build, scored_df, REPORT_CUBE_DIMENSIONS)
+    result, cube_time = _timed(from_cube, cube)
+    _report("sobre las alertas", rows, alerts_time)
+    _report("construcción del cubo", rows, build_time)
+    _report(f"sobre el cubo ({len(cube):,} celdas)", rows, cube_time)
+    
+    same = all(
+        expected[name].equals(result[name]) and list(expected[name].index) == list(result[name].index)
+        for name in expected
+    )
+    print(f"  Paridad: {'OK' if same else 'FALLO'}")
+    return same
+
+def benchmark_dates(rows=1000000):
+    """
+    Compara la interpretación de fechas valor a valor (parse_date) con el motor por columna.
+    
+    Args:
+        rows (int, optional): Número de filas sintéticas por fuente.
+    
+    Returns:
+        bool: True si ambos modos producen las mismas fechas.
+    """
+    from utils.date_utils import parse_date, parse_date_column
+    
+    # Columna mixta como la de un almacén CSV: fechas de FDA (MM/DD/YYYY) y de RASFF (DD-MM-YYYY HH:MM:SS)
+    dates = pd.concat([generate_fda_sample(rows)['Date'], generate_rasff_sample(rows)['date']],
+                      ignore_index=True)
+    
+    print(f"\n[fechas] {len(dates):,} valores (FDA + RASFF)")
+    rowwise, rowwise_time = _timed(lambda: pd.to_datetime(dates.map(parse_date)))
+    vector, vector_time = _timed(parse_date_column, dates)
+    _report("valor a valor (strptime)", len(dates), rowwise_time)
+    _report("por columna", len(dates), vector_time)
+    
+    same = rowwise.astype('datetime64[ns]').equals(vector)
+    print(f"  Paridad: {'OK' if same else 'FALLO'}")
+    return same
+
+# Módulos pesados que el arranque de main.py no debe importar (se cargan en las etapas que los usan)
+STARTUP_DEFERRED_MODULES = ['pandas', 'numpy', 'matplotlib', 'seaborn', 'openpyxl', 'fpdf', 'selenium',
+                            'scripts.report_generator']
+STARTUP_IMPORT_BUDGET = 0.2  # segundos para importar main.py
+
+def _import_times(module):
+    """
+    Importa un módulo en un intérprete nuevo con -X importtime.
+    
+    Args:
+        module (str): Módulo a importar.
+    
+    Returns:
+        dict: Tiempo acumulado (segundos) del módulo y de cada módulo que importa
+            (sin los que carga el propio intérprete al arrancar).
+    """
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        capture_output=True, text=True, check=True, cwd=os.path.dirname(os.path.abspath(__file__))
+    )
+    # Cada importación de primer nivel aparece después de los módulos que importa
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        times[name.strip()] = int(cumulative) / 1e6
+        if name.strip() == module:
+            return times
+        if not name.startswith('  '):
+            times = {}
+    return times
+
+def _startup_side_effects():
+    """Importa main.py en un intérprete nuevo y devuelve los directorios creados y los handlers de logging."""
+    code = (
+        "import os, json, logging\n"
+        "created = []\n"
+        "os.makedirs = lambda path, *args, **kwargs: created.append(str(path))\n"
+        "import main\n"
+        "print(json.dumps({'makedirs': created, 'handlers': len(logging.getLogger().handlers)}))"
+    )
+    result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True,
+                            cwd=os.path.dirname(os.path.abspath(__file__)))
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+def benchmark_startup(repeat=5):
+    """
+    Mide el arranque de main.py con -X importtime y comprueba que no tiene efectos secundarios.
+    
+    Args:
+        repeat (int, optional): Número de arranques medidos (se toma el más rápido).
+    
+    Returns:
+        bool: True si el arranque no importa módulos pesados, no crea directorios ni
+            archivos de log y está dentro de STARTUP_IMPORT_BUDGET.
+    """
+    runs = [_import_times('main') for _ in range(repeat)]
+    times = min(runs, key=lambda run: run['main'])
+    
+    print(f"\n[arranque de main.py] {repeat} ejecuciones con -X importtime")
+    print(f"  {'import main':<28} {times['main']:10.3f} s  (límite {STARTUP_IMPORT_BUDGET:.3f} s)")
+    imported = sorted((item for item in times.items() if item[0] != 'main'), key=lambda item: item[1], reverse=True)
+    for name, seconds in imported[:5]:
+        print(f"  {name:<28} {seconds:10.3f} s")
+    
+    deferred = [module for module in STARTUP_DEFERRED_MODULES if module in times]
+    effects = _startup_side_effects()
+    print(f"  Módulos pesados importados: {', '.join(deferred) or 'ninguno'}")
+    print(f"  Directorios creados: {len(effects['makedirs'])}, handlers de logging: {effects['handlers']}")
+    
+    ok = (not deferred and not effects['makedirs'] and not effects['handlers']
+          and times['main'] <= STARTUP_IMPORT_BUDGET)
+    print(f"  Resultado: {'OK' if ok else 'FALLO'}")
+    return ok
+
+BENCHMARKS = {
+    "filter": benchmark_filter,
+    "schema": benchmark_schema,
+    "fda_dom": benchmark_fda_dom,
+    "stream": benchmark_stream,
+    "scoring": benchmark_scoring,
+    "excel": benchmark_excel,
+    "render": benchmark_render,
+    "cube": benchmark_cube,
+    "dates": benchmark_dates,
+    "startup": benchmark_startup,
+}
+
+def main():
+    """Función principal."""
+    parser = argparse.ArgumentParser(description='Benchmarks del pipeline de alertas alimentarias')
+    parser.add_argument('benchmark', choices=sorted(BENCHMARKS.keys()),
+                        help='Benchmark a ejecutar')
+    parser.add_argument('--rows', type=int, default=None,
+                        help='Número de filas sintéticas a generar (por defecto, el de cada benchmark)')
+    parser.add_argument('--repeat', type=int, default=None,
+                        help='Número de ejecuciones medidas (benchmark startup)')
+    
+    args = parser.parse_args()
+    
+    benchmark = BENCHMARKS[args.benchmark]
+    options = {name: value for name, value in (('rows', args.rows), ('repeat', args.repeat)) if value}
+    unsupported = [name for name in options if name not in inspect.signature(benchmark).parameters]
+    if unsupported:
+        parser.error(f"el benchmark {args.benchmark} no admite --{unsupported[0]}")
+    
+    ok = benchmark(**options)
+    return 0 if ok else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
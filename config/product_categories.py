@@ -1,6 +1,7 @@
 """
 Definición de categorías de productos para filtrado.
 """
+import re
 
 # Categorías objetivo para el filtrado
 TARGET_CATEGORIES = {
@@ -73,6 +74,156 @@ RASFF_CATEGORY_MAPPING = {
     "confectionery": "chocolate"
 }
 
+def _trie_regex(keywords):
+    """
+    Construye una expresión regular con forma de trie a partir de una lista de palabras.
+    
+    Factorizar los prefijos comunes ("pa(?:n|st(?:a|el|ry))" en lugar de
+    "pan|pasta|pastel|pastry") evita que el motor de expresiones regulares pruebe
+    cada palabra por separado en cada posición del texto. En cada posición, la
+    coincidencia devuelta es la palabra más larga.
+    
+    Args:
+        keywords (iterable): Palabras a combinar (ya normalizadas).
+        
+    Returns:
+        str: Patrón de expresión regular.
+    """
+    trie = {}
+    for keyword in keywords:
+        node = trie
+        for char in keyword:
+            node = node.setdefault(char, {})
+        node[""] = {}
+    
+    def build(node):
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else f"(?:{'|'.join(branches)})"
+        # Si aquí termina una palabra, el resto es opcional
+        return f"(?:{body})?" if "" in node else body
+    
+    return build(trie)
+
+class KeywordMatcher:
+    """
+    Buscador de palabras clave compilado una sola vez por configuración de categorías.
+    
+    Combina todas las palabras clave en una única expresión regular con forma de
+    trie. La búsqueda se hace con un lookahead para evaluar cada posición del texto
+    (incluidas coincidencias solapadas) en una sola pasada, y se conserva el orden
+    de prioridad de las categorías: gana la primera categoría de la configuración
+    que tenga alguna coincidencia.
+    """
+    
+    def __init__(self, categories):
+        """
+        Compila el buscador para una configuración de categorías.
+        
+        Args:
+            categories (dict): Diccionario con el formato de TARGET_CATEGORIES.
+        """
+        self.category_ids = list(categories.keys())
+        
+        # Prioridad de cada palabra clave: la de la primera categoría que la contiene
+        keyword_priority = {}
+        for index, category_info in enumerate(categories.values()):
+            for keyword in category_info["keywords"]:
+                keyword_priority.setdefault(keyword.lower(), index)
+        
+        # En una posición solo se obtiene la palabra más larga; las palabras clave
+        # que son prefijo suyo también coinciden ahí, así que se hereda su prioridad
+        self._priority = {
+            keyword: min(priority for prefix, priority in keyword_priority.items() if keyword.startswith(prefix))
+            for keyword in keyword_priority
+        }
+        
+        if keyword_priority:
+            trie_pattern = _trie_regex(keyword_priority)
+            # Patrón con lookahead (identifica la categoría en cada posición)
+            self.pattern = re.compile(f"(?=({trie_pattern}))")
+            # Patrón simple de "alguna palabra clave" (útil para filtrado vectorizado)
+            self.any_pattern = re.compile(trie_pattern)
+        else:
+            self.pattern = None
+            self.any_pattern = None
+    
+    def match(self, *texts):
+        """
+        Devuelve la categoría de mayor prioridad cuyas palabras clave aparecen en los textos.
+        
+        Args:
+            *texts (str): Textos a evaluar (se normalizan a minúsculas).
+            
+        Returns:
+            str: Identificador de la categoría, o None si no hay coincidencias.
+        """
+        if self.pattern is None:
+            return None
+        
+        best_priority = len(self.category_ids)
+        
+        for text in texts:
+            if not text:
+                continue
+            for m in self.pattern.finditer(text.lower()):
+                priority = self._priority[m.group(1)]
+                if priority < best_priority:
+                    best_priority = priority
+                    # No puede haber una categoría con mayor prioridad
+                    if priority == 0:
+                        return self.category_ids[0]
+        
+        if best_priority < len(self.category_ids):
+            return self.category_ids[best_priority]
+        return None
+    
+    def contains_any(self, *texts):
+        """
+        Indica si alguno de los textos contiene alguna palabra clave.
+        
+        Args:
+            *texts (str): Textos a evaluar (se normalizan a minúsculas).
+            
+        Returns:
+            bool: True si hay al menos una coincidencia.
+        """
+        if self.any_pattern is None:
+            return False
+        
+        return any(text and self.any_pattern.search(text.lower()) for text in texts)
+
+# Caché de buscadores compilados por configuración de categorías
+_MATCHER_CACHE = {}
+
+def get_keyword_matcher(categories=None):
+    """
+    Obtiene el buscador de palabras clave compilado para una configuración de categorías.
+    
+    El buscador se compila una sola vez por configuración y se reutiliza en llamadas posteriores.
+    
+    Args:
+        categories (dict, optional): Configuración de categorías. Por defecto, TARGET_CATEGORIES.
+        
+    Returns:
+        KeywordMatcher: Buscador compilado.
+    """
+    if categories is None:
+        categories = TARGET_CATEGORIES
+    
+    cache_key = tuple(
+        (category_id, tuple(category_info["keywords"]))
+        for category_id, category_info in categories.items()
+    )
+    
+    matcher = _MATCHER_CACHE.get(cache_key)
+    if matcher is None:
+        matcher = KeywordMatcher(categories)
+        _MATCHER_CACHE[cache_key] = matcher
+    
+    return matcher
+
 def is_target_product(product_type="", product_description="", source=""):
     """
     Evalúa si un producto pertenece a las categorías objetivo basándose en su tipo y descripción.
@@ -85,10 +236,6 @@ def is_target_product(product_type="", product_description="", source=""):
     Returns:
         bool: True si el producto pertenece a las categorías objetivo, False en caso contrario.
     """
-    # Normalizar texto a minúsculas
-    product_type_lower = product_type.lower() if product_type else ""
-    product_description_lower = product_description.lower() if product_description else ""
-    
     # Verificar mapeos directos según la fuente
     if source == "FDA" and product_type in FDA_CATEGORY_MAPPING:
         return True
@@ -97,10 +244,4 @@ def is_target_product(product_type="", product_description="", source=""):
         return True
     
     # Buscar palabras clave en el tipo y descripción del producto
-    for category in TARGET_CATEGORIES.values():
-        for keyword in category["keywords"]:
-            if (keyword.lower() in product_type_lower or 
-                keyword.lower() in product_description_lower):
-                return True
-    
-    return False
\ No newline at end of file
+    return get_keyword_matcher().contains_any(product_type, product_description)
@@ -13,14 +13,22 @@ PROCESSED_DIR = os.path.join(DATA_DIR, "processed")
 FINAL_DIR = os.path.join(DATA_DIR, "final")
 LOGS_DIR = os.path.join(BASE_DIR, "logs")
 
-# Crear directorios si no existen
-for directory in [DATA_DIR, RAW_DATA_DIR, SCRAPS_DIR, PROCESSED_DIR, FINAL_DIR, LOGS_DIR]:
-    os.makedirs(directory, exist_ok=True)
+# Directorios de trabajo (se crean al ejecutar el pipeline, no al importar la configuración)
+PROJECT_DIRECTORIES = [DATA_DIR, RAW_DATA_DIR, SCRAPS_DIR, PROCESSED_DIR, FINAL_DIR, LOGS_DIR]
+
+def ensure_directories():
+    """Crea los directorios de trabajo del proyecto si no existen."""
+    for directory in PROJECT_DIRECTORIES:
+        os.makedirs(directory, exist_ok=True)
 
 # Configuración de scraping
 SCRAPING_FREQUENCY = "weekly"  # diaria, semanal, mensual
 MAX_RETRIES = 3
 TIMEOUT = 30  # segundos
+SCRAPER_TIMEOUT = 1800  # segundos por scraper (ejecución completa)
+SCRAPER_MAX_PARALLEL = 2  # scrapers ejecutados simultáneamente (1 = secuencial)
+SCRAPER_IN_PROCESS = False  # ejecutar los scrapers en hilos del mismo proceso (comparten el pool de navegadores, pero un scraper colgado no se puede detener)
+WEBDRIVER_POOL_SIZE = 1  # navegadores Chrome reutilizables por ejecución
 
 # Nombres de archivos
 TIMESTAMP_FORMAT = "%Y%m%d"
@@ -28,11 +36,50 @@ FDA_FILENAME = f"fda_alerts_{datetime.now().strftime(TIMESTAMP_FORMAT)}.csv"
 RASFF_FILENAME = f"rasff_window_{datetime.now().strftime(TIMESTAMP_FORMAT)}.csv"
 PROCESSED_BAKERY_FILENAME = f"bakery_dairy_alerts_{datetime.now().strftime(TIMESTAMP_FORMAT)}.csv"
 FINAL_DATASET_FILENAME = "consolidated_bakery_dairy_alerts.csv"
+SCRAPE_STATE_FILENAME = "scrape_state.json"  # Marcas de agua de los scrapers incrementales (en data/scraps/)
+CONSOLIDATED_STORE_DIRNAME = "consolidated_store"  # Almacén particionado por fuente y mes
+REPORT_CACHE_DIRNAME = "report_cache"  # Dataset puntuado para los informes (en data/final/)
+PIPELINE_CACHE_FILENAME = "pipeline_stages.json"  # Claves y resultados de las etapas del pipeline (en data/final/)
+
+# Formato de almacenamiento de datos procesados y consolidados: "parquet" (requiere pyarrow) o "csv"
+STORAGE_FORMAT = "parquet"
+
+# Modo del procesamiento: "batch" (archivo procesado intermedio) o "stream" (por bloques, directo al almacén)
+PIPELINE_MODE = "batch"
+STREAM_CHUNK_SIZE = 50000  # filas de los CSV originales por bloque en modo "stream"
+
+# Generación del informe Excel: "streaming" (openpyxl write_only, memoria constante) u "openpyxl" (libro en memoria)
+EXCEL_ENGINE = "streaming"
+REPORT_RENDER_WORKERS = 1  # procesos para dibujar las figuras de la presentación (1 = secuencial; ver benchmarks.py render)
+REPORT_CONCURRENT = True  # convertir el notebook en segundo plano mientras se generan el Excel y la presentación
+NOTEBOOK_CONVERSION_TIMEOUT = 600  # segundos máximos de nbconvert antes de abortar la conversión
 
 # URLs de fuentes de datos
 FDA_URL = "https://www.fda.gov/safety/recalls-market-withdrawals-safety-alerts"
+
+# Origen de datos de la tabla de retiradas de FDA (endpoint AJAX de DataTables)
+FDA_BACKEND = "http"  # "http" (petición directa al origen de datos) o "selenium"
+FDA_DATATABLE_URL = "https://www.fda.gov/datatables/views/ajax"
+FDA_DATATABLE_PARAMS = {
+    "view_name": "recall_solr_index",
+    "order[0][column]": "0",  # fecha, de la más reciente a la más antigua (necesario para el modo incremental)
+    "order[0][dir]": "desc",
+    "view_display_id": "recall_datatable_block_1",
+    "search_api_fulltext": "",
+    "field_regulated_product_field": "All",
+    "field_terminated_recall": "All",
+}
+FDA_PAGE_SIZE = 1000  # filas por petición
+FDA_SELENIUM_EXTRACTION = "bulk"  # scraper de Selenium: "bulk" (un execute_script por página) o "cells"
 RASFF_URL = "https://webgate.ec.europa.eu/rasff-window/screen/search?searchQueries=eyJkYXRlIjp7InN0YXJ0UmFuZ2UiOiIiLCJlbmRSYW5nZSI6IiJ9LCJjb3VudHJpZXMiOnt9LCJ0eXBlIjp7fSwibm90aWZpY2F0aW9uU3RhdHVzIjp7fSwicHJvZHVjdCI6eyJwcm9kdWN0Q2F0ZWdvcnkiOltbMTg0MjddLFsxODQzNCwxODQzNV0sWzE4NDQwXSxbMTg0NTRdXX0sInJpc2siOnt9LCJyZWZlcmVuY2UiOiIiLCJzdWJqZWN0IjoiIn0%3D"
 
+# Formato de fecha de 'date.startRange' / 'date.endRange' en el JSON de búsqueda de RASFF Window
+RASFF_QUERY_DATE_FORMAT = "%d-%m-%Y %H:%M:%S"
+
+# Backfill histórico de RASFF por ventanas de fechas
+RASFF_BACKFILL_WINDOW_MONTHS = 3  # meses por exportación
+RASFF_BACKFILL_MAX_WORKERS = 2  # exportaciones simultáneas (un navegador por cada una)
+
 # Añadir el directorio del proyecto al path de Python
 # Esto ayuda a resolver problemas de importación de módulos
 import sys
@@ -0,0 +1,60 @@
+"""
+Script de conversión única de los datos de data/final/ al formato de almacenamiento columnar.
+
+Este script:
+1. Migra el CSV consolidado heredado (consolidated_bakery_dairy_alerts.csv) al
+   almacén particionado, si el almacén todavía no existe.
+2. Convierte las particiones de un almacén existente al formato indicado
+   (Parquet por defecto).
+"""
+import os
+import sys
+import argparse
+import logging
+
+# Añadir directorio raíz al path para importaciones
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from config.settings import FINAL_DIR, FINAL_DATASET_FILENAME, STORAGE_FORMAT
+from processors.alert_store import AlertStore
+from processors.storage import read_table
+
+def main():
+    """
+    Convierte los datos de data/final/ al formato de almacenamiento indicado.
+    """
+    parser = argparse.ArgumentParser(description='Conversión de data/final/ a formato columnar')
+    parser.add_argument('--format', choices=['parquet', 'csv'], default=STORAGE_FORMAT,
+                        help='Formato de destino')
+    args = parser.parse_args()
+    
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+    
+    print(f"=== Convirtiendo data/final/ a formato {args.format} ===")
+    
+    store = AlertStore(storage_format=args.format)
+    legacy_path = os.path.join(FINAL_DIR, FINAL_DATASET_FILENAME)
+    
+    # 1. Migrar el CSV consolidado heredado
+    if not store.exists():
+        if not os.path.exists(legacy_path):
+            print(f"No se encontró ni el almacén ({store.root_dir}) ni el CSV consolidado ({legacy_path})")
+            return 1
+        
+        legacy_df = read_table(legacy_path)
+        store.append(legacy_df)
+        print(f"CSV consolidado migrado: {len(legacy_df)} registros -> {store.root_dir}")
+        print(f"El archivo original se conserva en: {legacy_path}")
+    
+    # 2. Convertir las particiones del almacén existente
+    converted = store.convert(args.format)
+    print(f"Particiones convertidas: {converted}")
+    print(f"Almacén en formato {store.storage.name}: {store.total_rows} registros")
+    
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -11,42 +11,59 @@ Este script coordina:
 import os
 import sys
 import argparse
+import time
+import signal
 import logging
+import threading
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
 # Añadir directorio raíz al path para importaciones
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from config.settings import (
-    SCRAPS_DIR, PROCESSED_DIR, FINAL_DIR, 
-    FDA_FILENAME, RASFF_FILENAME
+    SCRAPS_DIR, LOGS_DIR, 
+    FDA_FILENAME, RASFF_FILENAME,
+    SCRAPER_TIMEOUT, SCRAPER_MAX_PARALLEL, SCRAPER_IN_PROCESS, FDA_BACKEND, PIPELINE_MODE,
+    STORAGE_FORMAT, EXCEL_ENGINE, ensure_directories
 )
-from processors.data_filter import process_and_filter_data
-from processors.data_merger import update_consolidated_dataset, get_dataset_statistics
-from scripts.report_generator import AlertReportGenerator
+from processors.pipeline_cache import PipelineStageCache, PIPELINE_STAGES, STAGE_MODULES, source_digest
 
-# Configurar logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler(f"logs/pipeline_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log"),
-        logging.StreamHandler()
-    ]
-)
+# Los módulos de procesamiento (pandas) y de informes (matplotlib, seaborn) se
+# importan al ejecutar las etapas que los usan, para que el arranque sea inmediato
 
 logger = logging.getLogger(__name__)
 
-def run_scraper(scraper_name):
+def configure_logging():
+    """Configura el log del pipeline: consola y un archivo con fecha y hora en logs/."""
+    os.makedirs(LOGS_DIR, exist_ok=True)
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        handlers=[
+            logging.FileHandler(os.path.join(LOGS_DIR, f"pipeline_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log")),
+            logging.StreamHandler()
+        ]
+    )
+
+# Scrapers que admiten el modo incremental (y, por tanto, la opción --full)
+INCREMENTAL_SCRAPERS = {"fda_http_scraper.py"}
+
+# Segundos de espera a la salida pendiente de un scraper una vez terminado su proceso
+SCRAPER_OUTPUT_DRAIN_TIMEOUT = 5
+
+def find_scrapers(scraper_name, fda_backend=FDA_BACKEND):
     """
-    Ejecuta un scraper específico.
+    Localiza los scripts de los scrapers solicitados.
     
     Args:
         scraper_name (str): Nombre del scraper a ejecutar ('fda', 'rasff' o 'all').
+        fda_backend (str, optional): Backend de FDA ('http' o 'selenium'). El backend
+            HTTP ejecuta el de Selenium como alternativa si falla.
         
     Returns:
-        bool: True si la ejecución fue exitosa, False en caso contrario.
+        list: Tuplas (nombre de la fuente, ruta al script) de los scrapers encontrados.
     """
     scrapers = []
     
@@ -55,45 +72,299 @@ def run_scraper(scraper_name):
     root_dir = os.path.dirname(os.path.abspath(__file__))
     
     if scraper_name == 'fda' or scraper_name == 'all':
+        # Backend HTTP (descarga directa del origen de datos de la tabla)
+        if fda_backend == 'http' and os.path.exists(os.path.join(scrapers_dir, "fda_http_scraper.py")):
+            scrapers.append(("FDA", os.path.join(scrapers_dir, "fda_http_scraper.py")))
         # Primero verificar en la carpeta scrapers
-        if os.path.exists(os.path.join(scrapers_dir, "fda_scraper.py")):
-            scrapers.append(os.path.join(scrapers_dir, "fda_scraper.py"))
+        elif os.path.exists(os.path.join(scrapers_dir, "fda_scraper.py")):
+            scrapers.append(("FDA", os.path.join(scrapers_dir, "fda_scraper.py")))
         # Si no existe, verificar en la carpeta scrapers/fda_adapter.py
         elif os.path.exists(os.path.join(scrapers_dir, "fda_adapter.py")):
-            scrapers.append(os.path.join(scrapers_dir, "fda_adapter.py"))
+            scrapers.append(("FDA", os.path.join(scrapers_dir, "fda_adapter.py")))
         # Si no existe, verificar en la raíz
         elif os.path.exists(os.path.join(root_dir, "fda_scraper.py")):
-            scrapers.append(os.path.join(root_dir, "fda_scraper.py"))
+            scrapers.append(("FDA", os.path.join(root_dir, "fda_scraper.py")))
         else:
             logger.error("No se encontró el scraper de FDA")
     
     if scraper_name == 'rasff' or scraper_name == 'all':
         # Primero verificar en la carpeta scrapers
         if os.path.exists(os.path.join(scrapers_dir, "rasff_scraper.py")):
-            scrapers.append(os.path.join(scrapers_dir, "rasff_scraper.py"))
+            scrapers.append(("RASFF", os.path.join(scrapers_dir, "rasff_scraper.py")))
         # Si no existe, verificar en la carpeta scrapers/rasff_adapter.py
         elif os.path.exists(os.path.join(scrapers_dir, "rasff_adapter.py")):
-            scrapers.append(os.path.join(scrapers_dir, "rasff_adapter.py"))
+            scrapers.append(("RASFF", os.path.join(scrapers_dir, "rasff_adapter.py")))
         # Si no existe, verificar en la raíz
         elif os.path.exists(os.path.join(root_dir, "rasff_scraper.py")):
-            scrapers.append(os.path.join(root_dir, "rasff_scraper.py"))
+            scrapers.append(("RASFF", os.path.join(root_dir, "rasff_scraper.py")))
         else:
             logger.error("No se encontró el scraper de RASFF")
     
-    success = True
-    for scraper in scrapers:
-        logger.info(f"Ejecutando scraper: {scraper}")
+    return scrapers
+
+def create_scrapers(scraper_name, fda_backend=FDA_BACKEND, full=False):
+    """
+    Crea las instancias de los scrapers solicitados para ejecutarlos en este proceso.
+    
+    Args:
+        scraper_name (str): Nombre del scraper a ejecutar ('fda', 'rasff' o 'all').
+        fda_backend (str, optional): Backend de FDA ('http' o 'selenium'). El backend
+            HTTP ejecuta el de Selenium como alternativa si falla.
+        full (bool, optional): Si es True, los scrapers incrementales descargan todos los datos.
+        
+    Returns:
+        list: Tuplas (nombre de la fuente, scraper) de los scrapers creados.
+    """
+    scrapers = []
+    
+    if scraper_name == 'fda' or scraper_name == 'all':
+        if fda_backend == 'http':
+            from scrapers.fda_http_scraper import FDAHttpScraper
+            scrapers.append(("FDA", FDAHttpScraper(incremental=not full)))
+        else:
+            from scrapers.fda_scraper import FDASeleniumScraper
+            scrapers.append(("FDA", FDASeleniumScraper()))
+    
+    if scraper_name == 'rasff' or scraper_name == 'all':
+        from scrapers.rasff_scraper import RasffScraper
+        scrapers.append(("RASFF", RasffScraper()))
+    
+    return scrapers
+
+def _run_scraper_in_process(name, scraper):
+    """
+    Ejecuta un scraper (BaseScraper) en el proceso actual.
+    
+    Args:
+        name (str): Nombre de la fuente (se usa como prefijo en el log).
+        scraper (BaseScraper): Scraper a ejecutar.
+        
+    Returns:
+        bool: True si el scraper terminó correctamente.
+    """
+    logger.info(f"[{name}] Ejecutando scraper: {scraper.name}")
+    if not scraper.run():
+        logger.error(f"[{name}] Error al ejecutar scraper {scraper.name}")
+        return False
+    
+    logger.info(f"[{name}] Scraper ejecutado exitosamente: {scraper.name}")
+    return True
+
+def _kill_process_group(process):
+    """
+    Detiene un subproceso y los procesos que ha lanzado (Chrome, chromedriver).
+    
+    Args:
+        process (subprocess.Popen): Proceso lanzado con start_new_session=True.
+    """
+    try:
+        if hasattr(os, "killpg"):
+            os.killpg(process.pid, signal.SIGKILL)
+        else:
+            process.kill()
+    except (ProcessLookupError, PermissionError):
+        pass
+
+def _run_scraper_process(name, scraper, timeout, args=None):
+    """
+    Ejecuta un scraper en un subproceso, registrando su salida con un prefijo propio.
+    
+    El scraper se lanza en su propio grupo de procesos: al superar el tiempo límite
+    se detiene el grupo completo, incluidos los navegadores que haya arrancado, que
+    de otro modo mantendrían abierta la salida y bloquearían su lectura.
+    
+    Args:
+        name (str): Nombre de la fuente (se usa como prefijo en el log).
+        scraper (str): Ruta al script del scraper.
+        timeout (float): Tiempo máximo de ejecución en segundos (None = sin límite).
+        args (list, optional): Argumentos adicionales para el scraper.
+        
+    Returns:
+        bool: True si el scraper terminó correctamente dentro del tiempo límite.
+    """
+    scraper_logger = logging.getLogger(f"scrapers.{name.lower()}")
+    logger.info(f"[{name}] Ejecutando scraper: {scraper}")
+    
+    try:
+        # -u: salida sin búfer para que las líneas lleguen al log según se producen
+        process = subprocess.Popen(
+            [sys.executable, "-u", scraper] + list(args or []),
+            stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+            text=True, errors='replace', start_new_session=True
+        )
+    except Exception as e:
+        logger.error(f"[{name}] Excepción al ejecutar scraper {scraper}: {e}")
+        return False
+    
+    def forward_output():
+        for line in process.stdout:
+            line = line.rstrip()
+            if line:
+                scraper_logger.info(f"[{name}] {line}")
+    
+    reader = threading.Thread(target=forward_output, name=f"scraper-output-{name}", daemon=True)
+    reader.start()
+    
+    timed_out = False
+    try:
+        returncode = process.wait(timeout=timeout or None)
+    except subprocess.TimeoutExpired:
+        timed_out = True
+        _kill_process_group(process)
+        returncode = process.wait()
+    
+    # Procesos huérfanos del scraper que siguen escribiendo en la salida
+    reader.join(SCRAPER_OUTPUT_DRAIN_TIMEOUT)
+    if reader.is_alive():
+        _kill_process_group(process)
+        reader.join(SCRAPER_OUTPUT_DRAIN_TIMEOUT)
+    if not reader.is_alive():
+        process.stdout.close()
+    
+    if timed_out:
+        logger.error(f"[{name}] El scraper superó el tiempo límite de {timeout} s y se ha detenido: {scraper}")
+        return False
+    
+    if returncode != 0:
+        logger.error(f"[{name}] Error al ejecutar scraper {scraper}: código de salida {returncode}")
+        return False
+    
+    logger.info(f"[{name}] Scraper ejecutado exitosamente: {scraper}")
+    return True
+
+def run_scraper(scraper_name, max_parallel=SCRAPER_MAX_PARALLEL, timeout=SCRAPER_TIMEOUT, fda_backend=FDA_BACKEND,
+                full=False, in_process=SCRAPER_IN_PROCESS):
+    """
+    Ejecuta los scrapers seleccionados, en paralelo hasta el límite indicado.
+    
+    Por defecto cada scraper se ejecuta en su propio subproceso, que se detiene al
+    superar el tiempo límite; su salida se registra con el prefijo de la fuente
+    ([FDA], [RASFF]). Con in_process=True se ejecutan en hilos de este proceso y
+    comparten el pool de navegadores de BaseScraper, de modo que una ejecución
+    completa arranca un solo Chrome (ver _run_scrapers_in_process).
+    
+    Args:
+        scraper_name (str): Nombre del scraper a ejecutar ('fda', 'rasff' o 'all').
+        max_parallel (int, optional): Número máximo de scrapers simultáneos (1 = secuencial).
+        timeout (float, optional): Tiempo máximo por scraper en segundos (None = sin límite).
+        fda_backend (str, optional): Backend de FDA ('http' o 'selenium').
+        full (bool, optional): Si es True, los scrapers incrementales descargan todos los datos.
+        in_process (bool, optional): Si es True, ejecuta los scrapers en este proceso.
+        
+    Returns:
+        bool: True si todos los scrapers se ejecutaron correctamente, False en caso contrario.
+    """
+    if in_process:
+        return _run_scrapers_in_process(scraper_name, max_parallel, timeout, fda_backend, full)
+    
+    scrapers = find_scrapers(scraper_name, fda_backend=fda_backend)
+    if not scrapers:
+        return False
+    
+    max_parallel = max(1, min(max_parallel or 1, len(scrapers)))
+    if max_parallel > 1:
+        logger.info(f"Ejecutando {len(scrapers)} scrapers en paralelo (máximo {max_parallel} simultáneos)")
+    
+    with ThreadPoolExecutor(max_workers=max_parallel) as executor:
+        futures = {
+            name: executor.submit(
+                _run_scraper_process, name, scraper, timeout,
+                ["--full"] if full and os.path.basename(scraper) in INCREMENTAL_SCRAPERS else None
+            )
+            for name, scraper in scrapers
+        }
+        results = {name: future.result() for name, future in futures.items()}
+    
+    failed = [name for name, ok in results.items() if not ok]
+    if failed:
+        logger.error(f"Scrapers con errores: {', '.join(failed)}")
+    
+    return not failed
+
+def _run_scrapers_in_process(scraper_name, max_parallel, timeout, fda_backend, full):
+    """
+    Ejecuta los scrapers en hilos de este proceso con un navegador compartido.
+    
+    El tiempo límite de cada scraper cuenta desde que empieza. Un hilo no se puede
+    detener desde fuera: el scraper que lo supera se marca como fallido, su hueco
+    pasa al siguiente scraper en cola y su hilo (daemon, no bloquea la salida del
+    programa) se abandona. Cuando el resto de scrapers ha terminado se cierran los
+    navegadores del pool, lo que hace fallar las llamadas pendientes a Selenium del
+    scraper abandonado.
+    
+    Args:
+        scraper_name (str): Nombre del scraper a ejecutar ('fda', 'rasff' o 'all').
+        max_parallel (int): Número máximo de scrapers simultáneos (1 = secuencial).
+        timeout (float): Tiempo máximo por scraper en segundos (None = sin límite).
+        fda_backend (str): Backend de FDA ('http' o 'selenium').
+        full (bool): Si es True, los scrapers incrementales descargan todos los datos.
+        
+    Returns:
+        bool: True si todos los scrapers se ejecutaron correctamente, False en caso contrario.
+    """
+    from scrapers.base_scraper import get_driver_pool
+    
+    scrapers = create_scrapers(scraper_name, fda_backend=fda_backend, full=full)
+    if not scrapers:
+        return False
+    
+    max_parallel = max(1, min(max_parallel or 1, len(scrapers)))
+    if max_parallel > 1:
+        logger.info(f"Ejecutando {len(scrapers)} scrapers en paralelo (máximo {max_parallel} simultáneos)")
+    
+    slots = threading.Semaphore(max_parallel)
+    changed = threading.Condition()
+    started = {}
+    results = {}
+    abandoned = set()
+    
+    def worker(name, scraper):
+        slots.acquire()
+        with changed:
+            started[name] = time.monotonic()
+            changed.notify_all()
+        
         try:
-            result = subprocess.run([sys.executable, scraper], check=True)
-            logger.info(f"Scraper ejecutado exitosamente: {scraper}")
-        except subprocess.CalledProcessError as e:
-            logger.error(f"Error al ejecutar scraper {scraper}: {e}")
-            success = False
+            ok = _run_scraper_in_process(name, scraper)
         except Exception as e:
-            logger.error(f"Excepción al ejecutar scraper {scraper}: {e}")
-            success = False
+            logger.error(f"[{name}] Excepción al ejecutar scraper: {e}")
+            ok = False
+        
+        with changed:
+            # El hueco de un scraper abandonado ya se cedió al superar el tiempo límite
+            if name not in abandoned:
+                results[name] = ok
+                slots.release()
+            changed.notify_all()
+    
+    for name, scraper in scrapers:
+        threading.Thread(target=worker, args=(name, scraper), name=f"scraper-{name}", daemon=True).start()
     
-    return success
+    with changed:
+        while len(results) < len(scrapers):
+            now = time.monotonic()
+            running = {name: start for name, start in started.items() if name not in results}
+            for name, start in running.items():
+                if timeout and now - start >= timeout:
+                    logger.error(f"[{name}] El scraper superó el tiempo límite de {timeout} s y se ha abandonado")
+                    results[name] = False
+                    abandoned.add(name)
+                    slots.release()
+            
+            deadlines = [start + timeout - now for name, start in running.items() if name not in results] if timeout else []
+            if len(results) < len(scrapers):
+                changed.wait(max(0, min(deadlines)) if deadlines else None)
+    
+    # Cerrar los navegadores (una sola vez por ejecución, no uno por fuente)
+    pool = get_driver_pool()
+    logger.info(f"Navegadores arrancados en esta ejecución: {pool.started}")
+    pool.close_all()
+    
+    failed = [name for name, ok in results.items() if not ok]
+    if failed:
+        logger.error(f"Scrapers con errores: {', '.join(failed)}")
+    
+    return not failed
 
 def move_files_to_scraps_dir():
     """
@@ -167,7 +438,10 @@ def are_recent_files_available():
     # Ningún archivo es reciente
     return False
 
-def run_pipeline(force_scrape=False, scraper='all', process_only=False, report=True, report_type='all'):
+def run_pipeline(force_scrape=False, scraper='all', process_only=False, report=True, report_type='all',
+                 max_parallel=SCRAPER_MAX_PARALLEL, scraper_timeout=SCRAPER_TIMEOUT, fda_backend=FDA_BACKEND,
+                 full_scrape=False, isolated_scrapers=not SCRAPER_IN_PROCESS, pipeline_mode=PIPELINE_MODE,
+                 recompute_stats=False, force_stages=()):
     """
     Ejecuta el pipeline completo de procesamiento de alertas alimentarias.
     
@@ -177,6 +451,17 @@ def run_pipeline(force_scrape=False, scraper='all', process_only=False, report=T
         process_only (bool): Si es True, solo procesa los datos existentes sin hacer scraping.
         report (bool): Si es True, genera informes al final del proceso.
         report_type (str): Tipo de informe a generar ('all', 'excel', 'pdf', 'executive').
+        max_parallel (int): Número máximo de scrapers ejecutados simultáneamente.
+        scraper_timeout (float): Tiempo máximo por scraper en segundos.
+        fda_backend (str): Backend del scraper de FDA ('http' o 'selenium').
+        full_scrape (bool): Si es True, desactiva el scraping incremental (resincronización completa).
+        isolated_scrapers (bool): Si es True, cada scraper se ejecuta en su propio subproceso.
+        pipeline_mode (str): 'batch' (archivo procesado intermedio) o 'stream' (por bloques,
+            directamente al almacén consolidado).
+        recompute_stats (bool): Si es True, recalcula las estadísticas leyendo todo el dataset
+            y las compara con el resumen mantenido de forma incremental.
+        force_stages (iterable): Etapas que se ejecutan, junto con las posteriores, aunque sus
+            entradas no hayan cambiado (ver processors.pipeline_cache; 'all' = todas).
         
     Returns:
         dict: Estadísticas del dataset consolidado y rutas a los informes generados.
@@ -184,10 +469,18 @@ def run_pipeline(force_scrape=False, scraper='all', process_only=False, report=T
     logger.info("Iniciando pipeline de alertas alimentarias")
     
     # Crear directorios si no existen
-    os.makedirs(SCRAPS_DIR, exist_ok=True)
-    os.makedirs(PROCESSED_DIR, exist_ok=True)
-    os.makedirs(FINAL_DIR, exist_ok=True)
-    os.makedirs('logs', exist_ok=True)
+    ensure_directories()
+    
+    from processors.data_filter import process_and_filter_data, iter_unified_chunks, find_raw_files
+    from processors.data_merger import (
+        update_consolidated_dataset, stream_into_consolidated_dataset, get_dataset_statistics
+    )
+    from processors.dataset_stats import load_statistics
+    from processors.alert_cube import dataset_fingerprint
+    
+    # Las etapas cuyas entradas no han cambiado desde la última ejecución se omiten
+    stages = PipelineStageCache(force=force_stages)
+    force_scrape = force_scrape or stages.is_forced('scrape')
     
     # 1. Ejecutar scrapers (a menos que se indique lo contrario)
     if not process_only:
@@ -196,7 +489,9 @@ def run_pipeline(force_scrape=False, scraper='all', process_only=False, report=T
         
         if need_scraping:
             logger.info(f"Ejecutando scrapers: {scraper}")
-            scraping_success = run_scraper(scraper)
+            scraping_success = run_scraper(scraper, max_parallel=max_parallel, timeout=scraper_timeout,
+                                           fda_backend=fda_backend, full=full_scrape,
+                                           in_process=not isolated_scrapers)
             
             if not scraping_success:
                 logger.warning("El proceso de scraping no se completó correctamente")
@@ -208,35 +503,134 @@ def run_pipeline(force_scrape=False, scraper='all', process_only=False, report=T
     else:
         logger.info("Modo de solo procesamiento. Omitiendo el scraping.")
     
-    # 2. Procesar y filtrar datos
-    logger.info("Procesando y filtrando datos")
-    processed_file_path = process_and_filter_data()
+    # Entradas del procesamiento: los archivos más recientes de cada fuente
+    fda_file_path, rasff_file_path = find_raw_files()
+    raw_inputs = {'fda': stages.digest(fda_file_path), 'rasff': stages.digest(rasff_file_path)}
     
-    if not processed_file_path:
-        logger.error("Error al procesar y filtrar datos")
-        return None
+    def store_artifacts(consolidated_path):
+        """Artefactos de la consolidación: el almacén y su huella tras la actualización."""
+        if not consolidated_path:
+            return None
+        return {"consolidated_path": consolidated_path, "paths": [consolidated_path],
+                "store_fingerprint": dataset_fingerprint(consolidated_path)}
     
-    # 3. Actualizar dataset consolidado
-    logger.info("Actualizando dataset consolidado")
-    consolidated_path = update_consolidated_dataset(processed_file_path)
+    def store_unchanged(artifacts):
+        """La consolidación solo se reutiliza si nadie ha modificado el almacén después."""
+        return dataset_fingerprint(artifacts["consolidated_path"]) == artifacts["store_fingerprint"]
     
-    if not consolidated_path:
-        logger.error("Error al actualizar el dataset consolidado")
-        return None
+    if pipeline_mode == 'stream':
+        # 2-3. Procesar, filtrar y añadir al dataset consolidado bloque a bloque
+        def run_stream():
+            logger.info("Procesando datos por bloques y actualizando el dataset consolidado")
+            return store_artifacts(stream_into_consolidated_dataset(
+                iter_unified_chunks(fda_file_path, rasff_file_path)
+            ))
+        
+        merged = stages.run('merge', {
+            'mode': 'stream', 'raw': raw_inputs,
+            'code': source_digest(STAGE_MODULES['filter'] + STAGE_MODULES['merge']),
+        }, run_stream, is_valid=store_unchanged)
+        
+        if not merged:
+            logger.error("Error al procesar los datos por bloques")
+            return None
+    else:
+        # 2. Procesar y filtrar datos
+        def run_filter():
+            logger.info("Procesando y filtrando datos")
+            processed_file_path = process_and_filter_data(fda_file_path, rasff_file_path)
+            return {"processed_path": processed_file_path, "paths": [processed_file_path]} if processed_file_path else None
+        
+        filtered = stages.run('filter', {
+            'raw': raw_inputs, 'code': source_digest(STAGE_MODULES['filter']), 'storage_format': STORAGE_FORMAT,
+        }, run_filter)
+        
+        if not filtered:
+            logger.error("Error al procesar y filtrar datos")
+            return None
+        
+        # 3. Actualizar dataset consolidado
+        def run_merge():
+            logger.info("Actualizando dataset consolidado")
+            return store_artifacts(update_consolidated_dataset(filtered["processed_path"]))
+        
+        merged = stages.run('merge', {
+            'mode': 'batch', 'processed': stages.digest(filtered["processed_path"]),
+            'code': source_digest(STAGE_MODULES['merge']),
+        }, run_merge, is_valid=store_unchanged)
+        
+        if not merged:
+            logger.error("Error al actualizar el dataset consolidado")
+            return None
+    
+    consolidated_path = merged["consolidated_path"]
+    store_inputs = {'store': merged["store_fingerprint"]}
+    
+    # 4. Obtener estadísticas (resumen mantenido al añadir alertas)
+    def run_stats():
+        if recompute_stats:
+            logger.info("Recalculando estadísticas a partir de todo el dataset consolidado")
+            incremental_stats = load_statistics(consolidated_path) if os.path.isdir(consolidated_path) else None
+            stats = get_dataset_statistics(consolidated_path, recompute=True)
+            if incremental_stats is not None and incremental_stats != stats:
+                logger.warning("Las estadísticas incrementales no coincidían con el recálculo completo. Se han corregido")
+            elif incremental_stats is not None:
+                logger.info("Las estadísticas incrementales coinciden con el recálculo completo")
+        else:
+            logger.info("Obteniendo estadísticas del dataset consolidado")
+            stats = get_dataset_statistics(consolidated_path)
+        
+        if 'error' in stats:
+            logger.error(f"Error al obtener estadísticas del dataset: {stats['error']}")
+            return None
+        return {"stats": stats}
     
-    # 4. Obtener estadísticas
-    logger.info("Calculando estadísticas del dataset consolidado")
-    stats = get_dataset_statistics(consolidated_path)
+    if recompute_stats:
+        stages.force.add('stats')
+    stats_artifacts = stages.run('stats', dict(store_inputs, code=source_digest(STAGE_MODULES['stats'])), run_stats)
+    if not stats_artifacts:
+        return None
+    stats = stats_artifacts["stats"]
     
     logger.info("Pipeline completado exitosamente")
     logger.info(f"Total de registros en dataset consolidado: {stats['total_records']}")
     
-    # 5. Generar informes (opcional)
+    # 5. Generar informes (opcional): puntuación de riesgos y después los informes
     report_paths = None
     if report:
-        logger.info(f"Generando informes ({report_type})")
-        report_generator = AlertReportGenerator()
-        report_paths = report_generator.generate_report(report_type=report_type)
+        def run_score():
+            from scripts.report_generator import AlertReportGenerator
+            
+            report_generator = AlertReportGenerator()
+            if not report_generator.load_and_process_data():
+                return None
+            cached = [report_generator.cache.data_path] if report_generator.cache else []
+            return {"rows": len(report_generator.df), "paths": cached}
+        
+        def run_reports():
+            nonlocal report_paths
+            from scripts.report_generator import AlertReportGenerator
+            
+            stages.run('score', dict(store_inputs, code=source_digest(STAGE_MODULES['score'])), run_score)
+            
+            logger.info(f"Generando informes ({report_type})")
+            report_paths = AlertReportGenerator().generate_report(report_type=report_type)
+            
+            # Solo se reutilizan los informes si se generaron todos
+            paths = list(report_paths.values()) if isinstance(report_paths, dict) else [report_paths]
+            if not all(paths):
+                return None
+            return {"reports": report_paths, "paths": paths}
+        
+        # Los nombres y el contenido de los informes llevan la fecha del informe: otro
+        # día se generan de nuevo aunque el almacén no haya cambiado
+        reports = stages.run('reports', dict(
+            store_inputs, report_type=report_type, excel_engine=EXCEL_ENGINE,
+            report_date=datetime.now().strftime('%Y-%m-%d'),
+            code=source_digest(STAGE_MODULES['score'] + STAGE_MODULES['reports']),
+        ), run_reports)
+        if reports:
+            report_paths = reports["reports"]
         
         if report_paths:
             if isinstance(report_paths, dict):
@@ -257,33 +651,60 @@ def run_pipeline(force_scrape=False, scraper='all', process_only=False, report=T
 
 def main():
     """Función principal."""
-    # Verificar que existan las carpetas necesarias
-    os.makedirs("logs", exist_ok=True)
-    
     # Configurar argumentos de línea de comandos
     parser = argparse.ArgumentParser(description='Pipeline de alertas alimentarias')
     parser.add_argument('--scrape', action='store_true', 
                         help='Forzar la ejecución de scrapers incluso si hay datos recientes')
     parser.add_argument('--scraper', choices=['fda', 'rasff', 'all'], default='all',
                         help='Especificar qué scraper ejecutar')
+    parser.add_argument('--fda-backend', choices=['http', 'selenium'], default=FDA_BACKEND,
+                        help='Backend del scraper de FDA (http usa Selenium como alternativa si falla)')
+    parser.add_argument('--full', action='store_true',
+                        help='Scraping completo en lugar de incremental (resincronización periódica)')
+    parser.add_argument('--max-parallel', type=int, default=SCRAPER_MAX_PARALLEL,
+                        help='Número máximo de scrapers ejecutados en paralelo (1 = secuencial)')
+    parser.add_argument('--scraper-timeout', type=float, default=SCRAPER_TIMEOUT,
+                        help='Tiempo máximo de ejecución de cada scraper en segundos')
+    parser.add_argument('--isolated', action='store_true', default=not SCRAPER_IN_PROCESS,
+                        help='Ejecutar cada scraper en su propio subproceso (un navegador por fuente)')
+    parser.add_argument('--in-process', dest='isolated', action='store_false',
+                        help='Ejecutar los scrapers en hilos de este proceso (un solo navegador compartido)')
     parser.add_argument('--process-only', action='store_true',
                         help='Solo procesar datos existentes, no hacer scraping')
+    parser.add_argument('--pipeline-mode', choices=['batch', 'stream'], default=PIPELINE_MODE,
+                        help='Procesamiento con archivo intermedio (batch) o por bloques directo al almacén (stream)')
     parser.add_argument('--no-report', dest='report', action='store_false',
                         help='No generar informes al final del proceso')
     parser.add_argument('--report-type', choices=['all', 'excel', 'pdf', 'executive'], default='all',
                         help='Tipo de informe a generar')
+    parser.add_argument('--recompute-stats', action='store_true',
+                        help='Recalcular las estadísticas leyendo todo el dataset y verificar el resumen incremental')
+    parser.add_argument('--force-stage', dest='force_stages', action='append', default=[],
+                        choices=PIPELINE_STAGES + ['all'],
+                        help='Ejecutar una etapa (y las posteriores) aunque sus entradas no hayan cambiado')
     
     parser.set_defaults(report=True)
     
     args = parser.parse_args()
     
+    # El archivo de log solo se crea si se va a ejecutar el pipeline (no con --help)
+    configure_logging()
+    
     # Ejecutar pipeline
     result = run_pipeline(
         force_scrape=args.scrape, 
         scraper=args.scraper,
         process_only=args.process_only,
         report=args.report,
-        report_type=args.report_type
+        report_type=args.report_type,
+        max_parallel=args.max_parallel,
+        scraper_timeout=args.scraper_timeout,
+        fda_backend=args.fda_backend,
+        full_scrape=args.full,
+        isolated_scrapers=args.isolated,
+        pipeline_mode=args.pipeline_mode,
+        recompute_stats=args.recompute_stats,
+        force_stages=args.force_stages
     )
     
     if result:
@@ -0,0 +1,195 @@
+"""
+Cubo de conteos de alertas pre-agregado.
+
+El cubo agrupa las alertas una sola vez por todas las dimensiones que usan los
+informes y las estadísticas (categoría, nivel de riesgo, año, país, fuente y
+peligro) y guarda el número de alertas de cada combinación. Los conteos por
+dimensión, las tablas cruzadas y los filtros se calculan después sobre el cubo,
+cuyo tamaño depende del número de combinaciones y no del número de alertas.
+
+Cada celda guarda además la posición de su primera alerta, de modo que los
+conteos del cubo se ordenan igual que value_counts() sobre las alertas (los
+empates se resuelven por orden de aparición).
+"""
+import os
+import hashlib
+import logging
+
+import pandas as pd
+
+from processors.alert_store import MANIFEST_FILENAME
+from processors.storage import get_storage_format
+
+logger = logging.getLogger(__name__)
+
+# Dimensiones del cubo de los informes (sobre el dataset puntuado)
+REPORT_CUBE_DIMENSIONS = ['category', 'nivel_riesgo', 'year', 'country_origin', 'source_database', 'hazard_type']
+
+# Dimensiones del cubo de estadísticas del dataset consolidado (sin puntuar)
+STATISTICS_CUBE_DIMENSIONS = ['source_database', 'category', 'country_origin']
+
+# Columnas cuyo mínimo y máximo se guardan por celda
+RANGE_COLUMNS = ['date']
+
+def dataset_fingerprint(data_path):
+    """
+    Calcula la huella de un dataset consolidado.
+    
+    Para el almacén particionado se usa el contenido del manifiesto (que cambia
+    con cada adición); para un archivo, su tamaño y fecha de modificación.
+    
+    Args:
+        data_path (str): Directorio del almacén o ruta a un archivo de datos.
+    
+    Returns:
+        str: Huella del dataset.
+    """
+    data_path = os.path.abspath(data_path)
+    digest = hashlib.sha256(data_path.encode('utf-8'))
+    
+    if os.path.isdir(data_path):
+        with open(os.path.join(data_path, MANIFEST_FILENAME), 'rb') as f:
+            digest.update(f.read())
+    else:
+        stat = os.stat(data_path)
+        digest.update(f"{stat.st_size}:{stat.st_mtime_ns}".encode('ascii'))
+    
+    return digest.hexdigest()
+
+class AlertCube:
+    """
+    Conteos de alertas por combinación de dimensiones.
+    
+    Columnas del cubo: las dimensiones, 'count' (alertas de la celda), 'first_row'
+    (posición de su primera alerta) y, si se pidieron, '<columna>_min' y '<columna>_max'.
+    """
+    
+    def __init__(self, data, dimensions):
+        """
+        Inicializa el cubo a partir de sus celdas.
+        
+        Args:
+            data (pandas.DataFrame): Celdas del cubo.
+            dimensions (list): Columnas de dimensión.
+        """
+        self.data = data
+        self.dimensions = list(dimensions)
+    
+    @classmethod
+    def build(cls, df, dimensions, range_columns=()):
+        """
+        Construye el cubo agrupando las alertas en una sola pasada.
+        
+        Args:
+            df (pandas.DataFrame): Alertas.
+            dimensions (list): Columnas de dimensión (las que no existan en df se omiten).
+            range_columns (iterable, optional): Columnas cuyo mínimo y máximo se guardan por celda.
+        
+        Returns:
+            AlertCube: Cubo construido.
+        """
+        dimensions = [d for d in dimensions if d in df.columns]
+        range_columns = [c for c in range_columns if c in df.columns]
+        
+        frame = df[dimensions + range_columns].reset_index(drop=True)
+        frame['first_row'] = range(len(frame))
+        
+        aggregations = {'count': ('first_row', 'size'), 'first_row': ('first_row', 'min')}
+        for column in range_columns:
+            aggregations[f'{column}_min'] = (column, 'min')
+            aggregations[f'{column}_max'] = (column, 'max')
+        
+        # dropna=False: las alertas sin valor en alguna dimensión también cuentan en los totales
+        data = frame.groupby(dimensions, dropna=False, observed=True, sort=False).agg(**aggregations)
+        return cls(data.reset_index(), dimensions)
+    
+    @property
+    def total(self):
+        """Número total de alertas."""
+        return int(self.data['count'].sum())
+    
+    def __len__(self):
+        """Número de celdas del cubo."""
+        return len(self.data)
+    
+    def filter(self, **values):
+        """
+        Devuelve el subcubo de las celdas con los valores indicados.
+        
+        Args:
+            **values: Valor de cada dimensión (por ejemplo, category='dairy').
+        
+        Returns:
+            AlertCube: Subcubo.
+        """
+        mask = pd.Series(True, index=self.data.index)
+        for dimension, value in values.items():
+            mask &= self.data[dimension] == value
+        return AlertCube(self.data[mask], self.dimensions)
+    
+    def counts(self, dimension):
+        """
+        Número de alertas por valor de una dimensión (sin nulos).
+        
+        Equivale a df[dimension].value_counts(): orden descendente por número de
+        alertas y, en caso de empate, por orden de aparición (o por el orden de las
+        categorías si la dimensión es categórica).
+        
+        Args:
+            dimension (str): Dimensión.
+        
+        Returns:
+            pandas.Series: Conteos indexados por valor.
+        """
+        grouped = self.data.groupby(dimension, observed=True, dropna=True, sort=True).agg(
+            count=('count', 'sum'), first_row=('first_row', 'min')
+        )
+        if not isinstance(self.data[dimension].dtype, pd.CategoricalDtype):
+            grouped = grouped.sort_values('first_row', kind='stable')
+        return grouped['count'].sort_values(ascending=False, kind='stable').astype('int64')
+    
+    def nunique(self, dimension):
+        """Número de valores distintos (no nulos) de una dimensión."""
+        return int(self.data[dimension].dropna().nunique())
+    
+    def crosstab(self, index, columns):
+        """
+        Tabla cruzada de alertas entre dos dimensiones (equivale a pd.crosstab).
+        
+        Args:
+            index (str): Dimensión de las filas.
+            columns (str): Dimensión de las columnas.
+        
+        Returns:
+            pandas.DataFrame: Conteos con las celdas vacías a 0.
+        """
+        table = self.data.pivot_table(
+            index=index, columns=columns, values='count', aggfunc='sum', fill_value=0, observed=True
+        )
+        return table.astype('int64')
+    
+    def value_range(self, column):
+        """
+        Mínimo y máximo de una columna guardada con range_columns.
+        
+        Returns:
+            tuple: (mínimo, máximo), None si no hay valores.
+        """
+        minimum = self.data[f'{column}_min'].min() if len(self.data) else None
+        maximum = self.data[f'{column}_max'].max() if len(self.data) else None
+        return (None if pd.isna(minimum) else minimum, None if pd.isna(maximum) else maximum)
+    
+    def save(self, path):
+        """
+        Guarda las celdas del cubo en Parquet.
+        
+        Las columnas se guardan con sus tipos tal cual (sin normalize_dtypes): si una
+        dimensión de texto pasara a categórica, counts() desempataría por el orden
+        alfabético de las categorías en lugar de por orden de aparición.
+        """
+        self.data.to_parquet(path, index=False)
+    
+    @classmethod
+    def load(cls, path, dimensions):
+        """Carga un cubo guardado con save()."""
+        return cls(get_storage_format("parquet").read(path), dimensions)
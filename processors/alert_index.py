@@ -0,0 +1,170 @@
+"""
+Índice persistente de identificadores de alertas del almacén consolidado.
+
+Permite comprobar qué alertas ya existen sin cargar el histórico completo: los
+identificadores se guardan en una tabla SQLite junto al almacén y se actualizan
+en la misma transacción que la adición de datos.
+"""
+import os
+import sqlite3
+import logging
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+ALERT_INDEX_FILENAME = "alert_ids.sqlite"
+
+class AlertIndex:
+    """
+    Índice de identificadores de alertas almacenado en SQLite.
+    
+    Guarda, además de los identificadores, el número de filas del almacén en la
+    última sincronización para detectar si el índice ha quedado desfasado.
+    """
+    
+    def __init__(self, path):
+        """
+        Abre (o crea) el índice.
+        
+        Args:
+            path (str): Ruta al archivo SQLite.
+        """
+        self.path = path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS alert_ids (alert_id TEXT PRIMARY KEY) WITHOUT ROWID"
+        )
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)"
+        )
+        self.conn.commit()
+    
+    @classmethod
+    def for_store(cls, store):
+        """
+        Abre el índice situado junto a un almacén consolidado.
+        
+        Args:
+            store (AlertStore): Almacén consolidado.
+        
+        Returns:
+            AlertIndex: Índice del almacén.
+        """
+        return cls(os.path.join(store.root_dir, ALERT_INDEX_FILENAME))
+    
+    def close(self):
+        """Cierra la conexión con el índice."""
+        self.conn.close()
+    
+    def __len__(self):
+        return self.conn.execute("SELECT COUNT(*) FROM alert_ids").fetchone()[0]
+    
+    def _get_meta(self, key):
+        row = self.conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+    
+    def _set_meta(self, key, value):
+        self.conn.execute(
+            "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, str(value))
+        )
+    
+    def lookup(self, alert_ids):
+        """
+        Devuelve cuáles de los identificadores dados ya están en el índice.
+        
+        Args:
+            alert_ids (iterable): Identificadores a comprobar.
+        
+        Returns:
+            set: Identificadores presentes en el índice.
+        """
+        self.conn.execute("CREATE TEMP TABLE IF NOT EXISTS probe (alert_id TEXT PRIMARY KEY) WITHOUT ROWID")
+        self.conn.execute("DELETE FROM probe")
+        self.conn.executemany(
+            "INSERT OR IGNORE INTO probe (alert_id) VALUES (?)",
+            ((str(alert_id),) for alert_id in alert_ids)
+        )
+        rows = self.conn.execute(
+            "SELECT probe.alert_id FROM probe JOIN alert_ids ON probe.alert_id = alert_ids.alert_id"
+        ).fetchall()
+        self.conn.execute("DELETE FROM probe")
+        return {row[0] for row in rows}
+    
+    def add(self, alert_ids):
+        """
+        Añade identificadores al índice (dentro de la transacción en curso).
+        
+        Args:
+            alert_ids (iterable): Identificadores a añadir.
+        """
+        self.conn.executemany(
+            "INSERT OR IGNORE INTO alert_ids (alert_id) VALUES (?)",
+            ((str(alert_id),) for alert_id in alert_ids)
+        )
+    
+    @contextmanager
+    def transaction(self, store):
+        """
+        Agrupa la actualización del índice con una adición de datos al almacén.
+        
+        Los identificadores añadidos dentro del bloque solo se confirman si el bloque
+        termina sin errores; en ese caso también se registra el número de filas del
+        almacén para la comprobación de consistencia.
+        
+        Args:
+            store (AlertStore): Almacén consolidado que se está actualizando.
+        """
+        try:
+            yield self
+            self._set_meta("synced_rows", store.total_rows)
+            self.conn.commit()
+        except Exception:
+            self.conn.rollback()
+            raise
+    
+    def is_consistent(self, store):
+        """
+        Comprueba si el índice está sincronizado con el almacén.
+        
+        Args:
+            store (AlertStore): Almacén consolidado.
+        
+        Returns:
+            bool: True si el índice refleja el número de filas actual del almacén.
+        """
+        synced_rows = self._get_meta("synced_rows")
+        return synced_rows is not None and int(synced_rows) == store.total_rows
+    
+    def rebuild(self, store):
+        """
+        Reconstruye el índice a partir de la columna alert_id del almacén.
+        
+        Args:
+            store (AlertStore): Almacén consolidado.
+        
+        Returns:
+            int: Número de identificadores en el índice.
+        """
+        logger.info(f"Reconstruyendo índice de alertas: {self.path}")
+        with self.transaction(store):
+            self.conn.execute("DELETE FROM alert_ids")
+            if store.exists():
+                self.add(store.read_column('alert_id').dropna())
+        return len(self)
+    
+    def ensure_consistent(self, store):
+        """
+        Reconstruye el índice si no está sincronizado con el almacén.
+        
+        Args:
+            store (AlertStore): Almacén consolidado.
+        
+        Returns:
+            bool: True si fue necesario reconstruir el índice.
+        """
+        if self.is_consistent(store):
+            return False
+        
+        self.rebuild(store)
+        return True
@@ -0,0 +1,463 @@
+"""
+Almacén consolidado de alertas particionado por fuente y mes.
+
+En lugar de reescribir un único CSV con todo el histórico en cada ejecución,
+las alertas se guardan en un archivo por fuente y mes (solo se añaden filas)
+junto con un manifiesto que describe las particiones existentes.
+
+Cada adición se prepara en archivos temporales (<partición>.staged) y se
+confirma con un diario (append_journal.json) que contiene el manifiesto
+resultante: los archivos preparados sustituyen a las particiones y después se
+guarda el manifiesto. Si el proceso se interrumpe durante la confirmación, el
+diario se completa al abrir el almacén, de modo que las particiones nunca
+contienen filas que el manifiesto no recoja. Las reescrituras de las migraciones
+(rewrite_partitions) se confirman de la misma forma.
+"""
+import os
+import re
+import copy
+import json
+import logging
+from datetime import datetime
+
+import pandas as pd
+
+from config.settings import FINAL_DIR, CONSOLIDATED_STORE_DIRNAME
+from processors.storage import get_storage_format, normalize_dtypes
+from utils.date_utils import parse_date_column
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_FILENAME = "manifest.json"
+JOURNAL_FILENAME = "append_journal.json"
+STAGED_SUFFIX = ".staged"
+MANIFEST_VERSION = 1
+UNKNOWN_PARTITION = "unknown"
+
+def parse_alert_dates(dates):
+    """
+    Convierte una columna de fechas del esquema unificado a datetime.
+    
+    Las fechas se interpretan con el motor de fechas por columna
+    (utils.date_utils.parse_date_column); si la columna ya es datetime se devuelve tal cual.
+    
+    Args:
+        dates (pandas.Series): Fechas en formato MM/DD/YYYY (u otros formatos reconocibles).
+    
+    Returns:
+        pandas.Series: Fechas como datetime64 (NaT si no se pueden interpretar).
+    """
+    parsed = parse_date_column(dates)
+    
+    # Intentar interpretar el resto con el parser genérico de pandas
+    leftovers = parsed.isna() & dates.notna()
+    if leftovers.any():
+        parsed.loc[leftovers] = pd.to_datetime(dates[leftovers].astype(str), errors='coerce', format='mixed')
+    
+    return parsed
+
+class AlertStore:
+    """
+    Almacén de alertas de solo adición, particionado por fuente y mes.
+    
+    Estructura en disco:
+        <root>/manifest.json
+        <root>/<fuente>/<AAAA-MM>.<parquet|csv>
+    
+    El formato de las particiones se guarda en el manifiesto; un almacén existente
+    conserva su formato hasta que se convierte con convert().
+    """
+    
+    def __init__(self, root_dir=None, storage_format=None):
+        """
+        Inicializa el almacén.
+        
+        Args:
+            root_dir (str, optional): Directorio raíz del almacén. Por defecto, data/final/consolidated_store.
+            storage_format (str, optional): Formato para un almacén nuevo ('parquet' o 'csv').
+                Por defecto, STORAGE_FORMAT. Un almacén existente usa el formato de su manifiesto.
+        """
+        self.root_dir = root_dir or os.path.join(FINAL_DIR, CONSOLIDATED_STORE_DIRNAME)
+        self.manifest_path = os.path.join(self.root_dir, MANIFEST_FILENAME)
+        self.journal_path = os.path.join(self.root_dir, JOURNAL_FILENAME)
+        self._recover_pending_append()
+        self.manifest = self._load_manifest()
+        
+        # Los almacenes creados antes de existir el campo "format" son CSV
+        if self.exists():
+            self.storage = get_storage_format(self.manifest.get("format", "csv"))
+        else:
+            self.storage = get_storage_format(storage_format)
+        self.manifest["format"] = self.storage.name
+    
+    def exists(self):
+        """
+        Indica si el almacén ya contiene un manifiesto.
+        
+        Returns:
+            bool: True si el almacén existe.
+        """
+        return os.path.exists(self.manifest_path)
+    
+    @property
+    def total_rows(self):
+        """Número total de alertas en el almacén."""
+        return sum(p["rows"] for p in self.manifest["partitions"].values())
+    
+    def _load_manifest(self):
+        """Carga el manifiesto del almacén o crea uno vacío."""
+        if os.path.exists(self.manifest_path):
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        
+        return {
+            "version": MANIFEST_VERSION,
+            "format": None,
+            "columns": [],
+            "partitions": {},
+            "updated_at": None
+        }
+    
+    def _save_manifest(self):
+        """Guarda el manifiesto de forma atómica (archivo temporal + rename)."""
+        os.makedirs(self.root_dir, exist_ok=True)
+        self.manifest["updated_at"] = datetime.now().isoformat(timespec='seconds')
+        
+        tmp_path = f"{self.manifest_path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.manifest, f, indent=2, ensure_ascii=False)
+        os.replace(tmp_path, self.manifest_path)
+    
+    def _commit_append(self, manifest, partitions):
+        """
+        Confirma una adición (o reescritura) cuyas particiones ya están preparadas.
+        
+        Args:
+            manifest (dict): Manifiesto resultante de la adición.
+            partitions (list): Rutas relativas de las particiones preparadas.
+        """
+        journal = {"manifest": manifest, "partitions": partitions}
+        tmp_path = f"{self.journal_path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(journal, f, ensure_ascii=False)
+        os.replace(tmp_path, self.journal_path)
+        
+        self._replay_journal(journal)
+    
+    def _replay_journal(self, journal):
+        """Sustituye las particiones por sus versiones preparadas y guarda el manifiesto del diario."""
+        for relative_path in journal["partitions"]:
+            part_path = os.path.join(self.root_dir, *relative_path.split("/"))
+            if os.path.exists(part_path + STAGED_SUFFIX):
+                os.replace(part_path + STAGED_SUFFIX, part_path)
+        
+        self.manifest = journal["manifest"]
+        self._save_manifest()
+        os.remove(self.journal_path)
+    
+    def _recover_pending_append(self):
+        """Completa la adición de una ejecución interrumpida durante su confirmación."""
+        if not os.path.exists(self.journal_path):
+            return
+        
+        with open(self.journal_path, 'r', encoding='utf-8') as f:
+            journal = json.load(f)
+        logger.warning(f"Completando una modificación interrumpida del almacén consolidado: {self.journal_path}")
+        self._replay_journal(journal)
+    
+    @staticmethod
+    def _partition_keys(df):
+        """
+        Calcula la clave de partición (fuente/mes) de cada alerta.
+        
+        Args:
+            df (pandas.DataFrame): Alertas con esquema unificado.
+        
+        Returns:
+            tuple: (Serie con la clave de partición, Serie con las fechas interpretadas).
+        """
+        if 'date' in df.columns:
+            parsed_dates = parse_alert_dates(df['date'])
+        else:
+            parsed_dates = pd.Series(pd.NaT, index=df.index, dtype='datetime64[ns]')
+        
+        if 'source_database' in df.columns:
+            sources = df['source_database'].fillna(UNKNOWN_PARTITION).astype(str)
+        else:
+            sources = pd.Series(UNKNOWN_PARTITION, index=df.index)
+        # Evitar caracteres problemáticos en nombres de directorio
+        sources = sources.map(lambda s: re.sub(r'[^A-Za-z0-9_-]', '_', s) or UNKNOWN_PARTITION)
+        
+        months = parsed_dates.dt.strftime('%Y-%m').fillna(UNKNOWN_PARTITION)
+        return sources + "/" + months, parsed_dates
+    
+    def append(self, df):
+        """
+        Añade alertas al almacén escribiendo solo en las particiones afectadas.
+        
+        No comprueba duplicados: el llamador debe pasar únicamente alertas nuevas.
+        La adición es atómica: si falla la preparación de alguna partición, no se
+        modifica ninguna y el manifiesto queda como estaba.
+        
+        Args:
+            df (pandas.DataFrame): Alertas con esquema unificado.
+        
+        Returns:
+            list: Claves de las particiones modificadas.
+        """
+        if df.empty:
+            return []
+        
+        manifest = copy.deepcopy(self.manifest)
+        
+        # Fijar el orden de columnas con la primera escritura
+        if not manifest["columns"]:
+            manifest["columns"] = list(df.columns)
+        columns = manifest["columns"]
+        
+        extra_columns = [c for c in df.columns if c not in columns]
+        if extra_columns:
+            logger.warning(f"Columnas no presentes en el almacén, se descartan: {extra_columns}")
+        df = df.reindex(columns=columns)
+        
+        partition_keys, parsed_dates = self._partition_keys(df)
+        
+        touched = []
+        staged = []
+        try:
+            for key, part_df in df.groupby(partition_keys, sort=True):
+                relative_path = f"{key}{self.storage.extension}"
+                part_path = os.path.join(self.root_dir, *relative_path.split("/"))
+                os.makedirs(os.path.dirname(part_path), exist_ok=True)
+            
+                staged.append(part_path + STAGED_SUFFIX)
+                self.storage.write_appended(part_df, part_path, part_path + STAGED_SUFFIX)
+            
+                part_dates = parsed_dates.loc[part_df.index].dropna()
+                entry = manifest["partitions"].setdefault(key, {
+                    "path": relative_path,
+                    "rows": 0,
+                    "min_date": None,
+                    "max_date": None
+                })
+                entry["rows"] += len(part_df)
+                if not part_dates.empty:
+                    min_date = part_dates.min().strftime('%Y-%m-%d')
+                    max_date = part_dates.max().strftime('%Y-%m-%d')
+                    entry["min_date"] = min(filter(None, [entry["min_date"], min_date]))
+                    entry["max_date"] = max(filter(None, [entry["max_date"], max_date]))
+                touched.append(key)
+        except Exception:
+            for staged_path in staged:
+                if os.path.exists(staged_path):
+                    os.remove(staged_path)
+            raise
+        
+        self._commit_append(manifest, [manifest["partitions"][key]["path"] for key in touched])
+        logger.info(f"Almacén consolidado: {len(df)} alertas añadidas en {len(touched)} particiones")
+        return touched
+    
+    def _partition_paths(self):
+        """
+        Devuelve las rutas de las particiones ordenadas del mes más reciente al más antiguo.
+        
+        Las particiones sin fecha conocida se colocan al final.
+        """
+        entries = sorted(self.manifest["partitions"].items(), key=lambda item: item[0].split("/", 1)[0])
+        
+        def month_key(item):
+            month = item[0].split("/", 1)[1]
+            return "" if month == UNKNOWN_PARTITION else month
+        
+        # La ordenación es estable: dentro de un mismo mes se mantiene el orden por fuente
+        entries.sort(key=month_key, reverse=True)
+        
+        return [os.path.join(self.root_dir, *entry["path"].split("/")) for _, entry in entries]
+    
+    def read_column(self, column):
+        """
+        Lee una única columna de todas las particiones.
+        
+        Args:
+            column (str): Nombre de la columna.
+        
+        Returns:
+            pandas.Series: Valores de la columna.
+        """
+        series = [
+            self.storage.read(path, columns=[column])[column].astype(object)
+            for path in self._partition_paths() if os.path.exists(path)
+        ]
+        if not series:
+            return pd.Series([], name=column, dtype=object)
+        return pd.concat(series, ignore_index=True)
+    
+    def read(self, columns=None, sort=True):
+        """
+        Lee el contenido del almacén como un único DataFrame.
+        
+        Con sort=True, el resultado queda ordenado por fecha (de más reciente a más
+        antigua) ordenando cada partición por separado: al estar particionado por
+        mes, basta con concatenar las particiones de la más reciente a la más antigua.
+        
+        Args:
+            columns (list, optional): Columnas a leer. Por defecto, todas.
+            sort (bool, optional): Si es True, ordena por fecha descendente.
+        
+        Returns:
+            pandas.DataFrame: Alertas del almacén.
+        """
+        usecols = None
+        if columns is not None:
+            # Ignorar columnas que no existen en el almacén
+            columns = [c for c in columns if c in self.manifest["columns"]]
+            usecols = list(columns)
+            if sort and 'date' not in usecols and 'date' in self.manifest["columns"]:
+                usecols.append('date')
+        
+        frames = []
+        for path in self._partition_paths():
+            if not os.path.exists(path):
+                continue
+            part_df = self.storage.read(path, columns=usecols)
+            if sort and 'date' in part_df.columns and len(part_df) > 1:
+                order = parse_alert_dates(part_df['date']).sort_values(ascending=False, kind='mergesort').index
+                part_df = part_df.loc[order]
+            frames.append(part_df)
+        
+        if not frames:
+            return pd.DataFrame(columns=columns or self.manifest["columns"])
+        
+        df = pd.concat(frames, ignore_index=True)
+        if columns is not None:
+            df = df[list(columns)]
+        
+        # Las categóricas de distintas particiones se combinan como object al concatenar
+        if self.storage.name == "parquet":
+            df = normalize_dtypes(df)
+        return df
+    
+    def get_metadata(self, key, default=None):
+        """
+        Obtiene un valor de metadatos guardado en el manifiesto.
+        
+        Args:
+            key (str): Clave del metadato.
+            default: Valor por defecto si la clave no existe.
+        
+        Returns:
+            Valor del metadato.
+        """
+        return self.manifest.get("metadata", {}).get(key, default)
+    
+    def set_metadata(self, key, value):
+        """
+        Guarda un valor de metadatos en el manifiesto.
+        
+        Args:
+            key (str): Clave del metadato.
+            value: Valor serializable en JSON.
+        """
+        self.manifest.setdefault("metadata", {})[key] = value
+        self._save_manifest()
+    
+    def rewrite_partitions(self, transform, source=None, metadata=None):
+        """
+        Reescribe particiones aplicando una transformación a su contenido.
+        
+        Está pensado para migraciones puntuales; el flujo normal solo añade filas.
+        Como en append(), las particiones nuevas se preparan en archivos temporales
+        y se confirman todas a la vez con el diario junto con el manifiesto, de modo
+        que una interrupción no deja particiones a medio escribir.
+        
+        Args:
+            transform (callable): Función que recibe el DataFrame de una partición y devuelve el nuevo.
+            source (str, optional): Si se indica, solo se reescriben las particiones de esa fuente.
+            metadata (dict, optional): Metadatos que se guardan en el manifiesto en la misma confirmación.
+        
+        Returns:
+            int: Número de particiones reescritas.
+        """
+        manifest = copy.deepcopy(self.manifest)
+            
+        rewritten = []
+        try:
+            for key, entry in manifest["partitions"].items():
+                if source is not None and key.split("/", 1)[0] != source:
+                    continue
+            
+                part_path = os.path.join(self.root_dir, *entry["path"].split("/"))
+                if not os.path.exists(part_path):
+                    continue
+        
+                part_df = transform(self.storage.read(part_path))
+                rewritten.append(entry["path"])
+                self.storage.write(part_df, part_path + STAGED_SUFFIX)
+                entry["rows"] = len(part_df)
+        except Exception:
+            for relative_path in rewritten:
+                staged_path = os.path.join(self.root_dir, *relative_path.split("/")) + STAGED_SUFFIX
+                if os.path.exists(staged_path):
+                    os.remove(staged_path)
+            raise
+        
+        if metadata:
+            manifest.setdefault("metadata", {}).update(metadata)
+        self._commit_append(manifest, rewritten)
+        return len(rewritten)
+    
+    def export_csv(self, output_path):
+        """
+        Exporta la vista ordenada del almacén a un único CSV (compatibilidad).
+        
+        Args:
+            output_path (str): Ruta del CSV de salida.
+        
+        Returns:
+            str: Ruta del CSV generado.
+        """
+        df = self.read(sort=True)
+        
+        # Mantener el formato de fecha MM/DD/YYYY del CSV consolidado original
+        if 'date' in df.columns and pd.api.types.is_datetime64_any_dtype(df['date']):
+            df['date'] = df['date'].dt.strftime('%m/%d/%Y')
+        
+        df.to_csv(output_path, index=False)
+        logger.info(f"Almacén consolidado exportado a {output_path}: {len(df)} filas")
+        return output_path
+    
+    def convert(self, storage_format):
+        """
+        Convierte todas las particiones del almacén a otro formato de almacenamiento.
+        
+        Cada partición se reescribe en el nuevo formato y el archivo anterior se
+        elimina. El manifiesto se actualiza al final.
+        
+        Args:
+            storage_format (str): Formato de destino ('parquet' o 'csv').
+        
+        Returns:
+            int: Número de particiones convertidas.
+        """
+        target = get_storage_format(storage_format)
+        if target.name == self.storage.name:
+            logger.info(f"El almacén ya está en formato {target.name}")
+            return 0
+        
+        converted = 0
+        for key, entry in self.manifest["partitions"].items():
+            old_path = os.path.join(self.root_dir, *entry["path"].split("/"))
+            new_relative_path = f"{key}{target.extension}"
+            new_path = os.path.join(self.root_dir, *new_relative_path.split("/"))
+            
+            if os.path.exists(old_path):
+                target.write(self.storage.read(old_path), new_path)
+                os.remove(old_path)
+            entry["path"] = new_relative_path
+            converted += 1
+        
+        self.storage = target
+        self.manifest["format"] = target.name
+        self._save_manifest()
+        logger.info(f"Almacén convertido a {target.name}: {converted} particiones")
+        return converted
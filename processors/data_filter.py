@@ -2,7 +2,9 @@
 Módulo para filtrar datos de alertas alimentarias según categorías específicas.
 """
 import os
+import hashlib
 import pandas as pd
+import numpy as np
 import logging
 from datetime import datetime
 import sys
@@ -11,17 +13,69 @@ import sys
 root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.append(root_dir)
 
-from config.settings import SCRAPS_DIR, PROCESSED_DIR, PROCESSED_BAKERY_FILENAME
-from config.product_categories import is_target_product, TARGET_CATEGORIES, FDA_CATEGORY_MAPPING, RASFF_CATEGORY_MAPPING
+from config.settings import SCRAPS_DIR, PROCESSED_DIR, PROCESSED_BAKERY_FILENAME, STREAM_CHUNK_SIZE
+from config.product_categories import (
+    is_target_product, get_keyword_matcher, TARGET_CATEGORIES,
+    FDA_CATEGORY_MAPPING, RASFF_CATEGORY_MAPPING
+)
+from processors.storage import get_storage_format
+from utils.date_utils import parse_date_column, FDA_DATE_FORMATS, RASFF_DATE_FORMATS
 
 logger = logging.getLogger(__name__)
 
-def filter_fda_alerts(file_path):
+def _text_column(df, column):
+    """
+    Obtiene una columna como texto, con cadena vacía para valores nulos o columnas ausentes.
+    
+    Args:
+        df (pandas.DataFrame): DataFrame de origen.
+        column (str): Nombre de la columna.
+        
+    Returns:
+        pandas.Series: Serie de cadenas alineada con el índice del DataFrame.
+    """
+    if column not in df.columns:
+        return pd.Series("", index=df.index, dtype=object)
+    
+    return df[column].astype(object).where(df[column].notna(), "").astype(str)
+
+def target_product_mask(df, type_column, description_column, category_mapping):
+    """
+    Calcula de forma vectorizada qué filas pertenecen a las categorías objetivo.
+    
+    Equivale a aplicar is_target_product fila a fila, pero opera sobre columnas
+    completas: un isin contra el mapeo de categorías de la fuente y un
+    str.contains con el patrón compilado de palabras clave.
+    
+    Args:
+        df (pandas.DataFrame): DataFrame con los datos originales.
+        type_column (str): Columna con el tipo o categoría del producto.
+        description_column (str): Columna con la descripción del producto.
+        category_mapping (dict): Mapeo de categorías de la fuente (FDA o RASFF).
+        
+    Returns:
+        pandas.Series: Máscara booleana alineada con el índice del DataFrame.
+    """
+    product_type = _text_column(df, type_column)
+    product_description = _text_column(df, description_column)
+    
+    mask = product_type.isin(list(category_mapping.keys()))
+    
+    pattern = get_keyword_matcher().any_pattern
+    if pattern is not None:
+        mask |= product_type.str.lower().str.contains(pattern, na=False)
+        mask |= product_description.str.lower().str.contains(pattern, na=False)
+    
+    return mask.astype(bool)
+
+def filter_fda_alerts(file_path, vectorized=True):
     """
     Filtra alertas de la FDA relacionadas con las categorías objetivo.
     
     Args:
         file_path (str): Ruta al archivo CSV de alertas de la FDA.
+        vectorized (bool, optional): Si es True, calcula el filtro sobre columnas completas.
+            Si es False, evalúa is_target_product fila a fila.
         
     Returns:
         pandas.DataFrame: DataFrame con las alertas filtradas.
@@ -30,96 +84,336 @@ def filter_fda_alerts(file_path):
         df = pd.read_csv(file_path)
         logger.info(f"Leyendo datos de FDA desde {file_path}: {len(df)} filas")
         
-        # Filtrar por categorías objetivo
+        filtered_df = _select_fda_rows(df, vectorized)
+        logger.info(f"Datos de FDA filtrados: {len(filtered_df)} filas")
+        
+        return filtered_df
+    
+    except Exception as e:
+        logger.error(f"Error al filtrar datos de FDA: {e}")
+        return pd.DataFrame()
+
+def _select_fda_rows(df, vectorized=True):
+    """
+    Selecciona las alertas de FDA de las categorías objetivo y añade la columna de fuente.
+    
+    Args:
+        df (pandas.DataFrame): Datos de FDA (archivo completo o un bloque).
+        vectorized (bool, optional): Si es True, calcula el filtro sobre columnas completas.
+        
+    Returns:
+        pandas.DataFrame: Alertas filtradas.
+    """
+    # Filtrar por categorías objetivo
+    if vectorized:
+        filtered_df = df[target_product_mask(df, 'Product Type', 'Product Description', FDA_CATEGORY_MAPPING)]
+    else:
         filtered_df = df[df.apply(lambda row: is_target_product(
             product_type=str(row.get('Product Type', '')),
             product_description=str(row.get('Product Description', '')),
             source="FDA"
         ), axis=1)]
+    
+    # Crear una copia para evitar SettingWithCopyWarning
+    filtered_df = filtered_df.copy()
+    
+    # Añadir columna de fuente
+    filtered_df['Source'] = 'FDA'
+    
+    return filtered_df
+
+def filter_rasff_alerts(file_path, vectorized=True):
+    """
+    Filtra alertas de RASFF relacionadas con las categorías objetivo.
+    
+    Args:
+        file_path (str): Ruta al archivo CSV de alertas de RASFF.
+        vectorized (bool, optional): Si es True, calcula el filtro sobre columnas completas.
+            Si es False, evalúa is_target_product fila a fila.
         
-        logger.info(f"Datos de FDA filtrados: {len(filtered_df)} filas")
-        
-        # Crear una copia para evitar SettingWithCopyWarning
-        filtered_df = filtered_df.copy()
+    Returns:
+        pandas.DataFrame: DataFrame con las alertas filtradas.
+    """
+    try:
+        df = _read_rasff_csv(file_path)
+        logger.info(f"Leyendo datos de RASFF desde {file_path}: {len(df)} filas")
         
-        # Añadir columna de fuente
-        filtered_df['Source'] = 'FDA'
+        filtered_df = _select_rasff_rows(df, vectorized)
+        logger.info(f"Datos de RASFF filtrados: {len(filtered_df)} filas")
         
         return filtered_df
     
     except Exception as e:
-        logger.error(f"Error al filtrar datos de FDA: {e}")
+        logger.error(f"Error al filtrar datos de RASFF: {e}")
         return pd.DataFrame()
 
-def filter_rasff_alerts(file_path):
+def _read_rasff_csv(file_path, **kwargs):
     """
-    Filtra alertas de RASFF relacionadas con las categorías objetivo.
+    Lee una exportación de RASFF omitiendo las líneas mal formadas.
     
     Args:
         file_path (str): Ruta al archivo CSV de alertas de RASFF.
+        **kwargs: Argumentos adicionales para pandas.read_csv (por ejemplo, chunksize).
         
     Returns:
-        pandas.DataFrame: DataFrame con las alertas filtradas.
+        pandas.DataFrame | TextFileReader: Datos leídos (o lector por bloques).
     """
+    # Usar error_bad_lines=False (pandas < 1.3.0) o on_bad_lines='skip' (pandas >= 1.3.0)
     try:
-        # Usar error_bad_lines=False (pandas < 1.3.0) o on_bad_lines='skip' (pandas >= 1.3.0)
-        try:
-            # Para pandas >= 1.3.0
-            df = pd.read_csv(file_path, on_bad_lines='skip')
-        except TypeError:
-            # Para pandas < 1.3.0
-            df = pd.read_csv(file_path, error_bad_lines=False)
-            
-        logger.info(f"Leyendo datos de RASFF desde {file_path}: {len(df)} filas")
+        # Para pandas >= 1.3.0
+        return pd.read_csv(file_path, on_bad_lines='skip', **kwargs)
+    except TypeError:
+        # Para pandas < 1.3.0
+        return pd.read_csv(file_path, error_bad_lines=False, **kwargs)
+
+def _select_rasff_rows(df, vectorized=True):
+    """
+    Selecciona las alertas de RASFF de las categorías objetivo y añade la columna de fuente.
+    
+    Args:
+        df (pandas.DataFrame): Datos de RASFF (archivo completo o un bloque).
+        vectorized (bool, optional): Si es True, calcula el filtro sobre columnas completas.
         
-        # Filtrar por categorías objetivo
+    Returns:
+        pandas.DataFrame: Alertas filtradas.
+    """
+    # Filtrar por categorías objetivo
+    if vectorized:
+        filtered_df = df[target_product_mask(df, 'category', 'subject', RASFF_CATEGORY_MAPPING)]
+    else:
         filtered_df = df[df.apply(lambda row: is_target_product(
             product_type=str(row.get('category', '')),
             product_description=str(row.get('subject', '')),
             source="RASFF"
         ), axis=1)]
+    
+    # Crear una copia para evitar SettingWithCopyWarning
+    filtered_df = filtered_df.copy()
+    
+    # Añadir columna de fuente
+    filtered_df['Source'] = 'RASFF'
+    
+    return filtered_df
+
+def _format_column(series):
+    """
+    Convierte una columna a texto con el mismo resultado que formatearla con un f-string.
+    
+    Args:
+        series (pandas.Series): Columna a convertir.
         
-        logger.info(f"Datos de RASFF filtrados: {len(filtered_df)} filas")
+    Returns:
+        pandas.Series: Serie de cadenas ("nan" para valores nulos).
+    """
+    return series.astype(object).where(series.notna(), "nan").astype(str)
+
+def _records_to_json(df):
+    """
+    Serializa cada fila de un DataFrame como JSON con una única llamada a to_json.
+    
+    Args:
+        df (pandas.DataFrame): DataFrame a serializar.
         
-        # Crear una copia para evitar SettingWithCopyWarning
-        filtered_df = filtered_df.copy()
+    Returns:
+        pandas.Series: Serie con el JSON de cada fila, alineada con el índice del DataFrame.
+    """
+    if df.empty:
+        return pd.Series([], index=df.index, dtype=object)
+    
+    lines = df.to_json(orient='records', lines=True).rstrip("\n").split("\n")
+    return pd.Series(lines, index=df.index, dtype=object)
+
+def _categorize_products(unified_df, matcher):
+    """
+    Clasifica cada alerta del esquema unificado en una categoría objetivo.
+    
+    Args:
+        unified_df (pandas.DataFrame): DataFrame con esquema unificado.
+        matcher (KeywordMatcher): Buscador de palabras clave compilado.
         
-        # Añadir columna de fuente
-        filtered_df['Source'] = 'RASFF'
+    Returns:
+        pandas.Series: Categoría asignada a cada alerta ('other' si no hay coincidencias).
+    """
+    product_type = unified_df['product_type']
+    product_types = _text_column(unified_df, 'product_type').tolist()
+    product_names = _text_column(unified_df, 'product_name').tolist()
+    
+    categories = pd.Series(
+        [matcher.match(t, n) for t, n in zip(product_types, product_names)],
+        index=unified_df.index, dtype=object
+    )
+    
+    # Mapeos específicos para FDA y RASFF
+    source = unified_df['source_database']
+    fda_mapped = product_type.map(FDA_CATEGORY_MAPPING).where(source == 'FDA')
+    rasff_mapped = product_type.map(RASFF_CATEGORY_MAPPING).where(source == 'RASFF')
+    
+    categories = categories.fillna(fda_mapped).fillna(rasff_mapped).fillna('other')
+    return categories.astype(object)
+
+# Columnas de FDA que identifican una retirada (fecha, marca, descripción y empresa)
+FDA_ID_COLUMNS = ['Date', 'Brand Name(s)', 'Product Description', 'Company Name']
+
+def _normalize_id_text(value):
+    """Normaliza un valor para el cálculo de identificadores (minúsculas y espacios colapsados)."""
+    if value is None or (not isinstance(value, str) and pd.isna(value)):
+        return ""
+    return " ".join(str(value).split()).lower()
+
+def _normalize_id_date(value):
+    """Normaliza una fecha MM/DD/YYYY a YYYY-MM-DD para el cálculo de identificadores."""
+    text = _normalize_id_text(value)
+    try:
+        return datetime.strptime(text, '%m/%d/%Y').strftime('%Y-%m-%d')
+    except ValueError:
+        return text
+
+def _hash_alert_key(parts):
+    """Calcula un hash estable de 64 bits (16 caracteres hexadecimales) de las partes de la clave."""
+    key = "\x1f".join(parts)
+    return hashlib.blake2b(key.encode('utf-8'), digest_size=8).hexdigest()
+
+def fda_alert_id(date, brand, description, company):
+    """
+    Calcula el identificador estable de una alerta de FDA a partir de su contenido.
+    
+    El identificador no depende de la posición de la fila en el scraping, por lo
+    que la misma retirada obtiene siempre el mismo identificador. Retiradas
+    distintas con la misma clave obtienen el mismo valor; disambiguate_alert_ids
+    los distingue dentro de un conjunto de alertas.
+    
+    Args:
+        date (str): Fecha de la alerta (MM/DD/YYYY).
+        brand (str): Marca o marcas del producto.
+        description (str): Descripción del producto.
+        company (str): Nombre de la empresa.
         
-        return filtered_df
+    Returns:
+        str: Identificador con el formato FDA-<hash>.
+    """
+    parts = [
+        _normalize_id_date(date),
+        _normalize_id_text(brand),
+        _normalize_id_text(description),
+        _normalize_id_text(company)
+    ]
+    return f"FDA-{_hash_alert_key(parts)}"
+
+def disambiguate_alert_ids(alert_ids, seen=None):
+    """
+    Distingue los identificadores repetidos añadiendo su ordinal de aparición.
     
-    except Exception as e:
-        logger.error(f"Error al filtrar datos de RASFF: {e}")
-        return pd.DataFrame()
+    La primera alerta de cada identificador lo conserva sin cambios; las
+    siguientes reciben el sufijo -1, -2, ... en el orden del listado (la FDA
+    publica cada día en el mismo orden, por lo que el ordinal es estable entre
+    scrapings).
+    
+    Args:
+        alert_ids (pandas.Series): Identificadores calculados con fda_alert_id.
+        seen (dict, optional): Apariciones de cada identificador en los bloques
+            anteriores (modo streaming). Se actualiza con las de este bloque.
+    
+    Returns:
+        pandas.Series: Identificadores únicos alineados con la serie original.
+    """
+    ordinal = alert_ids.groupby(alert_ids, sort=False).cumcount()
+    if seen is not None:
+        ordinal += alert_ids.map(seen).fillna(0).astype(int)
+        for alert_id, count in alert_ids.value_counts().items():
+            seen[alert_id] = seen.get(alert_id, 0) + int(count)
+    repeated = ordinal > 0
+    if not repeated.any():
+        return alert_ids
+    
+    logger.info(f"{int(repeated.sum())} alertas de FDA comparten clave con otra; se distinguen por su ordinal")
+    return alert_ids.where(~repeated, alert_ids + "-" + ordinal.astype(str))
+
+def fda_alert_ids(fda_df, seen=None):
+    """
+    Calcula los identificadores estables de FDA normalizando las columnas completas.
+    
+    Equivale a aplicar fda_alert_id fila a fila y distinguir después las
+    colisiones con disambiguate_alert_ids.
+    
+    Args:
+        fda_df (pandas.DataFrame): DataFrame con datos de FDA.
+        seen (dict, optional): Apariciones de cada identificador en bloques anteriores
+            (ver disambiguate_alert_ids).
+        
+    Returns:
+        pandas.Series: Identificadores alineados con el índice del DataFrame.
+    """
+    normalized = {}
+    for column in FDA_ID_COLUMNS:
+        text = _text_column(fda_df, column)
+        normalized[column] = text.str.split().str.join(" ").str.lower().fillna("")
+    
+    # Fechas MM/DD/YYYY a YYYY-MM-DD; el resto se mantiene como texto normalizado
+    dates = normalized['Date']
+    parsed = pd.to_datetime(dates, format='%m/%d/%Y', errors='coerce')
+    normalized['Date'] = parsed.dt.strftime('%Y-%m-%d').where(parsed.notna(), dates)
+    
+    hashes = [
+        _hash_alert_key(parts)
+        for parts in zip(*(normalized[column].astype(str).tolist() for column in FDA_ID_COLUMNS))
+    ]
+    return disambiguate_alert_ids("FDA-" + pd.Series(hashes, index=fda_df.index, dtype=object), seen)
 
-def map_to_unified_schema(fda_df, rasff_df):
+def map_to_unified_schema(fda_df, rasff_df, vectorized=True, fda_id_counts=None):
     """
     Mapea los DataFrames a un esquema unificado.
     
+    La columna 'date' del resultado es datetime64 para todas las fuentes (ver
+    utils.date_utils.parse_date_column, con los formatos esperados de cada fuente
+    para resolver las fechas ambiguas); las fechas de RASFF se guardan sin hora.
+    
     Args:
         fda_df (pandas.DataFrame): DataFrame con datos de FDA.
         rasff_df (pandas.DataFrame): DataFrame con datos de RASFF.
+        vectorized (bool, optional): Si es True, construye las columnas con operaciones
+            sobre columnas completas. Si es False, usa la construcción fila a fila.
+        fda_id_counts (dict, optional): Apariciones de cada identificador de FDA en
+            bloques anteriores, para numerar las colisiones entre bloques.
         
     Returns:
         pandas.DataFrame: DataFrame con esquema unificado.
     """
     # Crear esquema unificado para FDA
     if not fda_df.empty:
+        if vectorized:
+            fda_ids = fda_alert_ids(fda_df, fda_id_counts)
+            fda_dates = parse_date_column(fda_df['Date'], preferred=FDA_DATE_FORMATS)
+            brand = fda_df['Brand Name(s)']
+            has_brand = brand.notna() & (_format_column(brand) != "")
+            product_name = pd.Series(
+                np.where(has_brand,
+                         _format_column(brand) + " - " + _format_column(fda_df['Product Description']),
+                         fda_df['Product Description'].astype(object)),
+                index=fda_df.index, dtype=object
+            )
+            original_data = _records_to_json(fda_df)
+        else:
+            fda_ids = disambiguate_alert_ids(fda_df.apply(lambda row: fda_alert_id(
+                row.get('Date'), row.get('Brand Name(s)'), row.get('Product Description'), row.get('Company Name')
+            ), axis=1).astype(object), fda_id_counts)
+            product_name = fda_df.apply(lambda row: f"{row['Brand Name(s)']} - {row['Product Description']}" 
+                                        if pd.notna(row['Brand Name(s)']) and row['Brand Name(s)'] else row['Product Description'], axis=1)
+            original_data = fda_df.apply(lambda x: x.to_json(), axis=1)
+            fda_dates = parse_date_column(fda_df['Date'], preferred=FDA_DATE_FORMATS)
+        
         unified_fda = pd.DataFrame({
-            'alert_id': fda_df.apply(lambda row: f"FDA-{row.name}", axis=1),
-            'date': fda_df['Date'],
-            'product_name': fda_df.apply(lambda row: f"{row['Brand Name(s)']} - {row['Product Description']}" 
-                                       if pd.notna(row['Brand Name(s)']) and row['Brand Name(s)'] else row['Product Description'], axis=1),
+            'alert_id': fda_ids,
+            'date': fda_dates,
+            'product_name': product_name,
             'product_type': fda_df['Product Type'],
             'hazard_type': fda_df['Recall Reason Description'],
             'company': fda_df['Company Name'],
             'country_origin': 'United States',
             'country_notification': 'United States',
             'source_database': 'FDA',
-            'source_id': fda_df.apply(lambda row: f"FDA-{row.name}", axis=1),
+            'source_id': fda_ids,
             'details': fda_df['Excerpt'],
-            'original_data': fda_df.apply(lambda x: x.to_json(), axis=1)
+            'original_data': original_data
         })
     else:
         unified_fda = pd.DataFrame()
@@ -136,9 +430,22 @@ def map_to_unified_schema(fda_df, rasff_df):
             if col not in rasff_df.columns:
                 rasff_df[col] = ""
         
+        if vectorized:
+            alert_ids = "RASFF-" + _format_column(rasff_df['reference'])
+            dates = parse_date_column(rasff_df['date'], preferred=RASFF_DATE_FORMATS).dt.normalize()
+            details = ("Classification: " + _format_column(rasff_df['classification']) +
+                       " | For Attention: " + _format_column(rasff_df['forAttention']) +
+                       " | For Follow-Up: " + _format_column(rasff_df['forFollowUp']))
+            original_data = _records_to_json(rasff_df)
+        else:
+            alert_ids = rasff_df['reference'].apply(lambda x: f"RASFF-{x}")
+            dates = parse_date_column(rasff_df['date'], preferred=RASFF_DATE_FORMATS).dt.normalize()
+            details = rasff_df.apply(lambda row: f"Classification: {row['classification']} | For Attention: {row['forAttention']} | For Follow-Up: {row['forFollowUp']}", axis=1)
+            original_data = rasff_df.apply(lambda x: {col: x[col] for col in rasff_df.columns if pd.notna(x[col])}, axis=1).apply(lambda x: str(x))
+        
         unified_rasff = pd.DataFrame({
-            'alert_id': rasff_df['reference'].apply(lambda x: f"RASFF-{x}"),
-            'date': rasff_df['date'].apply(lambda x: convert_rasff_date(x) if pd.notna(x) else x),
+            'alert_id': alert_ids,
+            'date': dates,
             'product_name': rasff_df['subject'],
             'product_type': rasff_df['category'],
             'hazard_type': rasff_df['hazards'],
@@ -147,8 +454,8 @@ def map_to_unified_schema(fda_df, rasff_df):
             'country_notification': rasff_df['notifying_country'],
             'source_database': 'RASFF',
             'source_id': rasff_df['reference'],
-            'details': rasff_df.apply(lambda row: f"Classification: {row['classification']} | For Attention: {row['forAttention']} | For Follow-Up: {row['forFollowUp']}", axis=1),
-            'original_data': rasff_df.apply(lambda x: {col: x[col] for col in rasff_df.columns if pd.notna(x[col])}, axis=1).apply(lambda x: str(x))
+            'details': details,
+            'original_data': original_data
         })
     else:
         unified_rasff = pd.DataFrame()
@@ -159,15 +466,23 @@ def map_to_unified_schema(fda_df, rasff_df):
     if unified_df.empty:
         return unified_df
     
+    # Fecha canónica (datetime64 también si alguna fuente no tenía filas)
+    unified_df['date'] = parse_date_column(unified_df['date'])
+    
     # Clasificar en categorías objetivo
+    matcher = get_keyword_matcher(TARGET_CATEGORIES)
+    
+    if vectorized:
+        unified_df['category'] = _categorize_products(unified_df, matcher)
+        return unified_df
+    
     def categorize_product(row):
-        product_type = str(row['product_type']).lower() if pd.notna(row['product_type']) else ""
-        product_name = str(row['product_name']).lower() if pd.notna(row['product_name']) else ""
+        product_type = str(row['product_type']) if pd.notna(row['product_type']) else ""
+        product_name = str(row['product_name']) if pd.notna(row['product_name']) else ""
         
-        for category_id, category_info in TARGET_CATEGORIES.items():
-            for keyword in category_info['keywords']:
-                if keyword.lower() in product_type or keyword.lower() in product_name:
-                    return category_id
+        category_id = matcher.match(product_type, product_name)
+        if category_id:
+            return category_id
         
         # Mapeos específicos para FDA y RASFF
         if row['source_database'] == 'FDA' and row['product_type'] in FDA_CATEGORY_MAPPING:
@@ -182,45 +497,12 @@ def map_to_unified_schema(fda_df, rasff_df):
     
     return unified_df
 
-def convert_rasff_date(date_str):
-    """
-    Convierte formato de fecha de RASFF a formato estándar.
-    
-    Args:
-        date_str (str): Fecha en formato RASFF (DD-MM-YYYY HH:MM:SS).
-        
-    Returns:
-        str: Fecha en formato MM/DD/YYYY.
-    """
-    try:
-        # Verificar si date_str es un valor válido
-        if not date_str or not isinstance(date_str, str):
-            return ""
-            
-        # Formato típico RASFF: "DD-MM-YYYY HH:MM:SS"
-        parts = date_str.split(' ')[0].split('-')
-        if len(parts) != 3:
-            return date_str
-        
-        try:
-            day = int(parts[0])
-            month = int(parts[1])
-            year = int(parts[2])
-        except ValueError:
-            return date_str
-        
-        # Formatear como MM/DD/YYYY
-        return f"{month:02d}/{day:02d}/{year}"
-    except Exception as e:
-        logger.error(f"Error al convertir fecha RASFF: {e}")
-        return date_str
-
-def process_and_filter_data():
+def find_raw_files():
     """
-    Procesa y filtra los datos de alertas alimentarias más recientes.
+    Localiza los archivos más recientes de FDA y RASFF obtenidos por los scrapers.
     
     Returns:
-        str: Ruta al archivo procesado.
+        tuple: (ruta al CSV de FDA, ruta al CSV de RASFF); None si no se encuentra.
     """
     # Buscar en múltiples ubicaciones posibles
     data_locations = [
@@ -261,6 +543,23 @@ def process_and_filter_data():
             rasff_file_path = rasff_files[0]
             logger.info(f"Encontrado archivo RASFF en: {rasff_file_path}")
     
+    return fda_file_path, rasff_file_path
+
+def process_and_filter_data(fda_file_path=None, rasff_file_path=None, output_dir=None):
+    """
+    Procesa y filtra los datos de alertas alimentarias más recientes.
+    
+    Args:
+        fda_file_path (str, optional): CSV de FDA. Por defecto, el más reciente encontrado.
+        rasff_file_path (str, optional): CSV de RASFF. Por defecto, el más reciente encontrado.
+        output_dir (str, optional): Directorio del archivo procesado. Por defecto, PROCESSED_DIR.
+    
+    Returns:
+        str: Ruta al archivo procesado.
+    """
+    if not fda_file_path and not rasff_file_path:
+        fda_file_path, rasff_file_path = find_raw_files()
+    
     if not fda_file_path and not rasff_file_path:
         logger.warning("No se encontraron archivos para procesar")
         return None
@@ -283,15 +582,76 @@ def process_and_filter_data():
         return None
     
     # Asegurarse de que el directorio de procesados existe
-    os.makedirs(PROCESSED_DIR, exist_ok=True)
+    output_dir = output_dir or PROCESSED_DIR
+    os.makedirs(output_dir, exist_ok=True)
     
-    # Guardar datos procesados
-    output_path = os.path.join(PROCESSED_DIR, PROCESSED_BAKERY_FILENAME)
-    unified_df.to_csv(output_path, index=False)
+    # Guardar datos procesados en el formato de almacenamiento configurado
+    storage = get_storage_format()
+    output_filename = os.path.splitext(PROCESSED_BAKERY_FILENAME)[0] + storage.extension
+    output_path = os.path.join(output_dir, output_filename)
+    storage.write(unified_df, output_path)
     logger.info(f"Datos procesados guardados en {output_path}: {len(unified_df)} filas")
     
     return output_path
 
+def iter_unified_chunks(fda_file_path=None, rasff_file_path=None, chunksize=STREAM_CHUNK_SIZE):
+    """
+    Lee, filtra y unifica los CSV de FDA y RASFF por bloques (modo streaming).
+    
+    Produce el mismo resultado que process_and_filter_data, primero las alertas
+    de FDA y después las de RASFF, pero sin cargar los archivos completos ni
+    escribir el archivo procesado intermedio: la memoria usada depende del
+    tamaño del bloque, no del de los archivos. Un error al leer o filtrar un
+    bloque se registra y se propaga.
+    
+    Args:
+        fda_file_path (str, optional): CSV de FDA. Por defecto, el más reciente encontrado.
+        rasff_file_path (str, optional): CSV de RASFF. Por defecto, el más reciente encontrado.
+        chunksize (int, optional): Filas de los archivos originales por bloque.
+    
+    Yields:
+        pandas.DataFrame: Bloque de alertas filtradas con esquema unificado.
+    """
+    if not fda_file_path and not rasff_file_path:
+        fda_file_path, rasff_file_path = find_raw_files()
+    
+    if not fda_file_path and not rasff_file_path:
+        logger.warning("No se encontraron archivos para procesar")
+        return
+    
+    sources = [
+        ("FDA", fda_file_path, lambda path: pd.read_csv(path, chunksize=chunksize), _select_fda_rows),
+        ("RASFF", rasff_file_path, lambda path: _read_rasff_csv(path, chunksize=chunksize), _select_rasff_rows),
+    ]
+    for source, file_path, read_chunks, select_rows in sources:
+        if not file_path:
+            continue
+        
+        total_rows = 0
+        selected_rows = 0
+        fda_id_counts = {}
+        try:
+            logger.info(f"Leyendo datos de {source} por bloques de {chunksize} filas desde {file_path}")
+            for chunk in read_chunks(file_path):
+                total_rows += len(chunk)
+                filtered_df = select_rows(chunk)
+                selected_rows += len(filtered_df)
+                if filtered_df.empty:
+                    continue
+                
+                if source == "FDA":
+                    unified_df = map_to_unified_schema(filtered_df, pd.DataFrame(), fda_id_counts=fda_id_counts)
+                else:
+                    unified_df = map_to_unified_schema(pd.DataFrame(), filtered_df)
+                yield unified_df
+        except Exception as e:
+            # Se propaga para que la ejecución falle como en modo batch en lugar de
+            # darse por buena con la fuente a medio ingerir
+            logger.error(f"Error al filtrar datos de {source} tras {total_rows} filas: {e}")
+            raise
+        
+        logger.info(f"Datos de {source} filtrados: {selected_rows} de {total_rows} filas")
+
 if __name__ == "__main__":
     # Configurar logging
     logging.basicConfig(
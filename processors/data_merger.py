@@ -2,26 +2,231 @@
 Módulo para unificar datasets de alertas alimentarias y actualizar el dataset consolidado.
 """
 import os
+import json
 import pandas as pd
 import logging
 from datetime import datetime
 
 from config.settings import PROCESSED_DIR, FINAL_DIR, FINAL_DATASET_FILENAME
+from processors.alert_store import AlertStore, parse_alert_dates
+from processors.alert_index import AlertIndex
+from processors.dataset_stats import (
+    empty_statistics, summarize_alerts, merge_statistics, load_statistics, save_statistics
+)
+from processors.storage import read_table
+from processors.data_filter import fda_alert_id, disambiguate_alert_ids
 
 logger = logging.getLogger(__name__)
 
-def update_consolidated_dataset(processed_file_path):
+# Columnas necesarias para calcular las estadísticas del dataset
+STATISTICS_COLUMNS = ['source_database', 'category', 'country_origin', 'date']
+
+# Esquema de identificadores de FDA (hash del contenido en lugar de la posición de la fila)
+FDA_ID_SCHEME = "content-hash-v1"
+LEGACY_FDA_ID_PATTERN = r'^FDA-\d+$'
+
+def _bootstrap_store_from_csv(store, legacy_csv_path):
+    """
+    Importa el CSV consolidado heredado a un almacén particionado vacío.
+    
+    Args:
+        store (AlertStore): Almacén de destino (sin datos).
+        legacy_csv_path (str): Ruta al CSV consolidado heredado.
+        
+    Returns:
+        int: Número de registros importados.
+    """
+    legacy_df = pd.read_csv(legacy_csv_path)
+    logger.info(f"Migrando dataset consolidado heredado {legacy_csv_path} al almacén particionado: {len(legacy_df)} filas")
+    store.append(legacy_df)
+    return len(legacy_df)
+
+def _rekey_legacy_fda_rows(df):
+    """
+    Sustituye los identificadores posicionales de FDA (FDA-<fila>) por identificadores estables.
+    
+    Los identificadores se recalculan a partir del registro original guardado en
+    'original_data'; las retiradas distintas con la misma clave se distinguen por
+    su ordinal (ver disambiguate_alert_ids).
+    
+    Args:
+        df (pandas.DataFrame): Partición del almacén con alertas de FDA.
+        
+    Returns:
+        pandas.DataFrame: Partición con los identificadores migrados.
+    """
+    legacy = df['alert_id'].astype(str).str.match(LEGACY_FDA_ID_PATTERN)
+    if not legacy.any() or 'original_data' not in df.columns:
+        return df
+    
+    def stable_id(original_json, current_id):
+        try:
+            original = json.loads(original_json)
+        except (TypeError, ValueError):
+            return current_id
+        return fda_alert_id(
+            original.get('Date'), original.get('Brand Name(s)'),
+            original.get('Product Description'), original.get('Company Name')
+        )
+    
+    df = df.copy()
+    new_ids = disambiguate_alert_ids(pd.Series([
+        stable_id(original_json, current_id)
+        for original_json, current_id in zip(df.loc[legacy, 'original_data'], df.loc[legacy, 'alert_id'])
+    ], index=df.index[legacy], dtype=object))
+    df.loc[legacy, 'alert_id'] = new_ids
+    if 'source_id' in df.columns:
+        df.loc[legacy, 'source_id'] = new_ids
+    
+    return df.drop_duplicates(subset='alert_id', keep='first')
+
+def migrate_legacy_fda_ids(store):
+    """
+    Migra una única vez los identificadores posicionales de FDA del almacén a identificadores estables.
+    
+    Args:
+        store (AlertStore): Almacén consolidado.
+        
+    Returns:
+        int: Número de particiones reescritas.
+    """
+    if store.get_metadata("fda_id_scheme") == FDA_ID_SCHEME:
+        return 0
+    
+    # El esquema se guarda en la misma confirmación que las particiones reescritas
+    rewritten = store.rewrite_partitions(_rekey_legacy_fda_rows, source='FDA',
+                                         metadata={"fda_id_scheme": FDA_ID_SCHEME})
+    if rewritten:
+        logger.info(f"Identificadores de FDA migrados a {FDA_ID_SCHEME} en {rewritten} particiones")
+    return rewritten
+
+def load_consolidated_dataset(path, columns=None):
+    """
+    Carga el dataset consolidado desde el almacén particionado o desde un CSV.
+    
+    La columna 'date' se devuelve siempre como datetime64, también para los
+    almacenes y archivos CSV, en los que se guarda como texto.
+    
+    Args:
+        path (str): Directorio del almacén particionado o ruta a un archivo CSV o Parquet.
+        columns (list, optional): Columnas a cargar. Por defecto, todas.
+        
+    Returns:
+        pandas.DataFrame: Dataset consolidado ordenado por fecha (más reciente primero).
+    """
+    if os.path.isdir(path):
+        df = AlertStore(path).read(columns=columns)
+    else:
+        df = read_table(path, columns=columns)
+    
+    if 'date' in df.columns:
+        df['date'] = parse_alert_dates(df['date'])
+    
+    return df
+
+def _open_consolidated_store(store_dir=None):
+    """
+    Abre el almacén consolidado y su índice de identificadores, listos para añadir alertas.
+    
+    Si existe un CSV consolidado heredado y el almacén todavía no, se migra
+    primero (solo para el almacén por defecto). En un almacén existente se
+    migran los identificadores posicionales de FDA y se comprueba el índice.
+    
+    Args:
+        store_dir (str, optional): Directorio del almacén. Por defecto, data/final/consolidated_store.
+        
+    Returns:
+        tuple: (AlertStore, AlertIndex). El llamador debe cerrar el índice.
+    """
+    store = AlertStore(store_dir)
+    
+    # Migrar el CSV consolidado heredado si el almacén aún no existe
+    legacy_path = os.path.join(FINAL_DIR, FINAL_DATASET_FILENAME)
+    if store_dir is None and not store.exists() and os.path.exists(legacy_path):
+        _bootstrap_store_from_csv(store, legacy_path)
+    
+    if not store.exists():
+        logger.info(f"El almacén consolidado no existe. Creando uno nuevo: {store.root_dir}")
+        index = AlertIndex.for_store(store)
+        # Descartar identificadores de un almacén anterior que ya no existe
+        index.rebuild(store)
+        return store, index
+    
+    # Sustituir identificadores posicionales de FDA de ejecuciones anteriores
+    rewritten = migrate_legacy_fda_ids(store)
+    
+    index = AlertIndex.for_store(store)
+    try:
+        # El índice se reconstruye si falta, está desfasado o los identificadores han cambiado
+        if rewritten:
+            index.rebuild(store)
+        else:
+            index.ensure_consistent(store)
+    except Exception:
+        index.close()
+        raise
+    
+    return store, index
+
+def _append_new_records(store, index, records):
+    """
+    Añade al almacén las alertas que todavía no están en el índice.
+    
+    El resumen estadístico del almacén (ver processors.dataset_stats) se
+    actualiza con las alertas añadidas si estaba al día; si no, se recalcula
+    completo la próxima vez que se consulte.
+    
+    Args:
+        store (AlertStore): Almacén consolidado.
+        index (AlertIndex): Índice de identificadores del almacén.
+        records (pandas.DataFrame): Alertas con esquema unificado.
+        
+    Returns:
+        int: Número de alertas añadidas.
+    """
+    # Una misma alerta puede aparecer repetida en el scraping
+    records = records.drop_duplicates(subset='alert_id', keep='first')
+    
+    # Identificar registros nuevos (no presentes en el almacén consolidado)
+    # Asumimos que 'alert_id' es un identificador único
+    existing_alerts = index.lookup(records['alert_id'])
+    new_records = records[~records['alert_id'].astype(str).isin(existing_alerts)]
+    if new_records.empty:
+        return 0
+    
+    # Añadir solo los registros nuevos a sus particiones; el índice solo se
+    # confirma si la escritura de las particiones y del manifiesto termina bien
+    is_new_store = not store.exists()
+    stats = empty_statistics() if is_new_store else load_statistics(store.root_dir)
+    with index.transaction(store):
+        index.add(new_records['alert_id'])
+        store.append(new_records)
+    
+    if is_new_store:
+        store.set_metadata("fda_id_scheme", FDA_ID_SCHEME)
+    
+    if stats is not None:
+        save_statistics(store.root_dir, merge_statistics(stats, summarize_alerts(new_records)))
+    
+    return len(new_records)
+
+def update_consolidated_dataset(processed_file_path, store_dir=None):
     """
     Actualiza el dataset consolidado con nuevos datos procesados.
     
-    Si el dataset consolidado no existe, se crea uno nuevo.
-    Si existe, se añaden únicamente los registros que no estén presentes.
+    El dataset consolidado es un almacén particionado por fuente y mes
+    (ver processors.alert_store). Solo se añaden los registros que no estén
+    presentes, comprobándolo contra el índice persistente de identificadores
+    (ver processors.alert_index), y únicamente se escriben las particiones
+    afectadas. Si existe un CSV consolidado heredado y el almacén todavía no,
+    se migra primero.
     
     Args:
-        processed_file_path (str): Ruta al archivo CSV de datos procesados.
+        processed_file_path (str): Ruta al archivo de datos procesados (Parquet o CSV).
+        store_dir (str, optional): Directorio del almacén. Por defecto, data/final/consolidated_store.
         
     Returns:
-        str: Ruta al dataset consolidado actualizado.
+        str: Ruta al directorio del almacén consolidado actualizado.
     """
     try:
         # Verificar si existe el archivo procesado
@@ -30,60 +235,82 @@ def update_consolidated_dataset(processed_file_path):
             return None
         
         # Cargar datos procesados
-        processed_df = pd.read_csv(processed_file_path)
+        processed_df = read_table(processed_file_path)
         logger.info(f"Leyendo datos procesados desde {processed_file_path}: {len(processed_df)} filas")
         
-        # Ruta al dataset consolidado
-        consolidated_path = os.path.join(FINAL_DIR, FINAL_DATASET_FILENAME)
-        
-        # Verificar si existe el dataset consolidado
-        if not os.path.exists(consolidated_path):
-            logger.info(f"El dataset consolidado no existe. Creando uno nuevo: {consolidated_path}")
-            processed_df.to_csv(consolidated_path, index=False)
-            return consolidated_path
-        
-        # Cargar dataset consolidado existente
-        consolidated_df = pd.read_csv(consolidated_path)
-        logger.info(f"Leyendo dataset consolidado desde {consolidated_path}: {len(consolidated_df)} filas")
+        store, index = _open_consolidated_store(store_dir)
+        try:
+            added = _append_new_records(store, index, processed_df)
+        finally:
+            index.close()
         
-        # Identificar registros nuevos (no presentes en el dataset consolidado)
-        # Asumimos que 'alert_id' es un identificador único
-        existing_alerts = set(consolidated_df['alert_id'])
-        new_records = processed_df[~processed_df['alert_id'].isin(existing_alerts)]
-        
-        if new_records.empty:
+        if not added:
             logger.info("No hay nuevos registros para añadir al dataset consolidado")
-            return consolidated_path
+            return store.root_dir
         
-        # Añadir nuevos registros al dataset consolidado
-        updated_df = pd.concat([consolidated_df, new_records], ignore_index=True)
+        logger.info(f"Dataset consolidado actualizado: {store.total_rows} filas totales, {added} registros nuevos")
         
-        # Ordenar por fecha (de más reciente a más antiguo)
-        if 'date' in updated_df.columns:
-            try:
-                # Intentar convertir a datetime para ordenar correctamente
-                updated_df['date_temp'] = pd.to_datetime(updated_df['date'], errors='coerce')
-                updated_df = updated_df.sort_values(by='date_temp', ascending=False)
-                updated_df = updated_df.drop(columns=['date_temp'])
-            except Exception as e:
-                logger.warning(f"Error al ordenar por fecha: {e}")
+        return store.root_dir
+    
+    except Exception as e:
+        logger.error(f"Error al actualizar el dataset consolidado: {e}")
+        return None
+
+def stream_into_consolidated_dataset(chunks, store_dir=None):
+    """
+    Añade al dataset consolidado bloques de alertas según se producen (modo streaming).
+    
+    Cada bloque se comprueba contra el índice y se confirma por separado, por lo
+    que no se necesita el archivo procesado intermedio ni tener todos los datos
+    en memoria. Los duplicados entre bloques se descartan porque el índice ya
+    contiene los identificadores de los bloques anteriores.
+    
+    Args:
+        chunks (iterable): Bloques de alertas con esquema unificado
+            (por ejemplo, processors.data_filter.iter_unified_chunks()).
+        store_dir (str, optional): Directorio del almacén. Por defecto, data/final/consolidated_store.
+        
+    Returns:
+        str: Ruta al directorio del almacén consolidado, o None si no hubo datos o se produjo un error.
+    """
+    try:
+        store, index = _open_consolidated_store(store_dir)
+        received = 0
+        added = 0
+        try:
+            for chunk in chunks:
+                received += len(chunk)
+                added += _append_new_records(store, index, chunk)
+        finally:
+            index.close()
         
-        # Guardar dataset consolidado actualizado
-        updated_df.to_csv(consolidated_path, index=False)
-        logger.info(f"Dataset consolidado actualizado: {len(updated_df)} filas totales, {len(new_records)} registros nuevos")
+        if not received:
+            logger.warning("No se encontraron datos que cumplan con los criterios de filtrado")
+            return None
         
-        return consolidated_path
+        logger.info(
+            f"Dataset consolidado actualizado por bloques: {received} filas procesadas, "
+            f"{added} registros nuevos, {store.total_rows} filas totales"
+        )
+        return store.root_dir
     
     except Exception as e:
-        logger.error(f"Error al actualizar el dataset consolidado: {e}")
+        logger.error(f"Error al actualizar el dataset consolidado por bloques: {e}")
         return None
 
-def get_dataset_statistics(file_path):
+def get_dataset_statistics(file_path, recompute=False):
     """
     Obtiene estadísticas básicas del dataset.
     
+    Para el almacén consolidado se devuelve el resumen que se mantiene al añadir
+    alertas (ver processors.dataset_stats), sin leer el almacén. Solo se
+    recalcula leyendo las columnas de estadísticas si el resumen falta, está
+    desfasado o se pide expresamente; el resultado se guarda para las siguientes
+    consultas.
+    
     Args:
-        file_path (str): Ruta al archivo CSV.
+        file_path (str): Directorio del almacén consolidado o ruta a un archivo de datos.
+        recompute (bool, optional): Recalcular el resumen a partir de todas las alertas.
         
     Returns:
         dict: Diccionario con estadísticas.
@@ -92,18 +319,18 @@ def get_dataset_statistics(file_path):
         if not os.path.exists(file_path):
             return {"error": "Archivo no encontrado"}
         
-        df = pd.read_csv(file_path)
+        if os.path.isdir(file_path) and not recompute:
+            stats = load_statistics(file_path)
+            if stats is not None:
+                return stats
+            logger.info("Resumen estadístico del almacén ausente o desfasado. Recalculando")
+        
+        # Leer solo las columnas necesarias para las estadísticas
+        df = load_consolidated_dataset(file_path, columns=STATISTICS_COLUMNS)
+        stats = summarize_alerts(df)
         
-        stats = {
-            "total_records": len(df),
-            "sources": df['source_database'].value_counts().to_dict() if 'source_database' in df.columns else {},
-            "categories": df['category'].value_counts().to_dict() if 'category' in df.columns else {},
-            "countries": df['country_origin'].value_counts().to_dict() if 'country_origin' in df.columns else {},
-            "date_range": {
-                "min": df['date'].min() if 'date' in df.columns else None,
-                "max": df['date'].max() if 'date' in df.columns else None
-            }
-        }
+        if os.path.isdir(file_path):
+            save_statistics(file_path, stats)
         
         return stats
     
@@ -120,7 +347,7 @@ if __name__ == "__main__":
     
     # Ejemplo de uso
     # Buscar el archivo procesado más reciente
-    processed_files = [f for f in os.listdir(PROCESSED_DIR) if f.startswith('bakery_dairy_alerts_')]
+    processed_files = [f for f in os.listdir(PROCESSED_DIR) if f.startswith('bakery_dairy_alerts_')] if os.path.isdir(PROCESSED_DIR) else []
     if processed_files:
         processed_files.sort(reverse=True)
         latest_processed = os.path.join(PROCESSED_DIR, processed_files[0])
@@ -0,0 +1,135 @@
+"""
+Estadísticas del dataset consolidado mantenidas de forma incremental.
+
+El resumen (total, alertas por fuente, categoría y país, y rango de fechas) se
+guarda en el almacén consolidado junto con la huella de su manifiesto. Cada vez
+que se añaden alertas, el resumen se actualiza solo con las alertas añadidas
+(suma de contadores y mínimo/máximo de las fechas interpretadas), de modo que
+consultarlo no requiere leer el almacén.
+"""
+import os
+import json
+import logging
+from collections import Counter
+
+import pandas as pd
+
+from processors.alert_store import parse_alert_dates
+from processors.alert_cube import AlertCube, dataset_fingerprint, STATISTICS_CUBE_DIMENSIONS, RANGE_COLUMNS
+
+logger = logging.getLogger(__name__)
+
+STATISTICS_FILENAME = "statistics.json"
+
+# Contadores del resumen y dimensión del cubo de la que se obtienen
+COUNTER_DIMENSIONS = {
+    "sources": 'source_database',
+    "categories": 'category',
+    "countries": 'country_origin',
+}
+
+DATE_FORMAT = "%Y-%m-%d"
+
+def empty_statistics():
+    """Resumen de un dataset sin alertas."""
+    stats = {"total_records": 0}
+    stats.update({name: {} for name in COUNTER_DIMENSIONS})
+    stats["date_range"] = {"min": None, "max": None}
+    return stats
+
+def _format_date(value):
+    """Fecha como texto AAAA-MM-DD (None si no hay fecha)."""
+    return None if value is None or pd.isna(value) else pd.Timestamp(value).strftime(DATE_FORMAT)
+
+def summarize_alerts(df):
+    """
+    Calcula el resumen estadístico de un conjunto de alertas.
+    
+    Las fechas se interpretan antes de calcular el rango, por lo que el mínimo y
+    el máximo son cronológicos (y no el orden alfabético de 'MM/DD/YYYY').
+    
+    Args:
+        df (pandas.DataFrame): Alertas con esquema unificado (basta con las columnas de estadísticas).
+    
+    Returns:
+        dict: Resumen con total_records, sources, categories, countries y date_range.
+    """
+    if 'date' in df.columns and not pd.api.types.is_datetime64_any_dtype(df['date']):
+        df = df.assign(date=parse_alert_dates(df['date']))
+    
+    cube = AlertCube.build(df, STATISTICS_CUBE_DIMENSIONS, range_columns=RANGE_COLUMNS)
+    stats = empty_statistics()
+    stats["total_records"] = cube.total
+    for name, dimension in COUNTER_DIMENSIONS.items():
+        if dimension in cube.dimensions:
+            stats[name] = {str(value): int(count) for value, count in cube.counts(dimension).items()}
+    
+    if 'date_min' in cube.data.columns:
+        date_min, date_max = cube.value_range('date')
+        stats["date_range"] = {"min": _format_date(date_min), "max": _format_date(date_max)}
+    
+    return stats
+
+def merge_statistics(base, delta):
+    """
+    Combina el resumen de un dataset con el de las alertas que se le añaden.
+    
+    Args:
+        base (dict): Resumen del dataset.
+        delta (dict): Resumen de las alertas añadidas.
+    
+    Returns:
+        dict: Resumen del dataset resultante.
+    """
+    merged = empty_statistics()
+    merged["total_records"] = base["total_records"] + delta["total_records"]
+    
+    for name in COUNTER_DIMENSIONS:
+        counter = Counter(base[name])
+        counter.update(delta[name])
+        merged[name] = dict(counter.most_common())
+    
+    # Las fechas en formato AAAA-MM-DD se ordenan igual como texto que como fecha
+    for bound, choose in (("min", min), ("max", max)):
+        values = [s["date_range"][bound] for s in (base, delta) if s["date_range"][bound] is not None]
+        merged["date_range"][bound] = choose(values) if values else None
+    
+    return merged
+
+def load_statistics(store_dir):
+    """
+    Carga el resumen guardado en el almacén si corresponde a su contenido actual.
+    
+    Args:
+        store_dir (str): Directorio del almacén consolidado.
+    
+    Returns:
+        dict: Resumen, o None si no existe o está desfasado.
+    """
+    path = os.path.join(store_dir, STATISTICS_FILENAME)
+    if not os.path.exists(path):
+        return None
+    
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            saved = json.load(f)
+    except (OSError, ValueError):
+        return None
+    
+    if saved.get("fingerprint") != dataset_fingerprint(store_dir):
+        return None
+    return saved.get("statistics")
+
+def save_statistics(store_dir, stats):
+    """
+    Guarda el resumen en el almacén junto con la huella de su manifiesto actual.
+    
+    Args:
+        store_dir (str): Directorio del almacén consolidado.
+        stats (dict): Resumen del contenido actual del almacén.
+    """
+    path = os.path.join(store_dir, STATISTICS_FILENAME)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump({"fingerprint": dataset_fingerprint(store_dir), "statistics": stats}, f, indent=2)
+    os.replace(tmp_path, path)
@@ -0,0 +1,221 @@
+"""
+Caché de las etapas del pipeline.
+
+El pipeline se ejecuta como una cadena de etapas (scraping → filtrado →
+consolidación → estadísticas → puntuación → informes). La clave de cada etapa
+se calcula a partir de sus entradas: el contenido de los archivos que lee (o la
+huella del almacén consolidado), el código que la implementa (huella de sus
+módulos fuente) y la configuración que afecta a su resultado. Si la clave
+coincide con la de la última ejecución y sus artefactos siguen existiendo, la
+etapa se omite y se reutilizan los artefactos guardados.
+"""
+import os
+import json
+import time
+import hashlib
+import logging
+import importlib.util
+from datetime import datetime
+
+from config.settings import FINAL_DIR, PIPELINE_CACHE_FILENAME
+
+logger = logging.getLogger(__name__)
+
+# Etapas del pipeline, en orden de ejecución
+PIPELINE_STAGES = ['scrape', 'filter', 'merge', 'stats', 'score', 'reports']
+
+# Módulos cuyo código determina el resultado de cada etapa
+STAGE_MODULES = {
+    'filter': ['processors.data_filter', 'config.product_categories', 'utils.date_utils', 'processors.storage'],
+    'merge': ['processors.data_merger', 'processors.alert_store', 'processors.alert_index',
+              'processors.dataset_stats', 'processors.alert_cube'],
+    'stats': ['processors.dataset_stats', 'processors.alert_cube'],
+    'score': ['scripts.report_generator', 'scripts.report_cache', 'processors.alert_cube'],
+    'reports': ['scripts.report_generator', 'scripts.excel_streaming', 'scripts.report_figures'],
+}
+
+CACHE_VERSION = 1
+
+def file_digest(path):
+    """
+    Calcula el SHA-256 del contenido de un archivo.
+    
+    Args:
+        path (str): Ruta al archivo.
+    
+    Returns:
+        str: Huella del contenido.
+    """
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+def source_digest(module_names):
+    """
+    Calcula la huella del código fuente de varios módulos sin importarlos.
+    
+    Args:
+        module_names (list): Nombres de los módulos (por ejemplo, 'processors.data_filter').
+    
+    Returns:
+        str: Huella combinada de los archivos fuente.
+    """
+    digest = hashlib.sha256()
+    for name in module_names:
+        spec = importlib.util.find_spec(name)
+        digest.update(name.encode('utf-8'))
+        if spec is not None and spec.origin and os.path.isfile(spec.origin):
+            digest.update(file_digest(spec.origin).encode('ascii'))
+    return digest.hexdigest()
+
+class PipelineStageCache:
+    """
+    Claves y artefactos de la última ejecución de cada etapa del pipeline.
+    
+    Los artefactos de una etapa son un diccionario serializable en JSON; las
+    rutas de su entrada 'paths' deben seguir existiendo para reutilizarlos.
+    """
+    
+    def __init__(self, path=None, force=()):
+        """
+        Inicializa la caché.
+        
+        Args:
+            path (str, optional): Archivo de la caché. Por defecto, data/final/pipeline_stages.json.
+            force (iterable, optional): Etapas que se ejecutan aunque sus entradas no hayan
+                cambiado, junto con las posteriores ('all' = todas).
+        """
+        self.path = path or os.path.join(FINAL_DIR, PIPELINE_CACHE_FILENAME)
+        self.force = set(force or ())
+        self.state = self._load()
+        self._dirty = False
+    
+    def _load(self):
+        """Carga el estado de la caché (vacío si no existe, está dañado o es de otra versión)."""
+        empty = {"version": CACHE_VERSION, "files": {}, "stages": {}}
+        if not os.path.exists(self.path):
+            return empty
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return empty
+        return state if state.get("version") == CACHE_VERSION else empty
+    
+    def _save(self):
+        """Guarda el estado de la caché de forma atómica."""
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.state, f, indent=2, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+        self._dirty = False
+    
+    def is_forced(self, stage):
+        """
+        Indica si la etapa debe ejecutarse aunque no haya cambios.
+        
+        Forzar una etapa fuerza también las posteriores, que dependen de sus resultados.
+        """
+        if 'all' in self.force:
+            return True
+        position = PIPELINE_STAGES.index(stage)
+        return any(forced in PIPELINE_STAGES[:position + 1] for forced in self.force)
+    
+    def digest(self, path):
+        """
+        Huella del contenido de un archivo de entrada.
+        
+        La huella se recuerda junto con el tamaño y la fecha de modificación del
+        archivo, por lo que solo se vuelve a leer si el archivo cambia.
+        
+        Args:
+            path (str): Ruta al archivo (None si la entrada no existe).
+        
+        Returns:
+            str: Huella del contenido, o None.
+        """
+        if not path or not os.path.exists(path):
+            return None
+        
+        path = os.path.abspath(path)
+        stat = os.stat(path)
+        signature = [stat.st_size, stat.st_mtime_ns]
+        known = self.state["files"].get(path)
+        if known and known["signature"] == signature:
+            return known["digest"]
+        
+        digest = file_digest(path)
+        self.state["files"][path] = {"signature": signature, "digest": digest}
+        self._dirty = True
+        return digest
+    
+    @staticmethod
+    def stage_key(inputs):
+        """Clave de una etapa a partir de sus entradas (serializables en JSON)."""
+        payload = json.dumps(inputs, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+    
+    def lookup(self, stage, inputs, is_valid=None):
+        """
+        Devuelve los artefactos de la última ejecución de una etapa si siguen siendo válidos.
+        
+        Args:
+            stage (str): Nombre de la etapa.
+            inputs (dict): Entradas de la etapa.
+            is_valid (callable, optional): Comprobación adicional de los artefactos.
+        
+        Returns:
+            dict: Artefactos, o None si la etapa debe ejecutarse.
+        """
+        if self.is_forced(stage):
+            return None
+        
+        entry = self.state["stages"].get(stage)
+        if not entry or entry["key"] != self.stage_key(inputs):
+            return None
+        
+        artifacts = entry["artifacts"]
+        if not all(os.path.exists(path) for path in artifacts.get("paths", [])):
+            return None
+        if is_valid is not None and not is_valid(artifacts):
+            return None
+        
+        return artifacts
+    
+    def run(self, stage, inputs, func, is_valid=None):
+        """
+        Ejecuta una etapa, o reutiliza sus artefactos si sus entradas no han cambiado.
+        
+        Args:
+            stage (str): Nombre de la etapa.
+            inputs (dict): Entradas de la etapa (archivos, código y configuración).
+            func (callable): Ejecuta la etapa y devuelve sus artefactos (None si falla;
+                en ese caso no se guardan).
+            is_valid (callable, optional): Comprobación adicional de los artefactos guardados.
+        
+        Returns:
+            dict: Artefactos de la etapa, o None si falló.
+        """
+        artifacts = self.lookup(stage, inputs, is_valid)
+        if artifacts is not None:
+            logger.info(f"Etapa '{stage}' sin cambios en sus entradas: se reutilizan sus resultados")
+            if self._dirty:
+                self._save()
+            return artifacts
+        
+        start = time.perf_counter()
+        artifacts = func()
+        logger.info(f"Etapa '{stage}' ejecutada en {time.perf_counter() - start:.1f} s")
+        
+        if artifacts is not None:
+            self.state["stages"][stage] = {
+                "key": self.stage_key(inputs),
+                "artifacts": artifacts,
+                "updated": datetime.now().isoformat(timespec='seconds'),
+            }
+            self._save()
+        
+        return artifacts
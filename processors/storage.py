@@ -0,0 +1,216 @@
+"""
+Formatos de almacenamiento para los datos procesados y el dataset consolidado.
+
+El formato por defecto es Parquet (mediante pyarrow), que conserva los tipos de
+datos (fecha como datetime, categoría y fuente como categóricas) y permite leer
+solo las columnas necesarias. CSV se mantiene por compatibilidad.
+"""
+import os
+import shutil
+import logging
+
+import pandas as pd
+
+from config.settings import STORAGE_FORMAT
+
+logger = logging.getLogger(__name__)
+
+# Columnas del esquema unificado que se guardan como categóricas
+CATEGORICAL_COLUMNS = ['category', 'source_database']
+
+# Identificadores que se guardan siempre como texto (las referencias de RASFF se leen como números)
+ID_COLUMNS = ['alert_id', 'source_id']
+
+def normalize_dtypes(df):
+    """
+    Normaliza los tipos de datos del esquema unificado.
+    
+    Convierte 'date' a datetime, los identificadores a texto y las columnas de baja
+    cardinalidad a categóricas.
+    
+    Args:
+        df (pandas.DataFrame): DataFrame con esquema unificado.
+    
+    Returns:
+        pandas.DataFrame: DataFrame con los tipos normalizados.
+    """
+    # Importación local para evitar dependencias circulares
+    from processors.alert_store import parse_alert_dates
+    
+    df = df.copy()
+    if 'date' in df.columns and not pd.api.types.is_datetime64_any_dtype(df['date']):
+        df['date'] = parse_alert_dates(df['date'])
+    
+    for column in ID_COLUMNS:
+        if column in df.columns:
+            values = df[column]
+            df[column] = values.astype(object).where(values.isna(), values.astype(str))
+    
+    for column in CATEGORICAL_COLUMNS:
+        if column in df.columns and not isinstance(df[column].dtype, pd.CategoricalDtype):
+            df[column] = df[column].astype('category')
+    
+    return df
+
+class CsvFormat:
+    """Almacenamiento en CSV (compatibilidad con versiones anteriores)."""
+    
+    name = "csv"
+    extension = ".csv"
+    
+    def read(self, path, columns=None):
+        """Lee un archivo CSV, opcionalmente solo algunas columnas."""
+        return pd.read_csv(path, usecols=columns)
+    
+    def read_columns(self, path):
+        """Devuelve los nombres de columna de un archivo CSV sin leer los datos."""
+        return list(pd.read_csv(path, nrows=0).columns)
+    
+    def write(self, df, path):
+        """Escribe un DataFrame completo en CSV."""
+        df.to_csv(path, index=False)
+    
+    def append(self, df, path):
+        """Añade filas al final de un CSV (lo crea con cabecera si no existe)."""
+        write_header = not os.path.exists(path)
+        df.to_csv(path, mode='a', header=write_header, index=False)
+
+    def write_appended(self, df, path, output_path):
+        """Escribe en output_path el CSV de path (si existe) con las filas de df añadidas al final."""
+        if os.path.exists(path):
+            shutil.copyfile(path, output_path)
+            df.to_csv(output_path, mode='a', header=False, index=False)
+        else:
+            df.to_csv(output_path, index=False)
+
+class ParquetFormat:
+    """
+    Almacenamiento columnar en Parquet mediante pyarrow.
+    
+    Parquet no admite añadir filas a un archivo existente, por lo que append()
+    reescribe únicamente el archivo afectado (en el almacén consolidado, una
+    partición de un mes). La reescritura se hace en un archivo temporal que
+    sustituye al original al terminar, de modo que un fallo a mitad de escritura
+    no deja el archivo corrupto.
+    """
+    
+    name = "parquet"
+    extension = ".parquet"
+    
+    def read(self, path, columns=None):
+        """Lee un archivo Parquet, opcionalmente solo algunas columnas."""
+        return pd.read_parquet(path, columns=columns)
+    
+    def read_columns(self, path):
+        """Devuelve los nombres de columna de un archivo Parquet sin leer los datos."""
+        import pyarrow.parquet as pq
+        return list(pq.read_schema(path).names)
+    
+    def write(self, df, path):
+        """Escribe un DataFrame completo en Parquet conservando los tipos."""
+        normalize_dtypes(df).to_parquet(path, index=False)
+    
+    def append(self, df, path):
+        """Añade filas a un archivo Parquet reescribiendo solo ese archivo (temporal + rename)."""
+        tmp_path = f"{path}.tmp"
+        try:
+            self.write_appended(df, path, tmp_path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        os.replace(tmp_path, path)
+    
+    def write_appended(self, df, path, output_path):
+        """Escribe en output_path el contenido de path (si existe) con las filas de df añadidas."""
+        if os.path.exists(path):
+            existing_df = pd.read_parquet(path)
+            df = pd.concat([existing_df, normalize_dtypes(df)], ignore_index=True)
+        self.write(df, output_path)
+
+STORAGE_FORMATS = {
+    CsvFormat.name: CsvFormat,
+    ParquetFormat.name: ParquetFormat,
+}
+
+def _pyarrow_available():
+    """Indica si pyarrow está instalado."""
+    try:
+        import pyarrow
+        return True
+    except ImportError:
+        return False
+
+def get_storage_format(name=None):
+    """
+    Obtiene el formato de almacenamiento configurado.
+    
+    Si se solicita Parquet pero pyarrow no está instalado, se usa CSV.
+    
+    Args:
+        name (str, optional): Nombre del formato ('parquet' o 'csv'). Por defecto, STORAGE_FORMAT.
+    
+    Returns:
+        CsvFormat | ParquetFormat: Instancia del formato.
+    """
+    name = (name or STORAGE_FORMAT).lower()
+    if name not in STORAGE_FORMATS:
+        raise ValueError(f"Formato de almacenamiento no válido: {name}")
+    
+    if name == ParquetFormat.name and not _pyarrow_available():
+        logger.warning("pyarrow no está instalado. Se usará CSV como formato de almacenamiento.")
+        logger.warning("Instale con: pip install pyarrow")
+        name = CsvFormat.name
+    
+    return STORAGE_FORMATS[name]()
+
+def format_for_path(path):
+    """
+    Obtiene el formato de almacenamiento correspondiente a la extensión de un archivo.
+    
+    Args:
+        path (str): Ruta al archivo.
+    
+    Returns:
+        CsvFormat | ParquetFormat: Instancia del formato.
+    """
+    extension = os.path.splitext(path)[1].lower()
+    for storage_class in STORAGE_FORMATS.values():
+        if storage_class.extension == extension:
+            return storage_class()
+    
+    raise ValueError(f"Extensión de archivo no soportada: {path}")
+
+def read_table(path, columns=None):
+    """
+    Lee un archivo de datos (CSV o Parquet según su extensión).
+    
+    Las columnas solicitadas que no existan en el archivo se ignoran.
+    
+    Args:
+        path (str): Ruta al archivo.
+        columns (list, optional): Columnas a leer. Por defecto, todas.
+    
+    Returns:
+        pandas.DataFrame: Datos leídos.
+    """
+    storage = format_for_path(path)
+    if columns is not None:
+        available = storage.read_columns(path)
+        columns = [c for c in columns if c in available]
+    
+    return storage.read(path, columns=columns)
+
+def write_table(df, path):
+    """
+    Escribe un archivo de datos (CSV o Parquet según su extensión).
+    
+    Args:
+        df (pandas.DataFrame): Datos a escribir.
+        path (str): Ruta al archivo.
+    
+    Returns:
+        str: Ruta al archivo escrito.
+    """
+    format_for_path(path).write(df, path)
+    return path
@@ -1,12 +1,187 @@
 """
 Clase base para los scrapers de alertas alimentarias.
+
+Incluye un pool de WebDriver compartido: los scrapers que usan Selenium toman un
+navegador del pool en initialize() y lo devuelven en cleanup(), de modo que una
+ejecución con varias fuentes reutiliza el mismo Chrome en lugar de arrancar uno
+por fuente.
 """
 import os
+import atexit
 import logging
+import threading
 from abc import ABC, abstractmethod
 from datetime import datetime
 
-from config.settings import SCRAPS_DIR
+from config.settings import SCRAPS_DIR, WEBDRIVER_POOL_SIZE
+
+logger = logging.getLogger(__name__)
+
+def create_chrome_driver():
+    """
+    Crea un Chrome headless configurado para descargar archivos sin preguntar.
+    
+    Returns:
+        WebDriver: Driver de Selenium.
+    """
+    from selenium import webdriver
+    
+    options = webdriver.ChromeOptions()
+    options.add_argument("--headless")  # Ejecuta sin abrir el navegador
+    options.add_argument("--disable-gpu")
+    options.add_argument("--no-sandbox")
+    options.add_experimental_option("prefs", {
+        "download.prompt_for_download": False,
+        "download.directory_upgrade": True,
+        "safebrowsing.enabled": True
+    })
+    
+    return webdriver.Chrome(options=options)
+
+def set_download_dir(driver, download_dir):
+    """
+    Cambia el directorio de descarga de un Chrome ya arrancado.
+    
+    Args:
+        driver (WebDriver): Driver de Chrome.
+        download_dir (str): Directorio de descarga.
+    """
+    params = {"behavior": "allow", "downloadPath": os.path.abspath(download_dir)}
+    try:
+        driver.execute_cdp_cmd("Browser.setDownloadBehavior", params)
+    except Exception:
+        driver.execute_cdp_cmd("Page.setDownloadBehavior", params)
+
+class WebDriverPool:
+    """
+    Pool de navegadores reutilizables entre scrapers.
+    
+    Los navegadores se crean bajo demanda hasta max_size; si todos están en uso,
+    acquire() espera a que se devuelva alguno.
+    """
+    
+    def __init__(self, factory=create_chrome_driver, max_size=WEBDRIVER_POOL_SIZE):
+        """
+        Inicializa el pool.
+        
+        Args:
+            factory (callable, optional): Función que crea un navegador nuevo.
+            max_size (int, optional): Número máximo de navegadores simultáneos.
+        """
+        self.factory = factory
+        self.max_size = max(1, max_size)
+        self.started = 0
+        self._idle = []
+        self._drivers = []
+        self._size = 0
+        self._condition = threading.Condition()
+    
+    @staticmethod
+    def _is_alive(driver):
+        """Comprueba si un navegador del pool sigue respondiendo."""
+        try:
+            driver.current_url
+            return True
+        except Exception:
+            return False
+    
+    def _discard(self, driver):
+        """Cierra un navegador y libera su hueco en el pool (con el lock adquirido)."""
+        if driver in self._drivers:
+            self._drivers.remove(driver)
+            self._size -= 1
+        try:
+            driver.quit()
+        except Exception:
+            pass
+        self._condition.notify()
+    
+    def acquire(self, download_dir=None, timeout=None):
+        """
+        Toma un navegador del pool (reutilizando uno libre o creando uno nuevo).
+        
+        Args:
+            download_dir (str, optional): Directorio de descarga que debe usar el navegador.
+            timeout (float, optional): Tiempo máximo de espera si el pool está lleno.
+        
+        Returns:
+            WebDriver: Navegador reservado para quien lo pide.
+        """
+        with self._condition:
+            while True:
+                driver = None
+                while self._idle and driver is None:
+                    candidate = self._idle.pop()
+                    if self._is_alive(candidate):
+                        driver = candidate
+                    else:
+                        self._discard(candidate)
+                
+                if driver is not None or self._size < self.max_size:
+                    break
+                if not self._condition.wait(timeout):
+                    raise TimeoutError("No hay navegadores libres en el pool")
+            
+            if driver is None:
+                # Reservar el hueco antes de arrancar el navegador fuera del lock
+                self._size += 1
+        
+        if driver is None:
+            try:
+                driver = self.factory()
+            except Exception:
+                with self._condition:
+                    self._size -= 1
+                    self._condition.notify()
+                raise
+            with self._condition:
+                self._drivers.append(driver)
+                self.started += 1
+            logger.info(f"Navegador arrancado ({self.started} en total)")
+        
+        if download_dir:
+            set_download_dir(driver, download_dir)
+        return driver
+    
+    def release(self, driver, discard=False):
+        """
+        Devuelve un navegador al pool.
+        
+        Args:
+            driver (WebDriver): Navegador obtenido con acquire().
+            discard (bool, optional): Si es True, el navegador se cierra en lugar de reutilizarse.
+        """
+        with self._condition:
+            if discard or not self._is_alive(driver):
+                self._discard(driver)
+            else:
+                self._idle.append(driver)
+                self._condition.notify()
+    
+    def close_all(self):
+        """Cierra todos los navegadores del pool, incluidos los que están en uso."""
+        with self._condition:
+            for driver in list(self._drivers):
+                self._discard(driver)
+            self._idle = []
+            self._condition.notify_all()
+
+_driver_pool = None
+_driver_pool_lock = threading.Lock()
+
+def get_driver_pool():
+    """
+    Obtiene el pool de navegadores compartido por todos los scrapers del proceso.
+    
+    Returns:
+        WebDriverPool: Pool compartido.
+    """
+    global _driver_pool
+    with _driver_pool_lock:
+        if _driver_pool is None:
+            _driver_pool = WebDriverPool()
+            atexit.register(_driver_pool.close_all)
+        return _driver_pool
 
 class BaseScraper(ABC):
     """
@@ -25,6 +200,7 @@ class BaseScraper(ABC):
         """
         self.name = name
         self.output_dir = output_dir or SCRAPS_DIR
+        self.driver = None
         
         # Asegurar que el directorio de salida existe
         os.makedirs(self.output_dir, exist_ok=True)
@@ -32,6 +208,27 @@ class BaseScraper(ABC):
         # Configurar logger
         self.logger = logging.getLogger(f"scraper.{name}")
     
+    def acquire_driver(self, download_dir=None):
+        """
+        Toma un navegador del pool compartido (para usar en initialize()).
+        
+        Args:
+            download_dir (str, optional): Directorio de descarga del navegador.
+            
+        Returns:
+            WebDriver: Navegador reservado para este scraper.
+        """
+        self.driver = get_driver_pool().acquire(download_dir)
+        return self.driver
+    
+    def release_driver(self):
+        """
+        Devuelve el navegador al pool compartido (para usar en cleanup()).
+        """
+        if self.driver is not None:
+            get_driver_pool().release(self.driver)
+            self.driver = None
+    
     @abstractmethod
     def initialize(self):
         """
@@ -0,0 +1,90 @@
+"""
+Extracción de filas de la tabla de retiradas de FDA con Selenium.
+
+Hay dos modos:
+
+- "cells": una llamada a WebDriver por fila (find_elements) y otra por celda (.text),
+  es decir, unas 9 llamadas por fila (el comportamiento original).
+- "bulk": una única llamada a execute_script por página que devuelve toda la
+  tabla como una lista de listas de textos; los registros se construyen en Python.
+"""
+from selenium.webdriver.common.by import By
+
+from scrapers.fda_http_scraper import FDA_COLUMNS
+
+EXTRACTION_MODES = ("bulk", "cells")
+
+ROW_SELECTOR = "tr[role='row']"
+
+# Devuelve el texto de cada celda de las filas de datos (se omite la cabecera)
+EXTRACT_TABLE_JS = """
+const root = arguments[0] || document;
+return Array.from(root.querySelectorAll(arguments[1])).slice(1).map(
+    row => Array.from(row.querySelectorAll('td')).map(cell => cell.innerText.trim())
+);
+"""
+
+def extract_page_cells(driver, table=None):
+    """
+    Obtiene el texto de todas las celdas de la página con una sola llamada a WebDriver.
+
+    Args:
+        driver: WebDriver de Selenium.
+        table (WebElement, optional): Tabla en la que buscar. Por defecto, todo el documento.
+
+    Returns:
+        list: Lista de filas, cada una con la lista de textos de sus celdas.
+    """
+    return driver.execute_script(EXTRACT_TABLE_JS, table, ROW_SELECTOR) or []
+
+def extract_row_cells(rows):
+    """
+    Obtiene el texto de las celdas fila a fila (una llamada a WebDriver por celda).
+
+    Args:
+        rows (list): Filas (WebElement) de la tabla, sin la cabecera.
+
+    Returns:
+        list: Lista de filas, cada una con la lista de textos de sus celdas.
+    """
+    return [[col.text.strip() for col in row.find_elements(By.TAG_NAME, "td")] for row in rows]
+
+def cells_to_records(page_cells):
+    """
+    Convierte los textos de las celdas en registros con las columnas de FDA.
+
+    Se descartan las filas que no tienen todas las columnas.
+
+    Args:
+        page_cells (list): Lista de filas con los textos de sus celdas.
+
+    Returns:
+        list: Lista de diccionarios con las columnas de FDA_COLUMNS.
+    """
+    return [
+        dict(zip(FDA_COLUMNS, cells))
+        for cells in page_cells
+        if len(cells) >= len(FDA_COLUMNS)
+    ]
+
+def extract_page_records(driver, mode="bulk", table=None):
+    """
+    Extrae los registros de la página actual de la tabla de FDA.
+
+    Args:
+        driver: WebDriver de Selenium.
+        mode (str, optional): Modo de extracción ('bulk' o 'cells').
+        table (WebElement, optional): Tabla en la que buscar. Por defecto, todo el documento.
+
+    Returns:
+        list: Lista de diccionarios con las columnas de FDA_COLUMNS.
+    """
+    if mode not in EXTRACTION_MODES:
+        raise ValueError(f"Modo de extracción no válido: {mode}")
+
+    if mode == "bulk":
+        return cells_to_records(extract_page_cells(driver, table))
+
+    root = table if table is not None else driver
+    rows = root.find_elements(By.CSS_SELECTOR, ROW_SELECTOR)[1:]
+    return cells_to_records(extract_row_cells(rows))
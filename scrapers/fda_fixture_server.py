@@ -0,0 +1,150 @@
+"""
+Servidor local de fixtures que imita el endpoint de DataTables de FDA.
+
+Sirve un CSV de alertas de FDA (por defecto, la muestra de data/scraps/) con el
+mismo formato JSON y el mismo HTML en las celdas que la web de FDA, para poder
+probar el scraper HTTP sin conexión:
+
+    python scrapers/fda_fixture_server.py --port 8765
+    python scrapers/fda_http_scraper.py --url http://127.0.0.1:8765/datatables/views/ajax --no-fallback
+"""
+import os
+import sys
+import json
+import html
+import argparse
+import threading
+from datetime import datetime
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+
+import pandas as pd
+
+# Añadir el directorio raíz al path para importaciones cuando se ejecuta directamente
+root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if root_dir not in sys.path:
+    sys.path.append(root_dir)
+
+from config.settings import SCRAPS_DIR
+from scrapers.fda_http_scraper import FDA_COLUMNS
+
+DEFAULT_FIXTURE_PATH = os.path.join(SCRAPS_DIR, "fda_alerts_20250430.csv")
+DATATABLE_PATH = "/datatables/views/ajax"
+
+def render_fixture_row(record):
+    """
+    Genera las celdas de una fila con el HTML que usa la web de FDA.
+    
+    Args:
+        record (dict): Registro con las columnas de FDA_COLUMNS.
+    
+    Returns:
+        list: Celdas de la fila.
+    """
+    cells = [html.escape(record[column]) for column in FDA_COLUMNS]
+    
+    try:
+        iso_date = datetime.strptime(record["Date"], "%m/%d/%Y").strftime("%Y-%m-%dT12:00:00Z")
+        cells[0] = f'<time datetime="{iso_date}">{cells[0]}</time>'
+    except ValueError:
+        pass
+    
+    if cells[1]:
+        cells[1] = f'<a href="/safety/recalls-market-withdrawals-safety-alerts/fixture">{cells[1]}</a>'
+    
+    return cells
+
+def load_fixture(csv_path):
+    """
+    Carga el CSV de fixtures y prepara las filas en formato DataTables.
+    
+    Args:
+        csv_path (str): Ruta al CSV con las columnas de FDA.
+    
+    Returns:
+        list: Filas renderizadas.
+    """
+    df = pd.read_csv(csv_path, dtype=str, keep_default_na=False)
+    df = df.reindex(columns=FDA_COLUMNS, fill_value="")
+    return [render_fixture_row(record) for record in df.to_dict('records')]
+
+def make_handler(rows):
+    """
+    Crea el manejador HTTP que sirve las filas con paginación start/length.
+    
+    Args:
+        rows (list): Filas renderizadas.
+    
+    Returns:
+        type: Clase del manejador.
+    """
+    class FixtureHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+    
+        def do_GET(self):
+            parsed = urlparse(self.path)
+            if parsed.path != DATATABLE_PATH:
+                self.send_error(404)
+                return
+            
+            query = parse_qs(parsed.query)
+            start = int(query.get("start", ["0"])[0])
+            length = int(query.get("length", ["10"])[0])
+            page = rows[start:] if length < 0 else rows[start:start + length]
+            
+            body = json.dumps({
+                "draw": int(query.get("draw", ["1"])[0]),
+                "recordsTotal": len(rows),
+                "recordsFiltered": len(rows),
+                "data": page,
+            }).encode("utf-8")
+            
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+    
+        def log_message(self, format, *args):
+            pass
+    
+    return FixtureHandler
+
+def start_fixture_server(csv_path=DEFAULT_FIXTURE_PATH, host="127.0.0.1", port=0):
+    """
+    Arranca el servidor de fixtures en un hilo en segundo plano.
+    
+    Args:
+        csv_path (str, optional): CSV de alertas de FDA a servir.
+        host (str, optional): Dirección de escucha.
+        port (int, optional): Puerto (0 = puerto libre cualquiera).
+    
+    Returns:
+        tuple: (servidor, URL del endpoint). Detener con servidor.shutdown().
+    """
+    server = ThreadingHTTPServer((host, port), make_handler(load_fixture(csv_path)))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    url = f"http://{host}:{server.server_address[1]}{DATATABLE_PATH}"
+    return server, url
+
+def main():
+    """Función principal."""
+    parser = argparse.ArgumentParser(description='Servidor local de fixtures de la tabla de FDA')
+    parser.add_argument('--csv', default=DEFAULT_FIXTURE_PATH,
+                        help='CSV de alertas de FDA a servir')
+    parser.add_argument('--host', default="127.0.0.1", help='Dirección de escucha')
+    parser.add_argument('--port', type=int, default=8765, help='Puerto de escucha')
+    args = parser.parse_args()
+    
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(load_fixture(args.csv)))
+    print(f"Sirviendo {args.csv} en http://{args.host}:{args.port}{DATATABLE_PATH}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+if __name__ == "__main__":
+    main()
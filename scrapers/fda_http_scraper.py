@@ -0,0 +1,360 @@
+"""
+Scraper de FDA mediante peticiones HTTP al origen de datos de la tabla de retiradas.
+
+La tabla de https://www.fda.gov/safety/recalls-market-withdrawals-safety-alerts se
+rellena desde un endpoint AJAX de DataTables que devuelve JSON. En lugar de abrir
+Chrome y pulsar "siguiente" página a página, este scraper pide directamente ese
+JSON en bloques grandes con una sesión HTTP persistente (conexiones reutilizadas)
+y genera el mismo archivo de salida que el scraper de Selenium
+(data/scraps/fda_alerts_YYYYMMDD.csv).
+
+Por defecto el scraping es incremental: se deja de paginar en cuanto una página
+solo contiene retiradas ya conocidas (las de la instantánea anterior, registrada
+en scrapers.scrape_state) y el resultado se combina con esa instantánea. Con --full se descarga la tabla completa.
+
+Si la descarga HTTP falla, se ejecuta el scraper de Selenium como alternativa
+(en el mismo proceso, con un navegador del pool compartido).
+"""
+import os
+import re
+import sys
+import html
+import argparse
+import logging
+
+import pandas as pd
+
+# Añadir el directorio raíz al path para importaciones cuando se ejecuta directamente
+root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if root_dir not in sys.path:
+    sys.path.append(root_dir)
+
+from config.settings import (
+    FDA_FILENAME, FDA_DATATABLE_URL, FDA_DATATABLE_PARAMS, FDA_PAGE_SIZE,
+    MAX_RETRIES, TIMEOUT
+)
+from processors.data_filter import fda_alert_ids
+from scrapers.base_scraper import BaseScraper
+from scrapers.scrape_state import load_scrape_state, save_scrape_state
+from utils.file_utils import get_latest_file
+
+# Columnas de la tabla de FDA, en el orden en que aparecen (igual que el scraper de Selenium)
+FDA_COLUMNS = [
+    "Date", "Brand Name(s)", "Product Description", "Product Type",
+    "Recall Reason Description", "Company Name", "Terminated Recall", "Excerpt"
+]
+
+STATE_SOURCE = "fda"
+
+USER_AGENT = (
+    "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/124.0 Safari/537.36"
+)
+
+_BREAK_PATTERN = re.compile(r'<br\s*/?>', re.IGNORECASE)
+_TAG_PATTERN = re.compile(r'<[^>]+>')
+
+def cell_text(value):
+    """
+    Obtiene el texto visible de una celda de DataTables (HTML o texto plano).
+    
+    Args:
+        value: Contenido de la celda tal como llega en el JSON.
+    
+    Returns:
+        str: Texto de la celda sin etiquetas HTML (igual que WebElement.text en Selenium).
+    """
+    if value is None:
+        return ""
+    text = _TAG_PATTERN.sub("", _BREAK_PATTERN.sub("\n", str(value)))
+    return html.unescape(text).replace("\xa0", " ").strip()
+
+def parse_datatable_rows(rows):
+    """
+    Convierte las filas del JSON de DataTables en registros con las columnas de FDA.
+    
+    Las filas pueden venir como listas (una celda por columna) o como diccionarios
+    indexados por posición; se descartan las que no tienen todas las columnas.
+    
+    Args:
+        rows (list): Lista 'data' de la respuesta de DataTables.
+    
+    Returns:
+        list: Lista de diccionarios con las columnas de FDA_COLUMNS.
+    """
+    records = []
+    for row in rows:
+        if isinstance(row, dict):
+            row = [row.get(str(i), row.get(i)) for i in range(len(FDA_COLUMNS))]
+        if len(row) < len(FDA_COLUMNS):
+            continue
+        records.append({column: cell_text(row[i]) for i, column in enumerate(FDA_COLUMNS)})
+    return records
+
+class FDAHttpScraper(BaseScraper):
+    """
+    Scraper de FDA que descarga la tabla de retiradas desde su origen de datos JSON.
+    """
+    
+    def __init__(self, output_dir=None, url=None, page_size=None, params=None, incremental=True, fallback=True):
+        """
+        Inicializa el scraper.
+        
+        Args:
+            output_dir (str, optional): Directorio de salida. Por defecto, SCRAPS_DIR.
+            url (str, optional): URL del endpoint de DataTables. Por defecto, FDA_DATATABLE_URL.
+            page_size (int, optional): Filas por petición. Por defecto, FDA_PAGE_SIZE.
+            params (dict, optional): Parámetros fijos de la consulta. Por defecto, FDA_DATATABLE_PARAMS.
+            incremental (bool, optional): Si es True, se detiene en las retiradas ya conocidas
+                y combina el resultado con la instantánea anterior.
+            fallback (bool, optional): Si es True, run() ejecuta el scraper de Selenium
+                cuando falla la descarga HTTP.
+        """
+        super().__init__("fda_http", output_dir)
+        self.url = url or FDA_DATATABLE_URL
+        self.page_size = page_size or FDA_PAGE_SIZE
+        self.params = dict(FDA_DATATABLE_PARAMS if params is None else params)
+        self.incremental = incremental
+        self.fallback = fallback
+        self.session = None
+        self.output_path = None
+        self.previous_df = None
+        self.known_keys = set()
+    
+    def initialize(self):
+        """Crea la sesión HTTP con un pool de conexiones y reintentos."""
+        import requests
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+        
+        retry = Retry(total=MAX_RETRIES, backoff_factor=1, status_forcelist=[429, 500, 502, 503, 504])
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=4, max_retries=retry)
+        
+        self.session = requests.Session()
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.session.headers.update({
+            "User-Agent": USER_AGENT,
+            "Accept": "application/json, text/javascript, */*; q=0.01",
+            "X-Requested-With": "XMLHttpRequest",
+        })
+        
+        if self.incremental:
+            self.load_previous_snapshot()
+    
+    def load_previous_snapshot(self):
+        """
+        Carga la instantánea anterior para el modo incremental.
+        
+        Returns:
+            bool: True si hay una instantánea anterior con la que combinar.
+        """
+        state = load_scrape_state(STATE_SOURCE, self.output_dir)
+        snapshot_path = state.get("snapshot")
+        if not snapshot_path or not os.path.exists(snapshot_path):
+            snapshot_path = get_latest_file(self.output_dir, prefix="fda_alerts_", suffix=".csv")
+        
+        if not snapshot_path:
+            self.logger.info("No hay instantánea anterior de FDA. Se realizará un scraping completo.")
+            return False
+        
+        previous_df = pd.read_csv(snapshot_path, dtype=str, keep_default_na=False)
+        if list(previous_df.columns) != FDA_COLUMNS:
+            self.logger.warning(f"La instantánea anterior no tiene las columnas de FDA: {snapshot_path}")
+            return False
+        
+        self.previous_df = previous_df
+        self.known_keys = set(fda_alert_ids(previous_df))
+        
+        self.logger.info(
+            f"Instantánea anterior: {snapshot_path} ({len(previous_df)} registros, "
+            f"más reciente: {state.get('newest_date', 'desconocida')})"
+        )
+        return True
+    
+    def is_known_page(self, records):
+        """
+        Indica si todos los registros de una página ya se vieron en ejecuciones anteriores.
+        
+        Un registro es conocido si su clave está en la instantánea anterior. La fecha
+        no basta: la FDA publica retiradas con fecha anterior a otras ya vistas.
+        
+        Args:
+            records (list): Registros de la página.
+        
+        Returns:
+            bool: True si la página solo contiene registros conocidos.
+        """
+        if self.previous_df is None or not records:
+            return False
+        
+        page_df = pd.DataFrame(records, columns=FDA_COLUMNS)
+        return bool(fda_alert_ids(page_df).isin(self.known_keys).all())
+    
+    def fetch_page(self, start, draw):
+        """
+        Descarga un bloque de filas de la tabla.
+        
+        Args:
+            start (int): Índice de la primera fila.
+            draw (int): Contador de peticiones de DataTables.
+        
+        Returns:
+            dict: Respuesta JSON de DataTables.
+        """
+        params = dict(self.params, draw=draw, start=start, length=self.page_size)
+        response = self.session.get(self.url, params=params, timeout=TIMEOUT)
+        response.raise_for_status()
+        return response.json()
+    
+    def scrape(self):
+        """
+        Descarga las filas de la tabla de retiradas (de la más reciente a la más antigua).
+        
+        En modo incremental se detiene en la primera página que solo contiene
+        retiradas conocidas.
+        
+        Returns:
+            list: Lista de registros con las columnas de FDA_COLUMNS.
+        """
+        all_data = []
+        start = 0
+        draw = 1
+        
+        while True:
+            payload = self.fetch_page(start, draw)
+            rows = payload.get("data", [])
+            total = payload.get("recordsFiltered", payload.get("recordsTotal"))
+            
+            page_records = parse_datatable_rows(rows)
+            all_data.extend(page_records)
+            self.logger.info(f"Descargadas {start + len(rows)} de {total if total is not None else '?'} filas")
+            
+            if self.incremental and self.is_known_page(page_records):
+                self.logger.info("Página sin retiradas nuevas. Fin del scraping incremental.")
+                break
+            
+            start += len(rows)
+            draw += 1
+            if not rows or (total is not None and start >= int(total)):
+                break
+        
+        return all_data
+    
+    def save_data(self, data):
+        """
+        Guarda los registros en data/scraps/fda_alerts_YYYYMMDD.csv y actualiza la marca de agua.
+        
+        En modo incremental, los registros descargados se combinan con la
+        instantánea anterior, de modo que el archivo siempre contiene la tabla completa.
+        Los registros descargados sustituyen a los de la instantánea con la misma clave;
+        las claves se calculan por separado en cada conjunto, de modo que las retiradas
+        que comparten clave (ver disambiguate_alert_ids) se conservan todas.
+        
+        Args:
+            data (list): Registros descargados.
+        
+        Returns:
+            str: Ruta al archivo guardado.
+        """
+        if not data:
+            raise ValueError("No se descargaron filas de la tabla de FDA")
+        
+        df = pd.DataFrame(data, columns=FDA_COLUMNS)
+        if self.incremental and self.previous_df is not None:
+            downloaded = len(df)
+            previous_keys = fda_alert_ids(self.previous_df)
+            kept = self.previous_df[~previous_keys.isin(set(fda_alert_ids(df)))]
+            df = pd.concat([df, kept], ignore_index=True)
+            self.logger.info(
+                f"Combinado con la instantánea anterior: {downloaded} descargados, "
+                f"{len(df) - len(self.previous_df)} nuevos, {len(df)} en total"
+            )
+        
+        self.output_path = os.path.join(self.output_dir, FDA_FILENAME)
+        df.to_csv(self.output_path, index=False)
+        self.logger.info(f"{len(df)} registros guardados en {self.output_path}")
+        
+        # Marca de agua: retirada más reciente vista
+        dates = pd.to_datetime(df['Date'], format='%m/%d/%Y', errors='coerce')
+        state = {"snapshot": self.output_path, "records": len(df)}
+        if dates.notna().any():
+            newest = dates.idxmax()
+            state["newest_date"] = df.at[newest, 'Date']
+            state["newest_key"] = fda_alert_ids(df.loc[[newest]]).iloc[0]
+        save_scrape_state(STATE_SOURCE, state, self.output_dir)
+        
+        return self.output_path
+    
+    def cleanup(self):
+        """Cierra la sesión HTTP."""
+        if self.session is not None:
+            self.session.close()
+            self.session = None
+    
+    def run(self):
+        """
+        Ejecuta el scraping HTTP y, si falla, el scraper de Selenium como alternativa.
+        
+        Returns:
+            bool: True si alguno de los dos scrapers se ejecutó correctamente.
+        """
+        if super().run():
+            return True
+        
+        if not self.fallback:
+            return False
+        
+        self.logger.warning("La descarga HTTP falló. Usando el scraper de Selenium como alternativa.")
+        fallback_scraper = run_selenium_fallback(self.output_dir)
+        if fallback_scraper is None:
+            return False
+        
+        self.output_path = fallback_scraper.output_path
+        return True
+
+def run_selenium_fallback(output_dir=None):
+    """
+    Ejecuta el scraper de Selenium en el mismo proceso como alternativa.
+    
+    Args:
+        output_dir (str, optional): Directorio de salida. Por defecto, SCRAPS_DIR.
+    
+    Returns:
+        FDASeleniumScraper: Scraper ejecutado, o None si falló.
+    """
+    # Importación diferida: Selenium solo se carga si hace falta la alternativa
+    from scrapers.fda_scraper import FDASeleniumScraper
+    
+    scraper = FDASeleniumScraper(output_dir=output_dir)
+    return scraper if scraper.run() else None
+
+def main():
+    """Función principal."""
+    parser = argparse.ArgumentParser(description='Scraper HTTP de retiradas de FDA')
+    parser.add_argument('--url', default=FDA_DATATABLE_URL,
+                        help='URL del endpoint de DataTables (por ejemplo, el servidor de fixtures local)')
+    parser.add_argument('--page-size', type=int, default=FDA_PAGE_SIZE,
+                        help='Filas por petición')
+    parser.add_argument('--output-dir', default=None,
+                        help='Directorio de salida (por defecto, data/scraps/)')
+    parser.add_argument('--full', dest='incremental', action='store_false',
+                        help='Descargar la tabla completa en lugar de solo las retiradas nuevas')
+    parser.add_argument('--no-fallback', dest='fallback', action='store_false',
+                        help='No ejecutar el scraper de Selenium si falla la descarga HTTP')
+    args = parser.parse_args()
+    
+    if not logging.getLogger().handlers:
+        logging.basicConfig(level=logging.INFO,
+                            format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    
+    scraper = FDAHttpScraper(output_dir=args.output_dir, url=args.url, page_size=args.page_size,
+                             incremental=args.incremental, fallback=args.fallback)
+    if scraper.run():
+        print(f"Data saved to {scraper.output_path}")
+        return 0
+    
+    return 1
+
+if __name__ == "__main__":
+    sys.exit(main())
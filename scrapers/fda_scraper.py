@@ -1,12 +1,15 @@
+"""
+Scraper de FDA con Selenium (página a página sobre la tabla de retiradas).
+
+Se usa cuando el backend HTTP (scrapers/fda_http_scraper.py) no está disponible.
+El navegador se toma del pool compartido de BaseScraper.
+"""
 import os
+import sys
+import argparse
 import logging
 from logging.handlers import RotatingFileHandler
 import pandas as pd
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from datetime import datetime
 
 # Obtener el directorio raíz del proyecto (donde está el script o un nivel arriba si está en scrapers/)
 script_dir = os.path.dirname(os.path.abspath(__file__))
@@ -17,118 +20,140 @@ else:
     # El script está en la raíz
     root_dir = script_dir
 
-# Crear carpetas "data", "data/scraps" y "logs" si no existen
-data_dir = os.path.join(root_dir, "data")
-scraps_dir = os.path.join(data_dir, "scraps")
-logs_dir = os.path.join(root_dir, "logs")
-
-os.makedirs(data_dir, exist_ok=True)
-os.makedirs(scraps_dir, exist_ok=True)
-os.makedirs(logs_dir, exist_ok=True)
-
-# Configurar el sistema de logs
-log_file = os.path.join(logs_dir, "fda_scraper.log")
-handler = RotatingFileHandler(log_file, maxBytes=1000000, backupCount=5)
-formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
-handler.setFormatter(formatter)
-logger = logging.getLogger(__name__)
-logger.setLevel(logging.INFO)
-logger.addHandler(handler)
-
-# Setup driver
-options = webdriver.ChromeOptions()
-options.add_argument("--headless")  # Opcional: ejecuta el navegador en modo sin interfaz gráfica
-driver = webdriver.Chrome(options=options)
-wait = WebDriverWait(driver, 30)
+# Añadir el directorio raíz al path para importaciones
+if root_dir not in sys.path:
+    sys.path.append(root_dir)
 
-# Cargar la página inicial
-url = "https://www.fda.gov/safety/recalls-market-withdrawals-safety-alerts"
-driver.get(url)
-print(f"Scraping page 1: {url}")
-logger.info("Scraping page 1: %s", url)
+from config.settings import DATA_DIR, LOGS_DIR, FDA_URL, FDA_FILENAME, FDA_SELENIUM_EXTRACTION
+from scrapers.base_scraper import BaseScraper
 
-# Esperar a que la tabla inicial se cargue
-wait.until(EC.invisibility_of_element_located((By.CSS_SELECTOR, ".dataTables_processing")))
-table = wait.until(EC.presence_of_element_located((By.ID, "datatable")))
-rows = table.find_elements(By.CSS_SELECTOR, "tr[role='row']")[1:]
-print(f"Extracting {len(rows)} rows from page 1...")
-logger.info("Extracting %d rows from page 1", len(rows))
-
-# Lista para almacenar todos los datos scrapeados
-all_data = []
-
-# Procesar las filas de la página 1
-for row in rows:
-    cols = row.find_elements(By.TAG_NAME, "td")
-    if len(cols) >= 8:  # Asegurarse de que la fila tiene suficientes columnas
-        all_data.append({
-            "Date": cols[0].text.strip(),
-            "Brand Name(s)": cols[1].text.strip(),
-            "Product Description": cols[2].text.strip(),
-            "Product Type": cols[3].text.strip(),
-            "Recall Reason Description": cols[4].text.strip(),
-            "Company Name": cols[5].text.strip(),
-            "Terminated Recall": cols[6].text.strip(),
-            "Excerpt": cols[7].text.strip()
-        })
-
-# Bucle de paginación para las siguientes páginas
-page_number = 2
-while True:
-    try:
-        next_button = driver.find_element(By.ID, "datatable_next")
-        if "disabled" in next_button.get_attribute("class"):
-            print("No more pages to scrape.")
-            logger.info("No more pages to scrape.")
-            break
-        print(f"Scraping page {page_number}...")
-        logger.info("Scraping page %d...", page_number)
-        driver.execute_script("arguments[0].click();", next_button)
+class FDASeleniumScraper(BaseScraper):
+    """
+    Scraper de la tabla de retiradas de FDA con Selenium.
+    """
+    
+    def __init__(self, output_dir=None, url=FDA_URL, extraction=FDA_SELENIUM_EXTRACTION):
+        """
+        Inicializa el scraper.
+        
+        Args:
+            output_dir (str, optional): Directorio de salida. Por defecto, SCRAPS_DIR.
+            url (str, optional): URL de la página de retiradas. Por defecto, FDA_URL.
+            extraction (str, optional): Modo de extracción de las filas ('bulk' o 'cells').
+        """
+        super().__init__("fda_selenium", output_dir)
+        self.url = url
+        self.extraction = extraction
+        self.output_path = None
+    
+    def initialize(self):
+        """Toma un navegador del pool compartido."""
+        self.acquire_driver()
+    
+    def scrape(self):
+        """
+        Recorre todas las páginas de la tabla de retiradas.
+        
+        Returns:
+            list: Lista de registros con las columnas de FDA.
+        """
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.support.ui import WebDriverWait
+        from selenium.webdriver.support import expected_conditions as EC
+        from scrapers.fda_extraction import extract_page_records
+        
+        driver = self.driver
+        wait = WebDriverWait(driver, 30)
+        
+        # Cargar la página inicial
+        driver.get(self.url)
+        self.logger.info("Scraping page 1: %s", self.url)
+        
+        # Esperar a que la tabla inicial se cargue
         wait.until(EC.invisibility_of_element_located((By.CSS_SELECTOR, ".dataTables_processing")))
-        rows = wait.until(EC.presence_of_all_elements_located((By.CSS_SELECTOR, "tr[role='row']")))[1:]
-        print(f"Extracting {len(rows)} rows from page {page_number}...")
-        logger.info("Extracting %d rows from page %d", len(rows), page_number)
-        # Procesar las filas de la página actual
-        for row in rows:
-            cols = row.find_elements(By.TAG_NAME, "td")
-            if len(cols) >= 8:
-                all_data.append({
-                    "Date": cols[0].text.strip(),
-                    "Brand Name(s)": cols[1].text.strip(),
-                    "Product Description": cols[2].text.strip(),
-                    "Product Type": cols[3].text.strip(),
-                    "Recall Reason Description": cols[4].text.strip(),
-                    "Company Name": cols[5].text.strip(),
-                    "Terminated Recall": cols[6].text.strip(),
-                    "Excerpt": cols[7].text.strip()
-                })
-        page_number += 1
-    except Exception as e:
-        print(f"Error navigating to page {page_number}: {e}")
-        logger.error("Error navigating to page %d: %s", page_number, e)
-        break
+        table = wait.until(EC.presence_of_element_located((By.ID, "datatable")))
+        
+        # Procesar las filas de la página 1
+        all_data = extract_page_records(driver, mode=self.extraction, table=table)
+        self.logger.info("Extracted %d rows from page 1 (%s)", len(all_data), self.extraction)
+        
+        # Bucle de paginación para las siguientes páginas
+        page_number = 2
+        while True:
+            try:
+                next_button = driver.find_element(By.ID, "datatable_next")
+                if "disabled" in next_button.get_attribute("class"):
+                    self.logger.info("No more pages to scrape.")
+                    break
+                self.logger.info("Scraping page %d...", page_number)
+                driver.execute_script("arguments[0].click();", next_button)
+                wait.until(EC.invisibility_of_element_located((By.CSS_SELECTOR, ".dataTables_processing")))
+                wait.until(EC.presence_of_all_elements_located((By.CSS_SELECTOR, "tr[role='row']")))
+                # Procesar las filas de la página actual
+                page_records = extract_page_records(driver, mode=self.extraction)
+                self.logger.info("Extracted %d rows from page %d", len(page_records), page_number)
+                all_data.extend(page_records)
+                page_number += 1
+            except Exception as e:
+                self.logger.error("Error navigating to page %d: %s", page_number, e)
+                break
+        
+        return all_data
+    
+    def save_data(self, data):
+        """
+        Guarda los registros en data/scraps/fda_alerts_YYYYMMDD.csv (y en data/fda_alerts.csv).
+        
+        Args:
+            data (list): Registros obtenidos.
+        
+        Returns:
+            str: Ruta al archivo guardado en data/scraps/.
+        """
+        if not data:
+            raise ValueError("No data found to save.")
+        
+        df = pd.DataFrame(data)
+        
+        # Guardar en la raíz de data/ para compatibilidad con código existente
+        root_csv_path = os.path.join(DATA_DIR, "fda_alerts.csv")
+        df.to_csv(root_csv_path, index=False)
+        self.logger.info("Data saved to %s with %d records.", root_csv_path, len(data))
+        
+        # Guardar también en data/scraps/ con formato de nombre que incluye fecha
+        self.output_path = os.path.join(self.output_dir, FDA_FILENAME)
+        df.to_csv(self.output_path, index=False)
+        self.logger.info("Data also saved to %s", self.output_path)
+        return self.output_path
+    
+    def cleanup(self):
+        """Devuelve el navegador al pool compartido."""
+        self.release_driver()
 
-# Guardar los datos en archivos CSV
-if all_data:
-    df = pd.DataFrame(all_data)
+def main():
+    """Función principal."""
+    from scrapers.fda_extraction import EXTRACTION_MODES
     
-    # Guardar en la raíz de data/ para compatibilidad con código existente
-    root_csv_path = os.path.join(data_dir, "fda_alerts.csv")
-    df.to_csv(root_csv_path, index=False)
-    print(f"Data saved to {root_csv_path}")
-    logger.info("Data saved to %s with %d records.", root_csv_path, len(all_data))
+    # Modo de extracción: 'bulk' (una llamada a execute_script por página) o 'cells' (una por celda)
+    parser = argparse.ArgumentParser(description='Scraper de FDA con Selenium')
+    parser.add_argument('--extraction', choices=EXTRACTION_MODES, default=FDA_SELENIUM_EXTRACTION,
+                        help='Modo de extracción de las filas de la tabla')
+    args = parser.parse_args()
+    
+    # Configurar el sistema de logs
+    os.makedirs(LOGS_DIR, exist_ok=True)
+    handler = RotatingFileHandler(os.path.join(LOGS_DIR, "fda_scraper.log"), maxBytes=1000000, backupCount=5)
+    handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    logging.getLogger().addHandler(handler)
+    
+    scraper = FDASeleniumScraper(extraction=args.extraction)
+    if scraper.run():
+        print(f"Data saved to {scraper.output_path}")
+        return 0
     
-    # Guardar también en data/scraps/ con formato de nombre que incluye fecha
-    timestamp = datetime.now().strftime("%Y%m%d")
-    scraps_csv_path = os.path.join(scraps_dir, f"fda_alerts_{timestamp}.csv")
-    df.to_csv(scraps_csv_path, index=False)
-    print(f"Data also saved to {scraps_csv_path}")
-    logger.info("Data also saved to %s", scraps_csv_path)
-else:
     print("No data found to save.")
-    logger.warning("No data found to save.")
+    return 1
 
-# Cerrar el navegador
-driver.quit()
-print("Browser closed.")
-logger.info("Browser closed.")
\ No newline at end of file
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,8 +4,8 @@ Adaptador para el scraper de RASFF existente para la nueva estructura.
 import os
 import sys
 import logging
+import time
 import subprocess
-import glob
 from datetime import datetime
 
 # Añadir el directorio raíz al path para importaciones cuando se ejecuta directamente
@@ -26,8 +26,9 @@ def adapt_rasff_scraper():
     Adapta el scraper de RASFF existente para la nueva estructura.
     
     En lugar de reimplementar el scraper desde cero, este adaptador:
-    1. Ejecuta el scraper existente
-    2. Mueve y renombra el archivo resultante a la estructura nueva
+    1. Ejecuta el scraper existente, que espera a que la exportación termine de
+       descargarse y la guarda en SCRAPS_DIR con el nombre RASFF_FILENAME
+    2. Verifica que el archivo se generó en esta ejecución
     
     Returns:
         bool: True si el proceso fue exitoso, False en caso de error.
@@ -61,50 +62,20 @@ def adapt_rasff_scraper():
             logger.error(f"No se encontró el scraper RASFF en ninguna ubicación")
             return False
         
-        # Directorio de datos original
-        original_data_dir = os.path.join(root_dir, "data")
-        
-        # Guardar lista de archivos CSV antes del scraping
-        csv_files_before = set(glob.glob(os.path.join(original_data_dir, "*.csv")))
+        # El scraper guarda la exportación completa directamente en SCRAPS_DIR
+        new_path = os.path.join(SCRAPS_DIR, RASFF_FILENAME)
+        start_time = time.time()
         
-        # Ejecutar el scraper
+        # Ejecutar el scraper (termina cuando la descarga se ha completado)
         logger.info(f"Ejecutando scraper RASFF: {scraper_path}")
         result = subprocess.run([sys.executable, scraper_path], check=True)
         
-        # Esperar un momento para que se complete la descarga
-        import time
-        time.sleep(5)
-        
-        # Listar archivos CSV después del scraping
-        csv_files_after = set(glob.glob(os.path.join(original_data_dir, "*.csv")))
-        
-        # Identificar archivos nuevos
-        new_files = csv_files_after - csv_files_before
-        
-        if not new_files:
-            # Buscar cualquier archivo CSV que pueda ser de RASFF
-            possible_rasff_files = [f for f in csv_files_after if "rasff" in f.lower() or "window" in f.lower()]
-            if possible_rasff_files:
-                new_files = [possible_rasff_files[0]]
-            else:
-                logger.error("No se encontraron archivos CSV nuevos después del scraping")
-                return False
-        
-        # Usar el primer archivo nuevo encontrado
-        original_path = list(new_files)[0]
-        
-        # Verificar que el archivo existe
-        if not os.path.exists(original_path):
-            logger.error(f"No se encontró el archivo generado por el scraper: {original_path}")
+        # Verificar que el archivo se generó en esta ejecución
+        if not os.path.exists(new_path) or os.path.getmtime(new_path) < start_time:
+            logger.error(f"No se encontró el archivo generado por el scraper: {new_path}")
             return False
         
-        # Ruta en la nueva estructura
-        new_path = os.path.join(SCRAPS_DIR, RASFF_FILENAME)
-        
-        # Copiar el archivo a la nueva ubicación
-        import shutil
-        shutil.copy2(original_path, new_path)
-        logger.info(f"Archivo copiado: {original_path} -> {new_path}")
+        logger.info(f"Archivo RASFF disponible en: {new_path}")
         
         return True
         
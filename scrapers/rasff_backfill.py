@@ -0,0 +1,328 @@
+"""
+Backfill histórico de RASFF Window por ventanas de fechas.
+
+Una única exportación de varios años es lenta y puede superar los límites del
+servidor. Este script divide el intervalo en ventanas consecutivas, genera la URL
+de búsqueda de cada una (filtro 'date' del JSON en base64 de 'searchQueries'),
+descarga las exportaciones con concurrencia limitada (un pool de tantos
+navegadores como exportaciones simultáneas, reutilizados entre ventanas) y las
+une en data/scraps/.
+
+Cada ventana terminada se guarda en data/raw/rasff_backfill/<inicio>_<meses>m/ y se
+registra en un checkpoint, de modo que un backfill interrumpido continúa donde
+se quedó al volver a ejecutarlo con el mismo --start y --window-months. Si no se
+indica --end, se usa la fecha final guardada en el checkpoint (o la de hoy, en la
+primera ejecución), por lo que repetir el comando otro día reanuda el mismo backfill.
+
+Uso:
+    python scrapers/rasff_backfill.py --start 2020-01-01 --end 2025-04-30 --window-months 3
+"""
+import os
+import sys
+import json
+import shutil
+import logging
+import argparse
+import tempfile
+import threading
+from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import pandas as pd
+
+# Añadir el directorio raíz al path para importaciones cuando se ejecuta directamente
+root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if root_dir not in sys.path:
+    sys.path.append(root_dir)
+
+from config.settings import (
+    RAW_DATA_DIR, SCRAPS_DIR, RASFF_FILENAME,
+    RASFF_BACKFILL_WINDOW_MONTHS, RASFF_BACKFILL_MAX_WORKERS
+)
+from scrapers.base_scraper import WebDriverPool
+from scrapers.rasff_export import build_search_url, export_rasff_csv
+from processors.data_filter import _read_rasff_csv
+
+logger = logging.getLogger("scraper.rasff_backfill")
+
+CHECKPOINT_FILENAME = "checkpoint.json"
+CHECKPOINT_DATE_FORMAT = "%Y-%m-%d"
+
+def _add_months(date, months):
+    """Suma meses a una fecha (el día se fija al 1 del mes)."""
+    month_index = date.year * 12 + date.month - 1 + months
+    return date.replace(year=month_index // 12, month=month_index % 12 + 1, day=1)
+
+def date_windows(start, end, window_months=RASFF_BACKFILL_WINDOW_MONTHS):
+    """
+    Divide un intervalo de fechas en ventanas consecutivas de meses naturales.
+    
+    Args:
+        start (datetime): Inicio del intervalo (incluido).
+        end (datetime): Fin del intervalo (incluido).
+        window_months (int, optional): Meses por ventana.
+    
+    Returns:
+        list: Tuplas (inicio, fin) con el fin a las 23:59:59 del último día de la ventana.
+    """
+    if window_months < 1:
+        raise ValueError("window_months debe ser al menos 1")
+    
+    windows = []
+    window_start = start.replace(hour=0, minute=0, second=0, microsecond=0)
+    end = end.replace(hour=23, minute=59, second=59, microsecond=0)
+    while window_start <= end:
+        next_start = _add_months(window_start, window_months)
+        window_end = min(next_start - timedelta(seconds=1), end)
+        windows.append((window_start, window_end))
+        window_start = next_start
+    return windows
+
+def window_key(window):
+    """Identificador de una ventana (AAAAMMDD_AAAAMMDD)."""
+    return f"{window[0].strftime('%Y%m%d')}_{window[1].strftime('%Y%m%d')}"
+
+def read_window_csv(path):
+    """
+    Lee la exportación de una ventana omitiendo las líneas mal formadas.
+    
+    Una exportación vacía (sin cabecera) corresponde a una ventana sin notificaciones.
+    
+    Args:
+        path (str): Ruta al CSV de la ventana.
+    
+    Returns:
+        pandas.DataFrame: Notificaciones de la ventana (vacío si no hay ninguna).
+    """
+    try:
+        return _read_rasff_csv(path)
+    except pd.errors.EmptyDataError:
+        return pd.DataFrame()
+
+class RasffBackfill:
+    """
+    Backfill de RASFF por ventanas de fechas con checkpoints.
+    """
+    
+    def __init__(self, start, end=None, window_months=RASFF_BACKFILL_WINDOW_MONTHS,
+                 max_workers=RASFF_BACKFILL_MAX_WORKERS, work_dir=None, output_dir=None, timeout=120,
+                 restart=False):
+        """
+        Inicializa el backfill.
+        
+        Args:
+            start (datetime): Inicio del intervalo (incluido).
+            end (datetime, optional): Fin del intervalo (incluido). Si es None, se usa el
+                guardado en el checkpoint o, si no hay, la fecha de hoy.
+            window_months (int, optional): Meses por ventana.
+            max_workers (int, optional): Exportaciones simultáneas.
+            work_dir (str, optional): Directorio de las ventanas y el checkpoint.
+                Por defecto, data/raw/rasff_backfill/<inicio>_<meses>m/.
+            output_dir (str, optional): Directorio del CSV unido. Por defecto, SCRAPS_DIR.
+            timeout (float, optional): Tiempo máximo de descarga por ventana en segundos.
+            restart (bool, optional): Si es True, descarta el checkpoint y descarga de nuevo todas las ventanas.
+        """
+        self.max_workers = max(1, max_workers)
+        self.work_dir = work_dir or os.path.join(
+            RAW_DATA_DIR, "rasff_backfill", f"{start.strftime('%Y%m%d')}_{window_months}m"
+        )
+        self.output_dir = output_dir or SCRAPS_DIR
+        self.timeout = timeout
+        self.checkpoint_path = os.path.join(self.work_dir, CHECKPOINT_FILENAME)
+        self._lock = threading.Lock()
+        self.driver_pool = WebDriverPool(max_size=self.max_workers)
+        
+        os.makedirs(self.work_dir, exist_ok=True)
+        self.checkpoint = {"completed": {}} if restart else self._load_checkpoint()
+        
+        # La fecha final se guarda en el checkpoint para que una nueva ejecución sin --end la reutilice
+        if end is None:
+            stored_end = self.checkpoint.get("end")
+            end = datetime.strptime(stored_end, CHECKPOINT_DATE_FORMAT) if stored_end else datetime.now()
+        self.end = end.replace(hour=0, minute=0, second=0, microsecond=0)
+        self.windows = date_windows(start, self.end, window_months)
+        
+        if self.checkpoint.get("end") != self.end.strftime(CHECKPOINT_DATE_FORMAT):
+            self.checkpoint["end"] = self.end.strftime(CHECKPOINT_DATE_FORMAT)
+            self._save_checkpoint()
+    
+    def _load_checkpoint(self):
+        """Carga las ventanas completadas (y la fecha final) de ejecuciones anteriores."""
+        if not os.path.exists(self.checkpoint_path):
+            return {"completed": {}}
+        
+        with open(self.checkpoint_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    
+    def _save_checkpoint(self):
+        """Guarda el checkpoint de forma atómica."""
+        tmp_path = f"{self.checkpoint_path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.checkpoint, f, indent=2, ensure_ascii=False)
+        os.replace(tmp_path, self.checkpoint_path)
+    
+    def window_path(self, window):
+        """Ruta del CSV de una ventana."""
+        return os.path.join(self.work_dir, f"rasff_{window_key(window)}.csv")
+    
+    def pending_windows(self):
+        """
+        Devuelve las ventanas que faltan por descargar.
+        
+        Returns:
+            list: Ventanas sin checkpoint o cuyo CSV ya no existe.
+        """
+        completed = self.checkpoint["completed"]
+        return [
+            window for window in self.windows
+            if window_key(window) not in completed or not os.path.exists(self.window_path(window))
+        ]
+    
+    def export_window(self, window):
+        """
+        Descarga la exportación CSV de una ventana.
+        
+        Args:
+            window (tuple): Ventana (inicio, fin).
+        
+        Returns:
+            str: Ruta al CSV descargado (en un directorio temporal), o None si falló.
+        """
+        download_dir = tempfile.mkdtemp(prefix="rasff_download_", dir=self.work_dir)
+        driver = self.driver_pool.acquire(download_dir)
+        try:
+            return export_rasff_csv(driver, build_search_url(*window), download_dir,
+                                    timeout=self.timeout, logger=logger)
+        finally:
+            self.driver_pool.release(driver)
+    
+    def _fetch_window(self, window):
+        """Descarga una ventana, la guarda en el directorio de trabajo y registra el checkpoint."""
+        key = window_key(window)
+        downloaded_path = self.export_window(window)
+        if not downloaded_path:
+            raise RuntimeError(f"La exportación de la ventana {key} no se completó a tiempo")
+        
+        window_path = self.window_path(window)
+        shutil.move(downloaded_path, window_path)
+        shutil.rmtree(os.path.dirname(downloaded_path), ignore_errors=True)
+        rows = len(read_window_csv(window_path))
+        
+        with self._lock:
+            self.checkpoint["completed"][key] = {"rows": rows, "path": os.path.basename(window_path)}
+            self._save_checkpoint()
+        
+        logger.info(f"Ventana {key} completada: {rows} notificaciones")
+        return rows
+    
+    def _close_browsers(self):
+        """Cierra los navegadores y elimina los directorios de descarga temporales."""
+        self.driver_pool.close_all()
+        for entry in os.listdir(self.work_dir):
+            if entry.startswith("rasff_download_"):
+                shutil.rmtree(os.path.join(self.work_dir, entry), ignore_errors=True)
+    
+    def fetch(self):
+        """
+        Descarga las ventanas pendientes con concurrencia limitada.
+        
+        Returns:
+            list: Claves de las ventanas que fallaron.
+        """
+        pending = self.pending_windows()
+        logger.info(
+            f"Backfill RASFF: {len(self.windows)} ventanas, {len(self.windows) - len(pending)} ya completadas, "
+            f"{len(pending)} pendientes ({self.max_workers} simultáneas)"
+        )
+        
+        failed = []
+        try:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                futures = {executor.submit(self._fetch_window, window): window for window in pending}
+                for future in as_completed(futures):
+                    key = window_key(futures[future])
+                    try:
+                        future.result()
+                    except Exception as e:
+                        logger.error(f"Error en la ventana {key}: {e}")
+                        failed.append(key)
+        finally:
+            self._close_browsers()
+        
+        return sorted(failed)
+    
+    def stitch(self):
+        """
+        Une las ventanas completadas en data/scraps/rasff_window_YYYYMMDD.csv.
+        
+        Las notificaciones repetidas en varias ventanas se conservan una sola vez.
+        
+        Returns:
+            str: Ruta al CSV unido.
+        """
+        frames = [
+            read_window_csv(self.window_path(window))
+            for window in reversed(self.windows)
+            if window_key(window) in self.checkpoint["completed"] and os.path.exists(self.window_path(window))
+        ]
+        if not frames:
+            raise ValueError("No hay ventanas completadas que unir")
+        
+        stitched_df = pd.concat(frames, ignore_index=True)
+        if 'reference' in stitched_df.columns:
+            stitched_df = stitched_df.drop_duplicates(subset='reference', keep='first')
+        
+        os.makedirs(self.output_dir, exist_ok=True)
+        output_path = os.path.join(self.output_dir, RASFF_FILENAME)
+        stitched_df.to_csv(output_path, index=False)
+        logger.info(f"Backfill unido: {len(stitched_df)} notificaciones en {output_path}")
+        return output_path
+    
+    def run(self):
+        """
+        Ejecuta el backfill completo (descarga pendiente y unión).
+        
+        Returns:
+            str: Ruta al CSV unido, o None si quedan ventanas sin descargar.
+        """
+        failed = self.fetch()
+        if failed:
+            logger.error(
+                f"{len(failed)} ventanas sin completar: {', '.join(failed)}. "
+                "Vuelva a ejecutar el backfill con el mismo --start y --window-months para reanudarlo."
+            )
+            return None
+        
+        return self.stitch()
+
+def main():
+    """Función principal."""
+    parser = argparse.ArgumentParser(description='Backfill histórico de RASFF por ventanas de fechas')
+    parser.add_argument('--start', required=True, type=lambda s: datetime.strptime(s, '%Y-%m-%d'),
+                        help='Fecha inicial (AAAA-MM-DD)')
+    parser.add_argument('--end', type=lambda s: datetime.strptime(s, '%Y-%m-%d'),
+                        help='Fecha final (AAAA-MM-DD). Por defecto, la del checkpoint o, si no hay, hoy')
+    parser.add_argument('--window-months', type=int, default=RASFF_BACKFILL_WINDOW_MONTHS,
+                        help='Meses por ventana de exportación')
+    parser.add_argument('--max-workers', type=int, default=RASFF_BACKFILL_MAX_WORKERS,
+                        help='Exportaciones simultáneas (tamaño del pool de navegadores)')
+    parser.add_argument('--restart', action='store_true',
+                        help='Descartar el checkpoint y descargar de nuevo todas las ventanas')
+    args = parser.parse_args()
+    
+    if not logging.getLogger().handlers:
+        logging.basicConfig(level=logging.INFO,
+                            format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    
+    backfill = RasffBackfill(args.start, args.end, window_months=args.window_months,
+                             max_workers=args.max_workers, restart=args.restart)
+    
+    output_path = backfill.run()
+    if output_path:
+        print(f"Archivo guardado como: {output_path}")
+        return 0
+    
+    return 1
+
+if __name__ == "__main__":
+    sys.exit(main())
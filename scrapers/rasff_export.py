@@ -0,0 +1,92 @@
+"""
+Exportación de notificaciones de RASFF Window a CSV con Selenium.
+
+RASFF Window codifica los filtros de búsqueda como un JSON en base64 en el
+parámetro 'searchQueries' de la URL. Este módulo permite generar esa URL para
+un intervalo de fechas y descargar la exportación CSV correspondiente.
+"""
+import json
+import base64
+from urllib.parse import quote, unquote, urlsplit, urlunsplit, parse_qs
+
+from config.settings import RASFF_URL, RASFF_QUERY_DATE_FORMAT
+from utils.file_utils import wait_for_download
+
+EXPORT_BUTTON_XPATH = "//div[@id='export-list']/a[img[@alt='exportCsv']]"
+
+def decode_search_query(url=RASFF_URL):
+    """
+    Decodifica el JSON de filtros de búsqueda de una URL de RASFF Window.
+    
+    Args:
+        url (str, optional): URL de búsqueda. Por defecto, RASFF_URL.
+    
+    Returns:
+        dict: Filtros de búsqueda.
+    """
+    encoded = parse_qs(urlsplit(url).query).get("searchQueries", [""])[0]
+    if not encoded:
+        return {}
+    
+    encoded = unquote(encoded)
+    encoded += "=" * (-len(encoded) % 4)
+    return json.loads(base64.b64decode(encoded).decode("utf-8"))
+
+def build_search_url(start=None, end=None, base_url=RASFF_URL):
+    """
+    Genera la URL de búsqueda de RASFF Window para un intervalo de fechas.
+    
+    Conserva el resto de filtros de la URL base (categorías de producto, etc.) y
+    sustituye 'date.startRange' / 'date.endRange'.
+    
+    Args:
+        start (datetime, optional): Inicio del intervalo (incluido).
+        end (datetime, optional): Fin del intervalo (incluido).
+        base_url (str, optional): URL de búsqueda de partida. Por defecto, RASFF_URL.
+    
+    Returns:
+        str: URL de búsqueda con el intervalo de fechas.
+    """
+    query = decode_search_query(base_url)
+    query["date"] = {
+        "startRange": start.strftime(RASFF_QUERY_DATE_FORMAT) if start else "",
+        "endRange": end.strftime(RASFF_QUERY_DATE_FORMAT) if end else ""
+    }
+    encoded = base64.b64encode(json.dumps(query, separators=(",", ":")).encode("utf-8")).decode("ascii")
+    
+    parts = urlsplit(base_url)
+    return urlunsplit(parts._replace(query=f"searchQueries={quote(encoded, safe='')}"))
+
+def export_rasff_csv(driver, url, download_dir, timeout=60, logger=None):
+    """
+    Abre una búsqueda de RASFF Window y descarga su exportación CSV.
+    
+    Args:
+        driver (WebDriver): Driver cuyo directorio de descarga es download_dir.
+        url (str): URL de búsqueda.
+        download_dir (str): Directorio de descarga (vacío antes de la exportación).
+        timeout (float, optional): Tiempo máximo de espera de la descarga en segundos.
+        logger (logging.Logger, optional): Logger para los mensajes de progreso.
+    
+    Returns:
+        str: Ruta al CSV descargado, o None si no se completó a tiempo.
+    """
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support.ui import WebDriverWait
+    from selenium.webdriver.support import expected_conditions as EC
+    
+    driver.get(url)
+    if logger:
+        logger.info("Accediendo a %s", url)
+    
+    # Esperar a que el botón de exportación CSV esté disponible y sea clicable
+    csv_button = WebDriverWait(driver, 30).until(EC.element_to_be_clickable((By.XPATH, EXPORT_BUTTON_XPATH)))
+    if logger:
+        logger.info("Botón de exportación CSV encontrado. Iniciando descarga...")
+    
+    # Desplazar la vista hasta el botón y usar click por JavaScript para evitar que otro elemento lo intercepte
+    driver.execute_script("arguments[0].scrollIntoView(true);", csv_button)
+    driver.execute_script("arguments[0].click();", csv_button)
+    
+    # Esperar a que la exportación termine de escribirse en el directorio de descarga
+    return wait_for_download(download_dir, suffix=".csv", timeout=timeout)
@@ -0,0 +1,76 @@
+"""
+Estado persistente de los scrapers incrementales.
+
+Para cada fuente se guarda la marca de agua (high-water mark) de la última
+ejecución: la fecha y la clave del registro más reciente visto y la ruta de la
+instantánea completa generada. El archivo es un JSON en data/scraps/ que se
+escribe de forma atómica.
+"""
+import os
+import json
+from datetime import datetime
+
+from config.settings import SCRAPS_DIR, SCRAPE_STATE_FILENAME
+
+def get_state_path(state_dir=None):
+    """
+    Obtiene la ruta del archivo de estado de los scrapers.
+    
+    Args:
+        state_dir (str, optional): Directorio del estado. Por defecto, SCRAPS_DIR.
+    
+    Returns:
+        str: Ruta al archivo de estado.
+    """
+    return os.path.join(state_dir or SCRAPS_DIR, SCRAPE_STATE_FILENAME)
+
+def load_scrape_state(source, state_dir=None):
+    """
+    Carga el estado guardado de una fuente.
+    
+    Args:
+        source (str): Nombre de la fuente (por ejemplo, 'fda').
+        state_dir (str, optional): Directorio del estado. Por defecto, SCRAPS_DIR.
+    
+    Returns:
+        dict: Estado de la fuente (vacío si no hay ejecuciones anteriores).
+    """
+    path = get_state_path(state_dir)
+    if not os.path.exists(path):
+        return {}
+    
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f).get(source, {})
+    except (OSError, ValueError):
+        return {}
+
+def save_scrape_state(source, state, state_dir=None):
+    """
+    Guarda el estado de una fuente conservando el del resto de fuentes.
+    
+    Args:
+        source (str): Nombre de la fuente.
+        state (dict): Estado a guardar.
+        state_dir (str, optional): Directorio del estado. Por defecto, SCRAPS_DIR.
+    
+    Returns:
+        str: Ruta al archivo de estado.
+    """
+    path = get_state_path(state_dir)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    all_states = {}
+    if os.path.exists(path):
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                all_states = json.load(f)
+        except (OSError, ValueError):
+            all_states = {}
+    
+    all_states[source] = dict(state, updated_at=datetime.now().isoformat(timespec='seconds'))
+    
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(all_states, f, indent=2, ensure_ascii=False)
+    os.replace(tmp_path, path)
+    return path
@@ -0,0 +1,357 @@
+"""
+Generación en streaming del informe Excel de riesgos alimentarios.
+
+Usa un libro de openpyxl en modo write_only: las filas se escriben en orden y se
+vuelcan al archivo según se añaden, por lo que la memoria no depende del número
+de alertas. El color del nivel de riesgo se aplica con reglas de formato
+condicional sobre la columna completa en lugar de un relleno por celda.
+
+El contenido de las hojas es el mismo que el de la ruta openpyxl original de
+AlertReportGenerator (hoja de resumen y una hoja por categoría); los totales y
+distribuciones se leen del cubo de alertas (ver processors.alert_cube).
+"""
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Columnas de la tabla de detalle de alertas y sus nombres en el Excel
+DETAIL_COLUMNS = ['date', 'product_name', 'hazard_type', 'country_origin',
+                  'severidad', 'probabilidad', 'nivel_riesgo']
+DETAIL_HEADERS = ['Fecha', 'Producto', 'Tipo de Peligro', 'País de Origen',
+                  'Severidad', 'Probabilidad', 'Nivel de Riesgo']
+
+# Color de fondo de cada nivel de riesgo
+RISK_LEVEL_FILLS = {
+    'Alto': "FFCCCC",
+    'Moderado': "FFFFCC",
+    'Bajo': "CCFFCC",
+}
+
+# Filas de detalle que se convierten a la vez (limita la memoria de la conversión)
+DETAIL_BATCH_ROWS = 10000
+
+def _truncate(text, length=50):
+    """Recorta un texto largo para mostrarlo en una celda."""
+    text = str(text)
+    if len(text) > length:
+        return text[:length - 3] + "..."
+    return text
+
+def summary_sheet_data(cube):
+    """
+    Calcula los agregados de la hoja de resumen.
+    
+    Args:
+        cube (processors.alert_cube.AlertCube): Cubo de alertas del dataset puntuado.
+    
+    Returns:
+        dict: Totales y distribuciones que se muestran en la hoja.
+    """
+    return {
+        "total": cube.total,
+        "categories": cube.nunique('category'),
+        "countries": cube.nunique('country_origin'),
+        "hazards": cube.nunique('hazard_type'),
+        "risk_dist": cube.counts('nivel_riesgo'),
+        "top_countries": cube.counts('country_origin').head(5),
+        "top_hazards": cube.counts('hazard_type').head(5),
+    }
+
+def category_sheet_data(cube):
+    """
+    Calcula los agregados de la hoja de una categoría.
+    
+    Args:
+        cube (processors.alert_cube.AlertCube): Subcubo de la categoría.
+    
+    Returns:
+        dict: Totales y distribuciones que se muestran en la hoja.
+    """
+    hazards = cube.counts('hazard_type')
+    countries = cube.counts('country_origin')
+    return {
+        "total": cube.total,
+        "high_risk": cube.filter(nivel_riesgo='Alto').total,
+        "top_hazard": hazards.index[0] if len(hazards) > 0 else "N/A",
+        "top_country": countries.index[0] if len(countries) > 0 else "N/A",
+        "risk_dist": cube.counts('nivel_riesgo'),
+        "year_counts": cube.counts('year').sort_index(),
+        "top_countries": countries.head(5),
+    }
+
+def compute_category_data(cube, categories):
+    """
+    Calcula los agregados de las hojas de categoría.
+    
+    Se leen de subcubos de unos pocos cientos de celdas, por lo que se calculan en
+    este proceso (un pool de procesos costaría más en arranque y serialización).
+    
+    Args:
+        cube (processors.alert_cube.AlertCube): Cubo de alertas del dataset puntuado.
+        categories (list): Categorías con hoja.
+    
+    Returns:
+        dict: Agregados de category_sheet_data() por categoría.
+    """
+    return {category: category_sheet_data(cube.filter(category=category)) for category in categories}
+
+class _RowStream:
+    """
+    Escritura secuencial de filas en una hoja write_only, llevando la cuenta de la fila actual.
+    """
+    
+    def __init__(self, ws):
+        self.ws = ws
+        self.row = 0
+    
+    def append(self, values, font=None):
+        """
+        Añade una fila.
+        
+        Args:
+            values (list): Valores de la fila.
+            font (openpyxl.styles.Font, optional): Fuente para todas las celdas de la fila.
+        
+        Returns:
+            int: Número de la fila escrita (empezando en 1).
+        """
+        if font is not None:
+            from openpyxl.cell import WriteOnlyCell
+            
+            cells = []
+            for value in values:
+                cell = WriteOnlyCell(self.ws, value=value)
+                cell.font = font
+                cells.append(cell)
+            values = cells
+        
+        self.ws.append(values)
+        self.row += 1
+        return self.row
+    
+    def blank(self):
+        """Añade una fila vacía."""
+        return self.append([])
+    
+    def title(self, text, font, last_column='D', alignment=None):
+        """
+        Añade un título en la columna A, combinado hasta last_column.
+        
+        Returns:
+            int: Número de la fila escrita.
+        """
+        from openpyxl.cell import WriteOnlyCell
+        
+        cell = WriteOnlyCell(self.ws, value=text)
+        cell.font = font
+        if alignment is not None:
+            cell.alignment = alignment
+        row = self.append([cell])
+        self.ws.merged_cells.add(f"A{row}:{last_column}{row}")
+        return row
+
+def _set_column_widths(ws, widths):
+    """Fija el ancho de las columnas (debe hacerse antes de escribir filas)."""
+    from openpyxl.utils import get_column_letter
+    
+    for i, width in enumerate(widths, start=1):
+        ws.column_dimensions[get_column_letter(i)].width = width
+
+def _write_header(stream, report_title, report_date):
+    """Escribe el título y la fecha del informe (filas 1 y 2) y la fila vacía siguiente."""
+    from openpyxl.styles import Font, Alignment
+    
+    stream.title(report_title, Font(bold=True, size=14), last_column='H',
+                 alignment=Alignment(horizontal='center'))
+    stream.title(f"Fecha del informe: {report_date}", Font(italic=True), last_column='H')
+    stream.blank()
+
+def write_summary_sheet(wb, data, report_date):
+    """
+    Escribe la hoja de resumen en un libro write_only.
+    
+    Args:
+        wb (openpyxl.Workbook): Libro en modo write_only.
+        data (dict): Agregados de summary_sheet_data().
+        report_date (str): Fecha del informe.
+    """
+    from openpyxl.styles import Font
+    from openpyxl.chart import BarChart, Reference, PieChart
+    
+    ws = wb.create_sheet("Resumen General")
+    _set_column_widths(ws, [40, 15, 15, 15])
+    stream = _RowStream(ws)
+    bold = Font(bold=True)
+    
+    _write_header(stream, "RESUMEN GENERAL DE ALERTAS ALIMENTARIAS", report_date)
+    
+    # Estadísticas generales
+    stream.title("Estadísticas Generales", bold)
+    stream.append(["Total de alertas:", data["total"]])
+    stream.append(["Categorías de productos:", data["categories"]])
+    stream.append(["Países de origen:", data["countries"]])
+    stream.append(["Tipos de peligros:", data["hazards"]])
+    stream.blank()
+    
+    # Distribución por nivel de riesgo
+    risk_dist = data["risk_dist"]
+    stream.title("Distribución por Nivel de Riesgo", bold)
+    header_row = stream.append(["Nivel de Riesgo", "Cantidad", "Porcentaje", ""], font=bold)
+    for nivel, count in risk_dist.items():
+        stream.append([nivel, count, f"{count/data['total']*100:.1f}%"])
+    stream.blank()
+    
+    pie = PieChart()
+    labels = Reference(ws, min_col=1, min_row=header_row+1, max_row=header_row+len(risk_dist))
+    values = Reference(ws, min_col=2, min_row=header_row, max_row=header_row+len(risk_dist))
+    pie.add_data(values, titles_from_data=True)
+    pie.set_categories(labels)
+    pie.title = "Distribución por Nivel de Riesgo"
+    ws.add_chart(pie, f"E{header_row}")
+    
+    # Top países de origen
+    top_countries = data["top_countries"]
+    stream.title("Top 5 Países de Origen con Más Alertas", bold)
+    header_row = stream.append(["País", "Cantidad", "", ""], font=bold)
+    for country, count in top_countries.items():
+        stream.append([country, count])
+    stream.blank()
+    
+    bar = BarChart()
+    values = Reference(ws, min_col=2, min_row=header_row, max_row=header_row+len(top_countries))
+    cats = Reference(ws, min_col=1, min_row=header_row+1, max_row=header_row+len(top_countries))
+    bar.add_data(values, titles_from_data=True)
+    bar.set_categories(cats)
+    bar.title = "Top 5 Países de Origen"
+    ws.add_chart(bar, f"E{header_row}")
+    
+    # Top peligros
+    stream.title("Top 5 Tipos de Peligros Más Frecuentes", bold)
+    stream.append(["Tipo de Peligro", "Cantidad", "", ""], font=bold)
+    for hazard, count in data["top_hazards"].items():
+        stream.append([_truncate(hazard), count])
+
+def _detail_rows(df_cat):
+    """
+    Genera las filas de la tabla de detalle por lotes, con los nulos como celdas vacías.
+    
+    Args:
+        df_cat (pandas.DataFrame): Alertas puntuadas de la categoría.
+    
+    Yields:
+        list: Valores de una fila.
+    """
+    for start in range(0, len(df_cat), DETAIL_BATCH_ROWS):
+        batch = df_cat[DETAIL_COLUMNS].iloc[start:start + DETAIL_BATCH_ROWS].astype(object)
+        batch = batch.where(batch.notna(), None)
+        yield from batch.itertuples(index=False, name=None)
+
+def _add_risk_level_formatting(ws, cell_range):
+    """Colorea la columna de nivel de riesgo con reglas de formato condicional."""
+    from openpyxl.styles import PatternFill
+    from openpyxl.formatting.rule import CellIsRule
+    
+    for level, color in RISK_LEVEL_FILLS.items():
+        fill = PatternFill(start_color=color, end_color=color, fill_type="solid")
+        ws.conditional_formatting.add(
+            cell_range, CellIsRule(operator='equal', formula=[f'"{level}"'], fill=fill)
+        )
+
+def write_category_sheet(wb, category, data, df_cat, report_date):
+    """
+    Escribe la hoja de una categoría en un libro write_only.
+    
+    La tabla de detalle se escribe fila a fila desde df_cat sin copiar la categoría completa.
+    
+    Args:
+        wb (openpyxl.Workbook): Libro en modo write_only.
+        category (str): Categoría de producto.
+        data (dict): Agregados de category_sheet_data().
+        df_cat (pandas.DataFrame): Alertas puntuadas de la categoría.
+        report_date (str): Fecha del informe.
+    """
+    from openpyxl.styles import Font
+    from openpyxl.utils import get_column_letter
+    
+    # Excel limita los nombres de hoja a 31 caracteres
+    ws = wb.create_sheet(category.capitalize()[:31])
+    _set_column_widths(ws, [15, 40, 40, 20, 15, 15, 15])
+    stream = _RowStream(ws)
+    bold = Font(bold=True)
+    total = data["total"]
+    
+    _write_header(stream, f"ANÁLISIS DE ALERTAS: {category.upper()}", report_date)
+    
+    # Estadísticas de categoría
+    stream.title("Estadísticas de la Categoría", bold)
+    stream.append(["Total de alertas:", total])
+    stream.append(["Alertas de alto riesgo:", data["high_risk"], f"{data['high_risk']/total*100:.1f}%"])
+    stream.append(["Principal tipo de peligro:", _truncate(data["top_hazard"])])
+    stream.append(["Principal país de origen:", data["top_country"]])
+    stream.blank()
+    
+    # Distribución por nivel de riesgo
+    stream.title("Distribución por Nivel de Riesgo", bold)
+    stream.append(["Nivel de Riesgo", "Cantidad", "Porcentaje", ""], font=bold)
+    for nivel, count in data["risk_dist"].items():
+        stream.append([nivel, count, f"{count/total*100:.1f}%"])
+    stream.blank()
+    
+    # Tendencia temporal
+    stream.title("Evolución Temporal de Alertas", bold)
+    stream.append(["Año", "Cantidad", "", ""], font=bold)
+    for year, count in data["year_counts"].items():
+        stream.append([year, count])
+    stream.blank()
+    
+    # Top 5 países para esta categoría
+    stream.title("Top 5 Países de Origen", bold)
+    stream.append(["País", "Cantidad", "Porcentaje", ""], font=bold)
+    for country, count in data["top_countries"].items():
+        stream.append([country, count, f"{count/total*100:.1f}%"])
+    stream.blank()
+    
+    # Tabla de datos de alertas
+    stream.title("Detalles de Alertas", bold, last_column='H')
+    header_row = stream.append(DETAIL_HEADERS, font=bold)
+    for values in _detail_rows(df_cat):
+        stream.append(values)
+    
+    if stream.row > header_row:
+        risk_column = get_column_letter(DETAIL_COLUMNS.index('nivel_riesgo') + 1)
+        _add_risk_level_formatting(ws, f"{risk_column}{header_row + 1}:{risk_column}{stream.row}")
+
+def write_streaming_workbook(df, excel_path, report_date, cube=None):
+    """
+    Genera el informe Excel completo en modo write_only.
+    
+    Los agregados se leen del cubo de alertas y las hojas se escriben después, en orden.
+    
+    Args:
+        df (pandas.DataFrame): Dataset puntuado (para las tablas de detalle).
+        excel_path (str): Ruta del archivo Excel de salida.
+        report_date (str): Fecha del informe.
+        cube (processors.alert_cube.AlertCube, optional): Cubo de alertas de df. Si no se
+            indica, se construye.
+    
+    Returns:
+        str: Ruta al archivo Excel generado.
+    """
+    import openpyxl
+    from processors.alert_cube import AlertCube, REPORT_CUBE_DIMENSIONS
+    
+    if cube is None:
+        cube = AlertCube.build(df, REPORT_CUBE_DIMENSIONS)
+    
+    # Agrupar una sola vez en lugar de filtrar el dataset por cada categoría
+    groups = [(category, df_cat) for category, df_cat in df.groupby('category', sort=True, observed=True)
+              if len(df_cat) > 0]
+    category_data = compute_category_data(cube, [category for category, _ in groups])
+    
+    wb = openpyxl.Workbook(write_only=True)
+    write_summary_sheet(wb, summary_sheet_data(cube), report_date)
+    for category, df_cat in groups:
+        write_category_sheet(wb, category, category_data[category], df_cat, report_date)
+    
+    wb.save(excel_path)
+    return excel_path
@@ -0,0 +1,154 @@
+"""
+Caché del dataset puntuado para la generación de informes.
+
+La clasificación de riesgos (año, severidad, probabilidad y nivel de riesgo) se
+guarda en Parquet junto con la huella del dataset de origen y la versión de las
+reglas de puntuación. Si ni el dataset ni las reglas han cambiado, los informes
+cargan directamente el dataset puntuado; si solo se han añadido alertas, las
+puntuaciones por fila de las alertas ya conocidas se reutilizan. Junto al
+dataset se guarda el cubo de alertas pre-agregado (ver processors.alert_cube).
+"""
+import os
+import json
+import logging
+
+from config.settings import FINAL_DIR, REPORT_CACHE_DIRNAME
+from processors.alert_cube import AlertCube, REPORT_CUBE_DIMENSIONS, dataset_fingerprint
+from processors.storage import get_storage_format, _pyarrow_available
+
+logger = logging.getLogger(__name__)
+
+SCORED_DATASET_FILENAME = "scored_alerts.parquet"
+CUBE_FILENAME = "alert_cube.parquet"
+CACHE_METADATA_FILENAME = "scored_alerts.json"
+
+# Columnas que solo dependen de la propia alerta (se reutilizan para las alertas ya puntuadas)
+ROW_SCORE_COLUMNS = ['year', 'severidad_num']
+
+class ScoredDatasetCache:
+    """
+    Dataset puntuado guardado en Parquet con sus metadatos de validez.
+    """
+    
+    def __init__(self, cache_dir=None):
+        """
+        Inicializa la caché.
+        
+        Args:
+            cache_dir (str, optional): Directorio de la caché. Por defecto, data/final/report_cache.
+        """
+        self.cache_dir = cache_dir or os.path.join(FINAL_DIR, REPORT_CACHE_DIRNAME)
+        self.data_path = os.path.join(self.cache_dir, SCORED_DATASET_FILENAME)
+        self.metadata_path = os.path.join(self.cache_dir, CACHE_METADATA_FILENAME)
+        self.cube_path = os.path.join(self.cache_dir, CUBE_FILENAME)
+        
+        # La caché es columnar: sin pyarrow no se usa
+        self.enabled = _pyarrow_available()
+        if not self.enabled:
+            logger.info("pyarrow no está instalado. La caché de puntuaciones está desactivada.")
+    
+    def _load_metadata(self):
+        """Carga los metadatos de la caché (vacíos si no existe o está dañada)."""
+        if not os.path.exists(self.metadata_path) or not os.path.exists(self.data_path):
+            return {}
+        try:
+            with open(self.metadata_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+    
+    def load(self, fingerprint, rules_version):
+        """
+        Carga el dataset puntuado si corresponde al dataset y a las reglas indicados.
+        
+        Args:
+            fingerprint (str): Huella del dataset de origen.
+            rules_version (str): Versión de las reglas de puntuación.
+        
+        Returns:
+            pandas.DataFrame: Dataset puntuado, o None si la caché no es válida.
+        """
+        if not self.enabled:
+            return None
+        
+        metadata = self._load_metadata()
+        if metadata.get("fingerprint") != fingerprint or metadata.get("rules_version") != rules_version:
+            return None
+        
+        return get_storage_format("parquet").read(self.data_path)
+    
+    def load_cube(self, fingerprint, rules_version):
+        """
+        Carga el cubo de alertas del dataset puntuado si la caché es válida.
+        
+        Args:
+            fingerprint (str): Huella del dataset de origen.
+            rules_version (str): Versión de las reglas de puntuación.
+        
+        Returns:
+            AlertCube: Cubo de los informes, o None si la caché no es válida o no lo contiene.
+        """
+        if not self.enabled or not os.path.exists(self.cube_path):
+            return None
+        
+        metadata = self._load_metadata()
+        if (metadata.get("fingerprint") != fingerprint or metadata.get("rules_version") != rules_version
+                or metadata.get("cube_dimensions") != REPORT_CUBE_DIMENSIONS):
+            return None
+        
+        return AlertCube.load(self.cube_path, REPORT_CUBE_DIMENSIONS)
+    
+    def load_row_scores(self, rules_version):
+        """
+        Carga las puntuaciones por alerta de la caché, aunque el dataset haya cambiado.
+        
+        Args:
+            rules_version (str): Versión de las reglas de puntuación.
+        
+        Returns:
+            pandas.DataFrame: Puntuaciones indexadas por alert_id, o None si no hay
+                caché con las mismas reglas.
+        """
+        if not self.enabled:
+            return None
+        
+        metadata = self._load_metadata()
+        if metadata.get("rules_version") != rules_version:
+            return None
+        
+        scores = get_storage_format("parquet").read(self.data_path, columns=['alert_id'] + ROW_SCORE_COLUMNS)
+        return scores.drop_duplicates(subset='alert_id').set_index('alert_id')
+    
+    def save(self, df, fingerprint, rules_version, cube=None):
+        """
+        Guarda el dataset puntuado y sus metadatos.
+        
+        Args:
+            df (pandas.DataFrame): Dataset puntuado.
+            fingerprint (str): Huella del dataset de origen.
+            rules_version (str): Versión de las reglas de puntuación.
+            cube (AlertCube, optional): Cubo de alertas del dataset puntuado.
+        """
+        if not self.enabled:
+            return
+        
+        os.makedirs(self.cache_dir, exist_ok=True)
+        
+        # Invalidar primero los metadatos para no dejar una caché incoherente si falla la escritura
+        if os.path.exists(self.metadata_path):
+            os.remove(self.metadata_path)
+        get_storage_format("parquet").write(df, self.data_path)
+        metadata = {
+            "fingerprint": fingerprint,
+            "rules_version": rules_version,
+            "rows": len(df)
+        }
+        if cube is not None:
+            cube.save(self.cube_path)
+            metadata["cube_dimensions"] = cube.dimensions
+        
+        tmp_path = f"{self.metadata_path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(metadata, f, indent=2)
+        os.replace(tmp_path, self.metadata_path)
+        logger.info(f"Dataset puntuado guardado en caché: {self.data_path} ({len(df)} filas)")
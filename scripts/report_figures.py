@@ -0,0 +1,165 @@
+"""
+Figuras de la presentación ejecutiva.
+
+Las figuras se dibujan a partir de agregados pequeños (conteos y tablas cruzadas)
+leídos del cubo de alertas del dataset puntuado, por lo que pueden renderizarse
+de forma independiente, en serie o en un pool de procesos con el backend Agg.
+"""
+import os
+import logging
+from concurrent.futures import ProcessPoolExecutor
+
+import matplotlib
+import matplotlib.pyplot as plt
+
+logger = logging.getLogger(__name__)
+
+# Colores por nivel de riesgo usados en las figuras
+RISK_COLORS = ['#ff9999', '#ffcc99', '#99cc99']
+TREND_COLORS = ['#d62728', '#ff7f0e', '#2ca02c']
+
+def apply_base_style():
+    """Configuración global de las visualizaciones de los informes."""
+    import seaborn as sns
+    
+    plt.style.use('ggplot')
+    sns.set(style="whitegrid")
+    plt.rcParams['figure.figsize'] = (10, 6)
+    plt.rcParams['font.size'] = 12
+
+def apply_presentation_style():
+    """Estilo de los gráficos de la presentación ejecutiva."""
+    plt.style.use('ggplot')
+    plt.rcParams['figure.figsize'] = (12, 7)
+    plt.rcParams['font.size'] = 14
+
+def presentation_figure_data(cube):
+    """
+    Calcula los agregados que necesitan las figuras de la presentación.
+    
+    Args:
+        cube (processors.alert_cube.AlertCube): Cubo de alertas del dataset puntuado.
+    
+    Returns:
+        dict: Agregados por nombre de figura.
+    """
+    return {
+        'risk_distribution.png': cube.counts('nivel_riesgo'),
+        'risk_by_category.png': cube.crosstab('category', 'nivel_riesgo'),
+        'top_countries.png': cube.counts('country_origin').head(10),
+        'risk_trends.png': cube.crosstab('year', 'nivel_riesgo'),
+        'top_hazards.png': cube.counts('hazard_type').head(10),
+    }
+
+def _save(path):
+    """Guarda la figura actual y la cierra."""
+    plt.tight_layout()
+    plt.savefig(path, dpi=150, bbox_inches='tight')
+    plt.close()
+
+def plot_risk_distribution(risk_dist, path):
+    """1. Distribución por nivel de riesgo (pie chart)."""
+    plt.figure(figsize=(10, 7))
+    plt.pie(risk_dist, labels=risk_dist.index, autopct='%1.1f%%', startangle=90, colors=RISK_COLORS)
+    plt.axis('equal')
+    plt.title('Distribución de Alertas por Nivel de Riesgo', fontsize=16)
+    _save(path)
+
+def plot_risk_by_category(risk_by_category, path):
+    """2. Distribución de nivel de riesgo por categoría."""
+    plt.figure(figsize=(14, 8))
+    risk_by_category.plot(kind='bar', stacked=True, color=RISK_COLORS)
+    plt.title('Distribución de Nivel de Riesgo por Categoría de Producto', fontsize=16)
+    plt.xlabel('Categoría de Producto', fontsize=14)
+    plt.ylabel('Número de Alertas', fontsize=14)
+    plt.legend(title='Nivel de Riesgo')
+    plt.xticks(rotation=45, ha='right')
+    _save(path)
+
+def plot_top_countries(top_countries, path):
+    """3. Top países de origen."""
+    plt.figure(figsize=(14, 8))
+    top_countries.plot(kind='bar', color='#8c564b')
+    plt.title('Top 10 Países de Origen con Más Alertas', fontsize=16)
+    plt.xlabel('País de Origen', fontsize=14)
+    plt.ylabel('Número de Alertas', fontsize=14)
+    plt.xticks(rotation=45, ha='right')
+    _save(path)
+
+def plot_risk_trends(year_risk_counts, path):
+    """4. Tendencia temporal de alertas por nivel de riesgo."""
+    plt.figure(figsize=(14, 8))
+    year_risk_counts.plot(kind='line', marker='o', linewidth=2, color=TREND_COLORS)
+    plt.title('Evolución Anual de Alertas por Nivel de Riesgo', fontsize=16)
+    plt.xlabel('Año', fontsize=14)
+    plt.ylabel('Número de Alertas', fontsize=14)
+    plt.legend(title='Nivel de Riesgo')
+    plt.grid(True, linestyle='--', alpha=0.7)
+    _save(path)
+
+def plot_top_hazards(hazard_counts, path):
+    """5. Top tipos de peligros."""
+    plt.figure(figsize=(14, 8))
+    ax = hazard_counts.plot(kind='bar', color=plt.cm.tab10.colors)
+    plt.title('Top 10 Tipos de Peligros Más Frecuentes', fontsize=16)
+    plt.xlabel('Tipo de Peligro', fontsize=14)
+    plt.ylabel('Número de Alertas', fontsize=14)
+    
+    # Truncar etiquetas largas
+    labels = [label.get_text() for label in ax.get_xticklabels()]
+    short_labels = [label[:30] + '...' if len(label) > 30 else label for label in labels]
+    ax.set_xticklabels(short_labels, rotation=45, ha='right')
+    
+    _save(path)
+
+# Función de dibujo de cada figura de la presentación
+PRESENTATION_FIGURES = {
+    'risk_distribution.png': plot_risk_distribution,
+    'risk_by_category.png': plot_risk_by_category,
+    'top_countries.png': plot_top_countries,
+    'risk_trends.png': plot_risk_trends,
+    'top_hazards.png': plot_top_hazards,
+}
+
+def init_render_worker():
+    """Prepara un proceso del pool: backend Agg (sin pantalla) y el mismo estilo que el proceso principal."""
+    matplotlib.use('Agg')
+    apply_base_style()
+    apply_presentation_style()
+
+def _render_figure(filename, data, path):
+    """Dibuja una figura de la presentación (se ejecuta en un proceso del pool)."""
+    PRESENTATION_FIGURES[filename](data, path)
+    return path
+
+def render_presentation_figures(figure_data, output_dir, workers=1):
+    """
+    Dibuja las figuras de la presentación en output_dir.
+    
+    Args:
+        figure_data (dict): Agregados de presentation_figure_data().
+        output_dir (str): Directorio de las imágenes.
+        workers (int, optional): Procesos para dibujar las figuras (1 = en serie, en este proceso).
+    
+    Returns:
+        dict: Ruta de la imagen de cada figura.
+    """
+    paths = {filename: os.path.join(output_dir, filename) for filename in PRESENTATION_FIGURES}
+    
+    if workers <= 1:
+        apply_presentation_style()
+        for filename, plot in PRESENTATION_FIGURES.items():
+            plot(figure_data[filename], paths[filename])
+        return paths
+    
+    with ProcessPoolExecutor(max_workers=min(workers, len(PRESENTATION_FIGURES)),
+                             initializer=init_render_worker) as executor:
+        futures = [
+            executor.submit(_render_figure, filename, figure_data[filename], paths[filename])
+            for filename in PRESENTATION_FIGURES
+        ]
+        for future in futures:
+            future.result()
+    
+    logger.info(f"Figuras de la presentación generadas en paralelo ({workers} procesos)")
+    return paths
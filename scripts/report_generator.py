@@ -15,14 +15,14 @@ Uso:
 """
 
 import os
+import sys
 import argparse
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
 from datetime import datetime
 import re
 import subprocess
+import time
 import logging
 import warnings
 from matplotlib.patches import Patch
@@ -33,12 +33,6 @@ warnings.filterwarnings('ignore')
 # Configuración de logging
 logger = logging.getLogger(__name__)
 
-# Configuración global para visualizaciones
-plt.style.use('ggplot')
-sns.set(style="whitegrid")
-plt.rcParams['figure.figsize'] = (10, 6)
-plt.rcParams['font.size'] = 12
-
 # Constantes para rutas de archivos
 PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 DATA_DIR = os.path.join(PROJECT_ROOT, 'data')
@@ -46,24 +40,188 @@ FINAL_DATA_DIR = os.path.join(DATA_DIR, 'final')
 NOTEBOOKS_DIR = os.path.join(PROJECT_ROOT, 'notebooks')
 REPORTS_DIR = os.path.join(PROJECT_ROOT, 'reports')
 
+# Añadir el directorio raíz al path para importar los módulos del proyecto
+if PROJECT_ROOT not in sys.path:
+    sys.path.append(PROJECT_ROOT)
+
+from config.settings import (
+    FINAL_DATASET_FILENAME, CONSOLIDATED_STORE_DIRNAME, EXCEL_ENGINE, REPORT_RENDER_WORKERS,
+    REPORT_CONCURRENT, NOTEBOOK_CONVERSION_TIMEOUT
+)
+from processors.data_merger import load_consolidated_dataset
+from processors.alert_cube import AlertCube, REPORT_CUBE_DIMENSIONS
+from utils.date_utils import parse_date_column
+from scripts.report_cache import ScoredDatasetCache, dataset_fingerprint, ROW_SCORE_COLUMNS
+from scripts.excel_streaming import write_streaming_workbook
+from scripts.report_figures import apply_base_style, presentation_figure_data, render_presentation_figures
+
+# Configuración global para visualizaciones
+apply_base_style()
+
+# Versión de las reglas de clasificación de riesgos; cambiarla invalida la caché de puntuaciones
+SCORING_RULES_VERSION = "1"
+
+# Términos de peligro por nivel de severidad (se comprueban de mayor a menor)
+SEVERITY_TERMS = {
+    # Peligros muy serios (4)
+    4: ['listeria', 'salmonella', 'e. coli', 'escherichia coli', 'botulinum', 
+        'aflatoxin', 'mercury', 'lead', 'cadmium', 'foreign body', 'metal', 
+        'pieces', 'glass', 'cronobacter'],
+    # Peligros serios (3)
+    3: ['undeclared allergen', 'undeclared milk', 'undeclared peanut', 
+        'undeclared soy', 'undeclared wheat', 'undeclared egg', 
+        'undeclared nut', 'undeclared tree', 'pesticide', 'unauthorised substance',
+        'moulds', 'high content', 'ethylene oxide'],
+    # Peligros moderados (2)
+    2: ['labelling', 'organoleptic', 'traces', 
+        'too high count', 'presence', 'migration'],
+}
+
+# Un patrón por nivel (subcadenas literales, igual que 'term in hazard')
+SEVERITY_PATTERNS = {
+    level: re.compile('|'.join(re.escape(term) for term in terms))
+    for level, terms in SEVERITY_TERMS.items()
+}
+
+# Umbrales de la puntuación combinada de frecuencia: (0.25, 0.5] Ocasional, (0.5, 0.75] Probable, > 0.75 Frecuente
+PROBABILITY_THRESHOLDS = [0.25, 0.5, 0.75]
+
+def extract_years(dates):
+    """
+    Extrae el año de una columna de fechas (equivale a _extract_year fila a fila).
+    
+    El año se toma de la fecha interpretada (ver utils.date_utils.parse_date_column);
+    solo en los valores que no son una fecha reconocible se busca con la expresión regular.
+    
+    Args:
+        dates (pandas.Series): Fechas como texto o datetime.
+    
+    Returns:
+        pandas.Series: Año como texto, o None si no se encuentra.
+    """
+    parsed = parse_date_column(dates)
+    years = parsed.dt.year
+    # Mismo rango que la expresión regular de _extract_year (19xx y 20xx)
+    valid = years.between(1900, 2099)
+    
+    result = pd.Series(None, index=dates.index, dtype=object)
+    result[valid] = years[valid].astype(int).astype(str)
+    
+    leftovers = parsed.isna() & dates.notna()
+    if leftovers.any():
+        found = dates[leftovers].astype(str).str.extract(r'\b((?:19|20)\d{2})\b', expand=False)
+        result[leftovers] = found.astype(object).where(found.notna(), None)
+    
+    return result
+
+def classify_severity(hazards):
+    """
+    Clasifica la severidad (1-4) de una columna de tipos de peligro.
+    
+    Cada nivel se evalúa con un único patrón compilado sobre la columna completa
+    y np.select asigna el nivel más alto que coincide.
+    
+    Args:
+        hazards (pandas.Series): Tipos de peligro.
+    
+    Returns:
+        numpy.ndarray: Nivel de severidad de cada alerta.
+    """
+    hazard_lower = hazards.astype(object).where(hazards.notna(), "").astype(str).str.lower()
+    levels = sorted(SEVERITY_PATTERNS, reverse=True)
+    conditions = [
+        hazard_lower.str.contains(SEVERITY_PATTERNS[level], regex=True).to_numpy(dtype=bool)
+        for level in levels
+    ]
+    return np.select(conditions, levels, default=1)
+
+def _normalized_frequency(values):
+    """
+    Puntuación de frecuencia de cada alerta: apariciones de su valor / apariciones del valor más frecuente.
+    
+    Los valores nulos se tratan como "Desconocido".
+    """
+    counts = values.value_counts()
+    if counts.empty or counts.max() <= 0:
+        return pd.Series(0.0, index=values.index)
+    
+    keys = values.astype(object).where(values.notna(), "Desconocido")
+    return keys.map(counts / counts.max()).astype(float).fillna(0.0)
+
+def classify_probability(df):
+    """
+    Clasifica la probabilidad (1-4) según la frecuencia del país de origen y del tipo de producto.
+    
+    Args:
+        df (pandas.DataFrame): Alertas con 'country_origin' y 'product_type'.
+    
+    Returns:
+        numpy.ndarray: Nivel de probabilidad de cada alerta.
+    """
+    score_orig = _normalized_frequency(df['country_origin'])
+    score_prod = _normalized_frequency(df['product_type'])
+    
+    # Combinar scores (60% origen, 40% producto)
+    combined_score = (score_orig * 0.6) + (score_prod * 0.4)
+    return np.digitize(combined_score.to_numpy(), PROBABILITY_THRESHOLDS, right=True) + 1
+
+def classify_risk_level(levels):
+    """
+    Clasifica el nivel de riesgo (severidad x probabilidad) en Bajo, Moderado o Alto.
+    
+    Args:
+        levels (pandas.Series): Producto de severidad y probabilidad.
+    
+    Returns:
+        pandas.Series: Nivel de riesgo de cada alerta.
+    """
+    labels = np.select([levels <= 4, levels <= 8], ['Bajo', 'Moderado'], default='Alto')
+    return pd.Series(labels, index=levels.index, dtype=object)
+
+def default_data_path():
+    """
+    Devuelve la ruta por defecto del dataset consolidado.
+    
+    Se usa el almacén particionado si existe y, si no, el CSV consolidado heredado.
+    """
+    store_dir = os.path.join(FINAL_DATA_DIR, CONSOLIDATED_STORE_DIRNAME)
+    if os.path.isdir(store_dir):
+        return store_dir
+    return os.path.join(FINAL_DATA_DIR, FINAL_DATASET_FILENAME)
+
 class AlertReportGenerator:
     """Clase para generar informes basados en el análisis de riesgos alimentarios"""
     
-    def __init__(self, data_path=None, output_dir=None, notebook_path=None):
+    def __init__(self, data_path=None, output_dir=None, notebook_path=None, use_cache=True, cache_dir=None,
+                 excel_engine=EXCEL_ENGINE, render_workers=REPORT_RENDER_WORKERS,
+                 concurrent_reports=REPORT_CONCURRENT, notebook_timeout=NOTEBOOK_CONVERSION_TIMEOUT):
         """
         Inicializa el generador de informes
         
         Args:
-            data_path (str): Ruta al archivo CSV de alertas alimentarias
+            data_path (str): Ruta al almacén consolidado o a un archivo CSV de alertas alimentarias
             output_dir (str): Directorio donde se guardarán los informes
             notebook_path (str): Ruta al notebook de análisis
+            use_cache (bool): Si es True, reutiliza el dataset puntuado en caché
+            cache_dir (str): Directorio de la caché de puntuaciones (por defecto, data/final/report_cache)
+            excel_engine (str): "streaming" (openpyxl write_only) u "openpyxl" (libro completo en memoria)
+            render_workers (int): Procesos para dibujar las figuras de la presentación (1 = secuencial)
+            concurrent_reports (bool): Si es True, generate_report('all') genera los tres informes a la vez
+            notebook_timeout (float): Segundos máximos de la conversión del notebook (None = sin límite)
         """
         # Configurar rutas por defecto si no se especifican
-        self.data_path = data_path or os.path.join(FINAL_DATA_DIR, 'consolidated_bakery_dairy_alerts.csv')
+        self.data_path = data_path or default_data_path()
         self.output_dir = output_dir or REPORTS_DIR
         self.notebook_path = notebook_path or os.path.join(NOTEBOOKS_DIR, 'food_risk_analysis.ipynb')
         
         self.df = None
+        self._cube = None
+        self.cache = ScoredDatasetCache(cache_dir) if use_cache else None
+        self.excel_engine = excel_engine
+        self.render_workers = render_workers
+        self.concurrent_reports = concurrent_reports
+        self.notebook_timeout = notebook_timeout
+        self.report_timings = {}
         self.report_date = datetime.now().strftime('%Y-%m-%d')
         
         # Crear directorios de salida si no existen
@@ -97,41 +255,112 @@ class AlertReportGenerator:
             return False
         
         try:
-            # Cargar datos
-            self.df = pd.read_csv(self.data_path)
+            # Reutilizar el dataset puntuado si ni los datos ni las reglas han cambiado
+            fingerprint = dataset_fingerprint(self.data_path) if self.cache else None
+            if self.cache:
+                cached_df = self.cache.load(fingerprint, SCORING_RULES_VERSION)
+                if cached_df is not None:
+                    self.df = cached_df
+                    self._cube = self.cache.load_cube(fingerprint, SCORING_RULES_VERSION)
+                    logger.info(f"Datos cargados de la caché de puntuaciones: {len(self.df)} alertas")
+                    return True
             
-            # Extraer año de la fecha
-            self.df['year'] = self.df['date'].apply(self._extract_year)
+            # Cargar datos y clasificar riesgos
+            self.df = load_consolidated_dataset(self.data_path)
+            self.score_dataset()
             
-            # Clasificar severidad
-            self.df['severidad_num'] = self.df['hazard_type'].apply(self._clasificar_severidad)
+            logger.info(f"Datos procesados: {len(self.df)} alertas analizadas")
             
-            # Calcular frecuencias para probabilidad
+            if self.cache:
+                try:
+                    self.cache.save(self.df, fingerprint, SCORING_RULES_VERSION, cube=self.alert_cube)
+                except Exception as e:
+                    logger.warning(f"No se pudo guardar la caché de puntuaciones: {e}")
+            return True
+        
+        except Exception as e:
+            logger.error(f"Error al procesar datos: {str(e)}")
+            return False
+    
+    @property
+    def alert_cube(self):
+        """
+        Cubo de alertas pre-agregado del dataset puntuado (ver processors.alert_cube).
+        
+        Todos los totales y distribuciones de los informes se leen del cubo, que se
+        construye en una sola pasada la primera vez que se necesita.
+        """
+        if self._cube is None:
+            self._cube = AlertCube.build(self.df, REPORT_CUBE_DIMENSIONS)
+        return self._cube
+    
+    def score_dataset(self, vectorized=True):
+        """
+        Clasifica los riesgos de las alertas de self.df (año, severidad, probabilidad y nivel de riesgo).
+        
+        Args:
+            vectorized (bool): Si es True, clasifica con operaciones sobre columnas completas.
+                Si es False, usa la clasificación fila a fila original.
+        """
+        # Puntuaciones por alerta (año y severidad): solo para las alertas no puntuadas antes
+        self._score_alerts(vectorized)
+        self._cube = None
+        
+        # Clasificar probabilidad (depende de las frecuencias de todo el dataset)
+        if vectorized:
+            self.df['probabilidad_num'] = classify_probability(self.df)
+        else:
             freq_origen = self._calcular_frecuencia_origen()
             freq_producto = self._calcular_frecuencia_producto()
-            
-            # Clasificar probabilidad
             self.df['probabilidad_num'] = self.df.apply(
                 lambda row: self._clasificar_probabilidad(row, freq_origen, freq_producto), 
                 axis=1
             )
-            
-            # Crear etiquetas para severidad y probabilidad
-            self.df['severidad'] = self.df['severidad_num'].map(self.severidad_labels)
-            self.df['probabilidad'] = self.df['probabilidad_num'].map(self.probabilidad_labels)
-            
-            # Calcular nivel de riesgo
-            self.df['nivel_riesgo_num'] = self.df['severidad_num'] * self.df['probabilidad_num']
-            
-            # Clasificar nivel de riesgo
+        
+        # Crear etiquetas para severidad y probabilidad
+        self.df['severidad'] = self.df['severidad_num'].map(self.severidad_labels)
+        self.df['probabilidad'] = self.df['probabilidad_num'].map(self.probabilidad_labels)
+        
+        # Calcular nivel de riesgo
+        self.df['nivel_riesgo_num'] = self.df['severidad_num'] * self.df['probabilidad_num']
+        
+        # Clasificar nivel de riesgo
+        if vectorized:
+            self.df['nivel_riesgo'] = classify_risk_level(self.df['nivel_riesgo_num'])
+        else:
             self.df['nivel_riesgo'] = self.df['nivel_riesgo_num'].apply(self._clasificar_nivel_riesgo)
-            
-            logger.info(f"Datos procesados: {len(self.df)} alertas analizadas")
-            return True
+    
+    def _score_alerts(self, vectorized=True):
+        """
+        Calcula el año y la severidad de cada alerta.
         
-        except Exception as e:
-            logger.error(f"Error al procesar datos: {str(e)}")
-            return False
+        Estas columnas solo dependen de la propia alerta, por lo que las de las
+        alertas ya puntuadas en la caché se reutilizan y solo se calculan las nuevas.
+        
+        Args:
+            vectorized (bool): Si es True, clasifica con operaciones sobre columnas completas.
+        """
+        cached_scores = self.cache.load_row_scores(SCORING_RULES_VERSION) if self.cache else None
+        
+        if cached_scores is None or 'alert_id' not in self.df.columns:
+            pending = pd.Series(True, index=self.df.index)
+        else:
+            alert_ids = self.df['alert_id'].astype(str)
+            pending = ~alert_ids.isin(cached_scores.index)
+            for column in ROW_SCORE_COLUMNS:
+                self.df[column] = alert_ids.map(cached_scores[column])
+        
+        if pending.any():
+            new_alerts = self.df[pending]
+            if vectorized:
+                self.df.loc[pending, 'year'] = extract_years(new_alerts['date'])
+                self.df.loc[pending, 'severidad_num'] = classify_severity(new_alerts['hazard_type'])
+            else:
+                self.df.loc[pending, 'year'] = new_alerts['date'].apply(self._extract_year)
+                self.df.loc[pending, 'severidad_num'] = new_alerts['hazard_type'].apply(self._clasificar_severidad)
+        
+        self.df['severidad_num'] = self.df['severidad_num'].astype(int)
+        logger.info(f"Alertas puntuadas: {int(pending.sum())} nuevas, {int((~pending).sum())} reutilizadas de la caché")
     
     def _extract_year(self, date_str):
         """Extrae el año de una cadena de fecha"""
@@ -150,33 +379,13 @@ class AlertReportGenerator:
         
         hazard_lower = str(hazard_type).lower()
         
-        # Peligros muy serios (4)
-        if any(term in hazard_lower for term in [
-            'listeria', 'salmonella', 'e. coli', 'escherichia coli', 'botulinum', 
-            'aflatoxin', 'mercury', 'lead', 'cadmium', 'foreign body', 'metal', 
-            'pieces', 'glass', 'cronobacter'
-        ]):
-            return 4
-        
-        # Peligros serios (3)
-        elif any(term in hazard_lower for term in [
-            'undeclared allergen', 'undeclared milk', 'undeclared peanut', 
-            'undeclared soy', 'undeclared wheat', 'undeclared egg', 
-            'undeclared nut', 'undeclared tree', 'pesticide', 'unauthorised substance',
-            'moulds', 'high content', 'ethylene oxide'
-        ]):
-            return 3
-        
-        # Peligros moderados (2)
-        elif any(term in hazard_lower for term in [
-            'labelling', 'organoleptic', 'traces', 
-            'too high count', 'presence', 'migration'
-        ]):
-            return 2
+        # Peligros muy serios (4), serios (3) y moderados (2)
+        for level in (4, 3, 2):
+            if any(term in hazard_lower for term in SEVERITY_TERMS[level]):
+                return level
         
         # Por defecto
-        else:
-            return 1
+        return 1
     
     def _calcular_frecuencia_origen(self):
         """Calcula la frecuencia de aparición de cada país de origen"""
@@ -228,6 +437,9 @@ class AlertReportGenerator:
         """
         Genera un informe Excel segmentado por páginas para cada categoría de producto
         
+        Con el motor "streaming" las filas se escriben en orden en un libro write_only
+        (ver scripts.excel_streaming); con "openpyxl" se construye el libro completo en memoria.
+        
         Returns:
             str: Ruta al archivo Excel generado, o None si hubo un error
         """
@@ -244,6 +456,17 @@ class AlertReportGenerator:
             logger.error("Instale con: pip install openpyxl")
             return None
         
+        excel_path = os.path.join(self.output_dir, 'excel', f'informe_riesgos_alimentarios_{self.report_date}.xlsx')
+        
+        if self.excel_engine == 'streaming':
+            try:
+                write_streaming_workbook(self.df, excel_path, self.report_date, cube=self.alert_cube)
+                logger.info(f"Informe Excel generado: {excel_path}")
+                return excel_path
+            except Exception as e:
+                logger.error(f"Error al generar informe Excel: {str(e)}")
+                return None
+        
         try:
             # Crear un nuevo libro de Excel
             wb = openpyxl.Workbook()
@@ -261,7 +484,6 @@ class AlertReportGenerator:
                 self._create_category_sheet(wb, category)
             
             # Guardar el archivo Excel
-            excel_path = os.path.join(self.output_dir, 'excel', f'informe_riesgos_alimentarios_{self.report_date}.xlsx')
             wb.save(excel_path)
             
             logger.info(f"Informe Excel generado: {excel_path}")
@@ -276,6 +498,7 @@ class AlertReportGenerator:
         # Importar clases de openpyxl para asegurar que estén disponibles
         from openpyxl.styles import PatternFill, Font, Alignment, Border, Side
         from openpyxl.chart import BarChart, Reference, PieChart
+        from openpyxl.utils import get_column_letter
         
         ws = wb.create_sheet("Resumen General")
         
@@ -323,7 +546,7 @@ class AlertReportGenerator:
         stats_row += 1
         headers = ["Nivel de Riesgo", "Cantidad", "Porcentaje", ""]
         for i, header in enumerate(headers):
-            col = chr(65 + i)  # A, B, C, D
+            col = get_column_letter(i + 1)  # A, B, C, D
             ws[f'{col}{stats_row}'] = header
             ws[f'{col}{stats_row}'].font = Font(bold=True)
         
@@ -355,7 +578,7 @@ class AlertReportGenerator:
         chart_row += 1
         headers = ["País", "Cantidad", "", ""]
         for i, header in enumerate(headers):
-            col = chr(65 + i)
+            col = get_column_letter(i + 1)
             ws[f'{col}{chart_row}'] = header
             ws[f'{col}{chart_row}'].font = Font(bold=True)
         
@@ -386,7 +609,7 @@ class AlertReportGenerator:
         hazard_row = country_chart_row + 1
         headers = ["Tipo de Peligro", "Cantidad", "", ""]
         for i, header in enumerate(headers):
-            col = chr(65 + i)
+            col = get_column_letter(i + 1)
             ws[f'{col}{hazard_row}'] = header
             ws[f'{col}{hazard_row}'].font = Font(bold=True)
         
@@ -411,6 +634,7 @@ class AlertReportGenerator:
         # Importar clases de openpyxl para asegurar que estén disponibles
         from openpyxl.utils.dataframe import dataframe_to_rows
         from openpyxl.styles import PatternFill, Font, Alignment
+        from openpyxl.utils import get_column_letter
         
         # Filtrar datos para esta categoría
         df_cat = self.df[self.df['category'] == category].copy()
@@ -473,7 +697,7 @@ class AlertReportGenerator:
         stats_row += 1
         headers = ["Nivel de Riesgo", "Cantidad", "Porcentaje", ""]
         for i, header in enumerate(headers):
-            col = chr(65 + i)
+            col = get_column_letter(i + 1)
             ws[f'{col}{stats_row}'] = header
             ws[f'{col}{stats_row}'].font = Font(bold=True)
         
@@ -496,7 +720,7 @@ class AlertReportGenerator:
         trend_row += 1
         headers = ["Año", "Cantidad", "", ""]
         for i, header in enumerate(headers):
-            col = chr(65 + i)
+            col = get_column_letter(i + 1)
             ws[f'{col}{trend_row}'] = header
             ws[f'{col}{trend_row}'].font = Font(bold=True)
         
@@ -516,7 +740,7 @@ class AlertReportGenerator:
         country_row += 1
         headers = ["País", "Cantidad", "Porcentaje", ""]
         for i, header in enumerate(headers):
-            col = chr(65 + i)
+            col = get_column_letter(i + 1)
             ws[f'{col}{country_row}'] = header
             ws[f'{col}{country_row}'].font = Font(bold=True)
         
@@ -544,7 +768,7 @@ class AlertReportGenerator:
         data_row += 1
         for r_idx, row in enumerate(dataframe_to_rows(df_display, index=False, header=True)):
             for c_idx, value in enumerate(row):
-                cell = ws[f'{chr(65+c_idx)}{data_row+r_idx}']
+                cell = ws[f'{get_column_letter(c_idx+1)}{data_row+r_idx}']
                 cell.value = value
                 
                 # Dar formato a los encabezados
@@ -578,6 +802,18 @@ class AlertReportGenerator:
         Returns:
             str: Ruta al archivo PDF (o HTML) generado, o None si hubo un error
         """
+        conversion = self._start_notebook_conversion()
+        if conversion is None:
+            return None
+        return self._finish_notebook_pdf(*conversion)
+    
+    def _start_notebook_conversion(self):
+        """
+        Lanza la conversión del notebook a HTML con nbconvert sin esperar a que termine.
+        
+        Returns:
+            tuple: (subprocess.Popen, ruta del HTML), o None si no se pudo lanzar
+        """
         logger.info("Generando PDF del notebook...")
         
         # Verificar que existe
@@ -585,44 +821,68 @@ class AlertReportGenerator:
             logger.error(f"Error: No se encuentra el notebook en {self.notebook_path}")
             return None
         
+        # Convertir a HTML primero (es más confiable que directamente a PDF)
+        html_output = os.path.join(self.output_dir, 'pdf', 'notebook_temp.html')
+        cmd_html = [
+            'jupyter', 'nbconvert', 
+            '--to', 'html', 
+            '--output', html_output,
+            self.notebook_path
+        ]
+        
         try:
-            # Convertir a HTML primero (es más confiable que directamente a PDF)
-            html_output = os.path.join(self.output_dir, 'pdf', 'notebook_temp.html')
-            cmd_html = [
-                'jupyter', 'nbconvert', 
-                '--to', 'html', 
-                '--output', html_output,
-                self.notebook_path
-            ]
-            
-            subprocess.run(cmd_html, check=True)
-            
-            # Convertir HTML a PDF usando weasyprint
-            try:
-                from weasyprint import HTML
-                pdf_path = os.path.join(self.output_dir, 'pdf', f'analisis_riesgos_alimentarios_{self.report_date}.pdf')
-                HTML(html_output).write_pdf(pdf_path)
-                logger.info(f"PDF del notebook generado: {pdf_path}")
-                
-                # Eliminar HTML temporal
-                os.remove(html_output)
-                
-                return pdf_path
+            return subprocess.Popen(cmd_html), html_output
+        except Exception as e:
+            logger.error(f"Error al generar PDF: {str(e)}")
+            return None
+    
+    def _finish_notebook_pdf(self, process, html_output):
+        """
+        Espera a la conversión del notebook y convierte el HTML a PDF con WeasyPrint.
+        
+        Si nbconvert no termina en self.notebook_timeout segundos, se mata el proceso
+        y la conversión se da por fallida.
+        
+        Args:
+            process (subprocess.Popen): Proceso de nbconvert.
+            html_output (str): Ruta del HTML generado por nbconvert.
+        
+        Returns:
+            str: Ruta al archivo PDF (o HTML) generado, o None si hubo un error
+        """
+        try:
+            returncode = process.wait(timeout=self.notebook_timeout)
+        except subprocess.TimeoutExpired:
+            logger.error(f"Error al generar PDF: nbconvert no terminó en {self.notebook_timeout} s")
+            process.kill()
+            process.wait()
+            return None
+        if returncode != 0:
+            logger.error(f"Error al generar PDF: nbconvert terminó con código {returncode}")
+            return None
+        
+        # Convertir HTML a PDF usando weasyprint
+        try:
+            from weasyprint import HTML
+            pdf_path = os.path.join(self.output_dir, 'pdf', f'analisis_riesgos_alimentarios_{self.report_date}.pdf')
+            HTML(html_output).write_pdf(pdf_path)
+            logger.info(f"PDF del notebook generado: {pdf_path}")
             
-            except ImportError:
-                logger.warning("WeasyPrint no está instalado. Se generará solo el HTML.")
-                logger.warning("Instale con: pip install weasyprint")
-                logger.info(f"HTML del notebook generado: {html_output}")
-                return html_output
+            # Eliminar HTML temporal
+            os.remove(html_output)
             
-            except Exception as e:
-                logger.error(f"Error al generar PDF con WeasyPrint: {str(e)}")
-                logger.info(f"HTML del notebook generado como alternativa: {html_output}")
-                return html_output
+            return pdf_path
+        
+        except ImportError:
+            logger.warning("WeasyPrint no está instalado. Se generará solo el HTML.")
+            logger.warning("Instale con: pip install weasyprint")
+            logger.info(f"HTML del notebook generado: {html_output}")
+            return html_output
         
         except Exception as e:
-            logger.error(f"Error al generar PDF: {str(e)}")
-            return None
+            logger.error(f"Error al generar PDF con WeasyPrint: {str(e)}")
+            logger.info(f"HTML del notebook generado como alternativa: {html_output}")
+            return html_output
 
     def generate_executive_presentation(self):
         """
@@ -647,6 +907,7 @@ class AlertReportGenerator:
             
             # Generar figuras para la presentación
             self._generate_presentation_figures(temp_dir)
+            cube = self.alert_cube
             
             # Establecer margen pequeño para mejor maquetación
             class PDF(FPDF):
@@ -688,17 +949,17 @@ class AlertReportGenerator:
             pdf.cell(0, 10, "Estadísticas Principales", ln=True)
             pdf.ln(5)
             pdf.set_font('Arial', '', 12)
-            pdf.cell(0, 10, f"Total de alertas analizadas: {len(self.df)}", ln=True)
+            pdf.cell(0, 10, f"Total de alertas analizadas: {cube.total}", ln=True)
             
             # Distribución por nivel de riesgo
-            risk_dist = self.df['nivel_riesgo'].value_counts()
+            risk_dist = cube.counts('nivel_riesgo')
             pdf.ln(5)
             pdf.set_font('Arial', 'B', 14)
             pdf.cell(0, 10, "Distribución por nivel de riesgo:", ln=True)
             pdf.set_font('Arial', '', 12)
             
             for nivel, count in risk_dist.items():
-                pdf.cell(0, 10, f"- {nivel}: {count} alertas ({count/len(self.df)*100:.1f}%)", ln=True)
+                pdf.cell(0, 10, f"- {nivel}: {count} alertas ({count/cube.total*100:.1f}%)", ln=True)
             
             # Añadir gráfico de distribución de riesgo
             pdf.ln(5)
@@ -718,8 +979,7 @@ class AlertReportGenerator:
             
             pdf.ln(120)  # Espacio para la imagen
             pdf.set_font('Arial', '', 12)
-            high_risk = self.df[self.df['nivel_riesgo'] == 'Alto']
-            high_risk_cat = high_risk['category'].value_counts().head(3)
+            high_risk_cat = cube.filter(nivel_riesgo='Alto').counts('category').head(3)
             
             pdf.set_font('Arial', 'B', 14)
             pdf.cell(0, 10, "Top 3 categorías con mayor número de alertas de alto riesgo:", ln=True)
@@ -741,7 +1001,7 @@ class AlertReportGenerator:
             pdf.image(os.path.join(temp_dir, 'top_countries.png'), x=15, y=50, w=260)
             
             pdf.ln(120)  # Espacio para la imagen
-            top_countries = self.df['country_origin'].value_counts().head(5)
+            top_countries = cube.counts('country_origin').head(5)
             
             pdf.set_font('Arial', 'B', 14)
             pdf.cell(0, 10, "Top 5 países de origen con más alertas:", ln=True)
@@ -779,7 +1039,7 @@ class AlertReportGenerator:
             pdf.image(os.path.join(temp_dir, 'top_hazards.png'), x=15, y=50, w=260)
             
             pdf.ln(120)  # Espacio para la imagen
-            top_hazards_all = self.df['hazard_type'].dropna().value_counts().head(5)
+            top_hazards_all = cube.counts('hazard_type').head(5)
             
             pdf.set_font('Arial', 'B', 14)
             pdf.cell(0, 10, "Top 5 tipos de peligros más frecuentes:", ln=True)
@@ -857,84 +1117,54 @@ class AlertReportGenerator:
             return None
     
     def _generate_presentation_figures(self, temp_dir):
-        """Genera figuras para la presentación ejecutiva"""
-        # Configurar estilo para gráficos de presentación
-        plt.style.use('ggplot')
-        plt.rcParams['figure.figsize'] = (12, 7)
-        plt.rcParams['font.size'] = 14
-        
-        # 1. Distribución por nivel de riesgo (pie chart)
-        risk_dist = self.df['nivel_riesgo'].value_counts()
+        """
+        Genera figuras para la presentación ejecutiva
         
-        plt.figure(figsize=(10, 7))
-        colors = ['#ff9999', '#ffcc99', '#99cc99']
-        plt.pie(risk_dist, labels=risk_dist.index, autopct='%1.1f%%', startangle=90, colors=colors)
-        plt.axis('equal')
-        plt.title('Distribución de Alertas por Nivel de Riesgo', fontsize=16)
-        plt.tight_layout()
-        plt.savefig(os.path.join(temp_dir, 'risk_distribution.png'), dpi=150, bbox_inches='tight')
-        plt.close()
-        
-        # 2. Distribución de nivel de riesgo por categoría
-        risk_by_category = pd.crosstab(self.df['category'], self.df['nivel_riesgo'])
-        
-        plt.figure(figsize=(14, 8))
-        risk_by_category.plot(kind='bar', stacked=True, color=colors)
-        plt.title('Distribución de Nivel de Riesgo por Categoría de Producto', fontsize=16)
-        plt.xlabel('Categoría de Producto', fontsize=14)
-        plt.ylabel('Número de Alertas', fontsize=14)
-        plt.legend(title='Nivel de Riesgo')
-        plt.xticks(rotation=45, ha='right')
-        plt.tight_layout()
-        plt.savefig(os.path.join(temp_dir, 'risk_by_category.png'), dpi=150, bbox_inches='tight')
-        plt.close()
-        
-        # 3. Top países de origen
-        top_countries = self.df['country_origin'].value_counts().head(10)
-        
-        plt.figure(figsize=(14, 8))
-        top_countries.plot(kind='bar', color='#8c564b')
-        plt.title('Top 10 Países de Origen con Más Alertas', fontsize=16)
-        plt.xlabel('País de Origen', fontsize=14)
-        plt.ylabel('Número de Alertas', fontsize=14)
-        plt.xticks(rotation=45, ha='right')
-        plt.tight_layout()
-        plt.savefig(os.path.join(temp_dir, 'top_countries.png'), dpi=150, bbox_inches='tight')
-        plt.close()
-        
-        # 4. Tendencia temporal de alertas por nivel de riesgo
-        df_year_risk = self.df[self.df['year'].notna()].copy()
-        year_risk_counts = pd.crosstab(df_year_risk['year'], df_year_risk['nivel_riesgo'])
-        
-        plt.figure(figsize=(14, 8))
-        year_risk_counts.plot(kind='line', marker='o', linewidth=2, color=['#d62728', '#ff7f0e', '#2ca02c'])
-        plt.title('Evolución Anual de Alertas por Nivel de Riesgo', fontsize=16)
-        plt.xlabel('Año', fontsize=14)
-        plt.ylabel('Número de Alertas', fontsize=14)
-        plt.legend(title='Nivel de Riesgo')
-        plt.grid(True, linestyle='--', alpha=0.7)
-        plt.tight_layout()
-        plt.savefig(os.path.join(temp_dir, 'risk_trends.png'), dpi=150, bbox_inches='tight')
-        plt.close()
-        
-        # 5. Top tipos de peligros
-        hazard_counts = self.df['hazard_type'].dropna().value_counts().head(10)
-        
-        plt.figure(figsize=(14, 8))
-        ax = hazard_counts.plot(kind='bar', color=plt.cm.tab10.colors)
-        plt.title('Top 10 Tipos de Peligros Más Frecuentes', fontsize=16)
-        plt.xlabel('Tipo de Peligro', fontsize=14)
-        plt.ylabel('Número de Alertas', fontsize=14)
-        
-        # Truncar etiquetas largas
-        labels = [label.get_text() for label in ax.get_xticklabels()]
-        short_labels = [label[:30] + '...' if len(label) > 30 else label for label in labels]
-        ax.set_xticklabels(short_labels, rotation=45, ha='right')
-        
-        plt.tight_layout()
-        plt.savefig(os.path.join(temp_dir, 'top_hazards.png'), dpi=150, bbox_inches='tight')
-        plt.close()
+        Los agregados se calculan una vez en este proceso; con render_workers > 1
+        las figuras se dibujan en paralelo en un pool de procesos (ver scripts.report_figures).
+        """
+        return render_presentation_figures(
+            presentation_figure_data(self.alert_cube), temp_dir, workers=self.render_workers
+        )
 
+    def _timed_report(self, generate, *args):
+        """Ejecuta la generación de un informe y devuelve (resultado, segundos)."""
+        start = time.perf_counter()
+        result = generate(*args)
+        return result, time.perf_counter() - start
+    
+    def _generate_all_concurrently(self):
+        """
+        Genera los tres informes a la vez a partir del dataset ya puntuado.
+        
+        La conversión del notebook (nbconvert) se lanza primero como subproceso y,
+        mientras se ejecuta, el Excel y la presentación ejecutiva se generan en este
+        proceso a partir del dataset ya puntuado. En self.report_timings solo se guarda
+        el tiempo de los informes generados correctamente (el del notebook, desde que
+        se lanza la conversión hasta que está el PDF); 'total' es el tiempo real transcurrido.
+        
+        Returns:
+            dict: Rutas de los informes generados ('excel', 'notebook_pdf', 'executive')
+        """
+        start = time.perf_counter()
+        conversion = self._start_notebook_conversion()
+        
+        results = {}
+        timings = {}
+        results['excel'], timings['excel'] = self._timed_report(self.generate_excel_report)
+        results['executive'], timings['executive'] = self._timed_report(self.generate_executive_presentation)
+        
+        # El notebook se ha estado convirtiendo mientras tanto: solo queda esperar y pasar a PDF
+        results['notebook_pdf'] = self._finish_notebook_pdf(*conversion) if conversion else None
+        timings['notebook_pdf'] = time.perf_counter() - start
+        
+        for name in ('excel', 'notebook_pdf', 'executive'):
+            if results[name] is not None:
+                self.report_timings[name] = timings[name]
+        self.report_timings['total'] = time.perf_counter() - start
+        
+        return {name: results[name] for name in ('excel', 'notebook_pdf', 'executive')}
+    
     def generate_report(self, report_type='all'):
         """
         Interfaz principal para generar todos o un tipo específico de informe
@@ -952,21 +1182,27 @@ class AlertReportGenerator:
         
         # Generar informes según lo solicitado
         if report_type == 'all':
-            excel_path = self.generate_excel_report()
-            pdf_path = self.generate_notebook_pdf()
-            executive_path = self.generate_executive_presentation()
-            
-            results = {
-                'excel': excel_path,
-                'notebook_pdf': pdf_path,
-                'executive': executive_path
-            }
+            if self.concurrent_reports:
+                results = self._generate_all_concurrently()
+            else:
+                start = time.perf_counter()
+                results = {}
+                for name, generate in [('excel', self.generate_excel_report),
+                                       ('notebook_pdf', self.generate_notebook_pdf),
+                                       ('executive', self.generate_executive_presentation)]:
+                    results[name], seconds = self._timed_report(generate)
+                    if results[name] is not None:
+                        self.report_timings[name] = seconds
+                self.report_timings['total'] = time.perf_counter() - start
             
             # Log de resultados
             logger.info("\nResumen de informes generados:")
-            logger.info(f"1. Informe Excel por categorías: {excel_path}")
-            logger.info(f"2. PDF del notebook completo: {pdf_path}")
-            logger.info(f"3. Presentación ejecutiva: {executive_path}")
+            logger.info(f"1. Informe Excel por categorías: {results['excel']}")
+            logger.info(f"2. PDF del notebook completo: {results['notebook_pdf']}")
+            logger.info(f"3. Presentación ejecutiva: {results['executive']}")
+            logger.info("Tiempos por informe: " + ", ".join(
+                f"{name} {seconds:.1f} s" for name, seconds in self.report_timings.items()
+            ))
             
             # Devolver rutas solo si todos los informes se generaron correctamente
             # Modificado para devolver los resultados incluso si algunos fallaron
@@ -985,11 +1221,20 @@ class AlertReportGenerator:
 def main():
     """Función principal para ejecutar desde línea de comandos"""
     parser = argparse.ArgumentParser(description='Generador de Informes de Riesgo Alimentario')
-    parser.add_argument('--data', type=str, help='Ruta al archivo CSV de datos consolidados')
+    parser.add_argument('--data', type=str, help='Ruta al almacén consolidado o a un archivo CSV de datos consolidados')
     parser.add_argument('--output', type=str, help='Directorio donde se guardarán los informes')
     parser.add_argument('--notebook', type=str, help='Ruta al notebook de análisis')
     parser.add_argument('--type', type=str, choices=['all', 'excel', 'pdf', 'executive'],
                        default='all', help='Tipo de informe a generar')
+    parser.add_argument('--no-cache', dest='use_cache', action='store_false',
+                       help='Recalcular la clasificación de riesgos sin usar la caché de puntuaciones')
+    parser.add_argument('--excel-engine', choices=['streaming', 'openpyxl'], default=EXCEL_ENGINE,
+                       help='Motor del informe Excel: streaming (write_only, memoria constante) u openpyxl (libro en memoria)')
+    parser.add_argument('--render-workers', type=int, default=REPORT_RENDER_WORKERS,
+                       help='Procesos para dibujar las figuras de la presentación (1 = secuencial)')
+    parser.add_argument('--sequential-reports', dest='concurrent_reports', action='store_false',
+                       default=REPORT_CONCURRENT,
+                       help="Con --type all, generar los informes uno tras otro en lugar de a la vez")
     
     args = parser.parse_args()
     
@@ -1007,7 +1252,11 @@ def main():
     report_gen = AlertReportGenerator(
         data_path=args.data,
         output_dir=args.output,
-        notebook_path=args.notebook
+        notebook_path=args.notebook,
+        use_cache=args.use_cache,
+        excel_engine=args.excel_engine,
+        render_workers=args.render_workers,
+        concurrent_reports=args.concurrent_reports
     )
     
     # Generar informe del tipo especificado
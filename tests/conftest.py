@@ -0,0 +1,12 @@
+"""
+Configuración común de las pruebas.
+"""
+import os
+import sys
+
+# Añadir el directorio raíz al path para importaciones
+root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if root_dir not in sys.path:
+    sys.path.insert(0, root_dir)
+
+SAMPLE_FDA_CSV = os.path.join(root_dir, "data", "scraps", "fda_alerts_20250430.csv")
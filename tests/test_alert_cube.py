@@ -0,0 +1,34 @@
+"""
+Pruebas del cubo de alertas de processors.alert_cube.
+
+Los conteos de un cubo recargado de la caché deben coincidir con los del cubo
+recién construido y con value_counts() sobre las alertas, también en los empates.
+"""
+import pandas as pd
+import pytest
+
+from processors.alert_cube import AlertCube, REPORT_CUBE_DIMENSIONS
+
+@pytest.fixture
+def alerts():
+    # Empates en category y source_database con los valores en orden no alfabético
+    return pd.DataFrame({
+        'category': ['seafood', 'dairy', 'seafood', 'dairy', 'bakery'],
+        'nivel_riesgo': ['Alto', 'Bajo', 'Bajo', 'Alto', 'Moderado'],
+        'year': [2025, 2024, 2025, 2024, 2025],
+        'country_origin': ['Spain', 'Italy', 'Italy', 'Spain', None],
+        'source_database': ['RASFF', 'FDA', 'FDA', 'RASFF', 'OTHER'],
+        'hazard_type': ['Listeria', 'Salmonella', 'Listeria', None, 'Allergen'],
+    })
+
+def test_counts_after_reload_match_fresh_cube(tmp_path, alerts):
+    cube = AlertCube.build(alerts, REPORT_CUBE_DIMENSIONS)
+    path = tmp_path / 'alert_cube.parquet'
+    cube.save(path)
+    reloaded = AlertCube.load(path, REPORT_CUBE_DIMENSIONS)
+    
+    for dimension in REPORT_CUBE_DIMENSIONS:
+        expected = alerts[dimension].value_counts()
+        for counts in (cube.counts(dimension), reloaded.counts(dimension)):
+            assert counts.index.tolist() == expected.index.tolist(), dimension
+            assert counts.tolist() == expected.tolist(), dimension
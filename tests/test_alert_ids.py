@@ -0,0 +1,61 @@
+"""
+Pruebas de los identificadores estables de FDA.
+"""
+import pandas as pd
+
+from conftest import SAMPLE_FDA_CSV
+from processors.data_filter import fda_alert_ids, map_to_unified_schema, iter_unified_chunks, _select_fda_rows
+from processors.data_merger import _open_consolidated_store, _append_new_records, stream_into_consolidated_dataset
+from processors.alert_store import AlertStore
+
+def load_sample():
+    return pd.read_csv(SAMPLE_FDA_CSV)
+
+def test_sample_ids_are_unique():
+    df = load_sample()
+    ids = fda_alert_ids(df)
+    assert ids.is_unique
+    assert len(ids) == len(df)
+
+def test_colliding_recalls_keep_distinct_ids():
+    # Filas 382/383 y 576/577: misma fecha, marca, descripción y empresa pero distinto motivo
+    df = load_sample()
+    ids = fda_alert_ids(df)
+    assert ids[383] == ids[382] + "-1"
+    assert ids[577] == ids[576] + "-1"
+
+def test_ids_are_stable_across_scrapes():
+    df = load_sample()
+    # Un scraping posterior añade alertas nuevas al principio del listado
+    newer = pd.concat([df.head(5).assign(Date="05/02/2025"), df], ignore_index=True)
+    assert fda_alert_ids(newer).iloc[5:].tolist() == fda_alert_ids(df).tolist()
+
+def test_row_wise_ids_match_vectorized():
+    df = _select_fda_rows(load_sample())
+    vectorized = map_to_unified_schema(df, pd.DataFrame())
+    row_wise = map_to_unified_schema(df, pd.DataFrame(), vectorized=False)
+    assert vectorized['alert_id'].tolist() == row_wise['alert_id'].tolist()
+
+def test_merge_keeps_every_sample_row(tmp_path):
+    unified = map_to_unified_schema(load_sample(), pd.DataFrame())
+
+    store, index = _open_consolidated_store(str(tmp_path / "store"))
+    try:
+        assert _append_new_records(store, index, unified) == len(unified)
+        # Volver a añadir el mismo scraping no añade nada
+        assert _append_new_records(store, index, unified) == 0
+    finally:
+        index.close()
+
+    assert store.total_rows == len(unified) == 951
+
+def test_streaming_numbers_collisions_across_chunks(tmp_path):
+    # Bloques de 475 filas: la pareja 474/475 (seleccionada por el filtro) queda repartida entre dos bloques
+    batch_ids = map_to_unified_schema(_select_fda_rows(load_sample()), pd.DataFrame())['alert_id']
+    chunks = list(iter_unified_chunks(SAMPLE_FDA_CSV, None, chunksize=475))
+    stream_ids = pd.concat(chunks)['alert_id']
+    assert stream_ids.is_unique
+    assert sorted(stream_ids) == sorted(batch_ids)
+
+    store_dir = stream_into_consolidated_dataset(iter(chunks), str(tmp_path / "store"))
+    assert AlertStore(store_dir).total_rows == len(batch_ids)
@@ -0,0 +1,153 @@
+"""
+Pruebas de las escrituras del almacén consolidado.
+"""
+import os
+
+import pandas as pd
+import pytest
+
+from processors.storage import get_storage_format
+
+def make_alerts(ids):
+    return pd.DataFrame({
+        'alert_id': [f"FDA-{i}" for i in ids],
+        'date': pd.Timestamp("2025-04-01"),
+        'source_database': 'FDA',
+        'category': 'dairy',
+    })
+
+def test_parquet_append_keeps_the_partition_on_failure(tmp_path, monkeypatch):
+    storage = get_storage_format("parquet")
+    path = str(tmp_path / "2025-04.parquet")
+    storage.append(make_alerts(range(3)), path)
+    
+    def failing_to_parquet(self, target, *args, **kwargs):
+        with open(target, 'wb') as f:
+            f.write(b"PAR1 incompleto")
+        raise OSError("disco lleno")
+    
+    monkeypatch.setattr(pd.DataFrame, "to_parquet", failing_to_parquet)
+    with pytest.raises(OSError):
+        storage.append(make_alerts(range(3, 6)), path)
+    monkeypatch.undo()
+    
+    assert storage.read(path)['alert_id'].tolist() == ["FDA-0", "FDA-1", "FDA-2"]
+    assert os.listdir(tmp_path) == ["2025-04.parquet"]
+
+def sample_records():
+    from conftest import SAMPLE_FDA_CSV
+    from processors.data_filter import map_to_unified_schema
+    return map_to_unified_schema(pd.read_csv(SAMPLE_FDA_CSV), pd.DataFrame())
+
+def append_records(store_dir, records):
+    from processors.data_merger import _open_consolidated_store, _append_new_records
+    store, index = _open_consolidated_store(store_dir)
+    try:
+        return _append_new_records(store, index, records)
+    finally:
+        index.close()
+
+def stored_ids(store_dir):
+    from processors.alert_store import AlertStore
+    store = AlertStore(store_dir)
+    ids = store.read_column('alert_id')
+    assert len(ids) == store.total_rows
+    return ids
+
+def staged_files(store_dir):
+    return [name for _, _, names in os.walk(store_dir) for name in names if name.endswith((".staged", ".tmp"))]
+
+def test_failed_append_leaves_no_rows_behind(tmp_path, monkeypatch):
+    from processors.alert_store import AlertStore
+    store_dir = str(tmp_path / "store")
+    records = sample_records()
+    storage_class = type(AlertStore(store_dir).storage)
+    write_appended = storage_class.write_appended
+    calls = []
+    
+    def failing_write_appended(self, df, path, output_path):
+        calls.append(path)
+        if len(calls) == 3:
+            raise OSError("disco lleno")
+        write_appended(self, df, path, output_path)
+    
+    append_records(store_dir, records.iloc[:100])
+    monkeypatch.setattr(storage_class, "write_appended", failing_write_appended)
+    with pytest.raises(OSError):
+        append_records(store_dir, records)
+    monkeypatch.undo()
+    
+    assert len(stored_ids(store_dir)) == 100
+    assert not staged_files(store_dir)
+    
+    append_records(store_dir, records)
+    ids = stored_ids(store_dir)
+    assert ids.is_unique
+    assert len(ids) == len(records)
+
+def test_interrupted_commit_is_completed_on_open(tmp_path, monkeypatch):
+    from processors.alert_store import AlertStore
+    store_dir = str(tmp_path / "store")
+    records = sample_records()
+    append_records(store_dir, records.iloc[:100])
+    
+    def interrupted_replay(self, journal):
+        raise KeyboardInterrupt
+    
+    monkeypatch.setattr(AlertStore, "_replay_journal", interrupted_replay)
+    with pytest.raises(KeyboardInterrupt):
+        append_records(store_dir, records)
+    monkeypatch.undo()
+    
+    ids = stored_ids(store_dir)
+    assert len(ids) == len(records)
+    assert not staged_files(store_dir)
+    
+    assert append_records(store_dir, records) == 0
+    assert stored_ids(store_dir).is_unique
+
+def partition_rows(store_dir):
+    from processors.alert_store import AlertStore
+    store = AlertStore(store_dir)
+    return {key: (entry["rows"], len(store.storage.read(os.path.join(store_dir, *entry["path"].split("/")))))
+            for key, entry in store.manifest["partitions"].items()}
+
+def test_failed_rewrite_keeps_partitions_and_manifest(tmp_path):
+    from processors.alert_store import AlertStore
+    store_dir = str(tmp_path / "store")
+    append_records(store_dir, sample_records())
+    before = partition_rows(store_dir)
+    assert len(before) > 2
+    calls = []
+    
+    def failing_transform(df):
+        calls.append(len(df))
+        if len(calls) == 2:
+            raise OSError("disco lleno")
+        return df.iloc[:-1]
+    
+    with pytest.raises(OSError):
+        AlertStore(store_dir).rewrite_partitions(failing_transform, metadata={"migrated": True})
+    
+    assert partition_rows(store_dir) == before
+    assert not staged_files(store_dir)
+    assert AlertStore(store_dir).get_metadata("migrated") is None
+
+def test_interrupted_rewrite_is_completed_on_open(tmp_path, monkeypatch):
+    from processors.alert_store import AlertStore
+    store_dir = str(tmp_path / "store")
+    append_records(store_dir, sample_records())
+    before = partition_rows(store_dir)
+    
+    def interrupted_replay(self, journal):
+        raise KeyboardInterrupt
+    
+    monkeypatch.setattr(AlertStore, "_replay_journal", interrupted_replay)
+    with pytest.raises(KeyboardInterrupt):
+        AlertStore(store_dir).rewrite_partitions(lambda df: df.iloc[:-1], metadata={"migrated": True})
+    monkeypatch.undo()
+    
+    after = partition_rows(store_dir)
+    assert after == {key: (rows - 1, rows - 1) for key, (rows, _) in before.items()}
+    assert not staged_files(store_dir)
+    assert AlertStore(store_dir).get_metadata("migrated") is True
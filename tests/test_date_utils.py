@@ -0,0 +1,40 @@
+"""
+Pruebas de la interpretación de columnas de fechas de utils.date_utils.
+
+Una columna en la que todas las fechas son ambiguas (día y mes <= 12) debe
+interpretarse con el formato esperado de su fuente: mes primero para FDA y día
+primero para RASFF.
+"""
+import os
+
+import pandas as pd
+import pytest
+
+from processors.data_filter import map_to_unified_schema
+from utils.date_utils import FDA_DATE_FORMATS, RASFF_DATE_FORMATS, detect_date_format, parse_date_column
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+AMBIGUOUS_DATES = pd.Series(['03/04/2025', '01/02/2025', '12/11/2024', None])
+
+def test_ambiguous_column_uses_preferred_format():
+    assert detect_date_format(AMBIGUOUS_DATES) == '%m/%d/%Y'
+    assert detect_date_format(AMBIGUOUS_DATES, preferred=FDA_DATE_FORMATS) == '%m/%d/%Y'
+    assert detect_date_format(AMBIGUOUS_DATES, preferred=RASFF_DATE_FORMATS) == '%d/%m/%Y'
+    
+    parsed = parse_date_column(AMBIGUOUS_DATES, preferred=RASFF_DATE_FORMATS)
+    assert parsed[:3].dt.strftime('%Y-%m-%d').tolist() == ['2025-04-03', '2025-02-01', '2024-11-12']
+    assert pd.isna(parsed[3])
+
+def test_preferred_format_does_not_override_dominant_format():
+    dates = pd.Series(['03/04/2025', '01/25/2025', '02/28/2025'])
+    parsed = parse_date_column(dates, preferred=RASFF_DATE_FORMATS)
+    assert parsed.dt.strftime('%Y-%m-%d').tolist() == ['2025-03-04', '2025-01-25', '2025-02-28']
+
+@pytest.mark.parametrize("vectorized", [True, False])
+def test_ambiguous_rasff_dates_are_day_first(vectorized):
+    rasff_df = pd.read_csv(os.path.join(FIXTURES_DIR, "rasff_alerts_sample.csv")).head(3)
+    rasff_df['date'] = AMBIGUOUS_DATES[:3].tolist()
+    
+    unified = map_to_unified_schema(pd.DataFrame(), rasff_df, vectorized=vectorized)
+    
+    assert unified['date'].dt.strftime('%Y-%m-%d').tolist() == ['2025-04-03', '2025-02-01', '2024-11-12']
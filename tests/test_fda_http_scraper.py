@@ -0,0 +1,50 @@
+"""
+Pruebas del scraper HTTP de FDA contra el servidor local de fixtures.
+"""
+import pandas as pd
+import pytest
+
+from conftest import SAMPLE_FDA_CSV
+from scrapers.fda_fixture_server import start_fixture_server
+from scrapers.fda_http_scraper import FDAHttpScraper
+
+PAGE_SIZE = 50
+
+def read_snapshot(path):
+    return pd.read_csv(path, dtype=str, keep_default_na=False)
+
+@pytest.fixture
+def sample():
+    return read_snapshot(SAMPLE_FDA_CSV)
+
+def scrape(csv_path, output_dir, incremental):
+    server, url = start_fixture_server(str(csv_path))
+    try:
+        scraper = FDAHttpScraper(output_dir=str(output_dir), url=url, page_size=PAGE_SIZE,
+                                 incremental=incremental, fallback=False)
+        assert scraper.run()
+        return read_snapshot(scraper.output_path)
+    finally:
+        server.shutdown()
+
+def test_full_scrape_matches_source(tmp_path, sample):
+    assert scrape(SAMPLE_FDA_CSV, tmp_path, incremental=False).equals(sample)
+
+def test_incremental_rescrape_keeps_colliding_rows(tmp_path, sample):
+    scrape(SAMPLE_FDA_CSV, tmp_path, incremental=False)
+    assert scrape(SAMPLE_FDA_CSV, tmp_path, incremental=True).equals(sample)
+
+def test_incremental_scrape_finds_back_dated_recalls(tmp_path, sample):
+    scrape(SAMPLE_FDA_CSV, tmp_path, incremental=False)
+    
+    # Retiradas nuevas con fecha anterior a la más reciente ya vista, repartidas en dos páginas
+    back_dated = sample.head(PAGE_SIZE + 10).assign(
+        Date="01/15/2020", **{'Company Name': [f"Back-dated {i}" for i in range(PAGE_SIZE + 10)]}
+    )
+    updated = pd.concat([back_dated, sample], ignore_index=True)
+    updated_csv = tmp_path / "updated.csv"
+    updated.to_csv(updated_csv, index=False)
+    
+    snapshot = scrape(updated_csv, tmp_path, incremental=True)
+    assert len(snapshot) == len(updated)
+    assert set(snapshot['Company Name']) >= set(back_dated['Company Name'])
@@ -0,0 +1,84 @@
+"""
+Paridad del filtrado y del esquema unificado con la implementación original.
+
+Los archivos fixtures/baseline_*.csv se generaron con la versión original (fila
+a fila) de processors.data_filter a partir de data/scraps/fda_alerts_20250430.csv
+y de fixtures/rasff_alerts_sample.csv. Las diferencias intencionadas posteriores
+se comparan por su contenido: identificadores estables de FDA (en lugar de la
+posición de la fila), fechas como datetime (en lugar de texto MM/DD/YYYY) y el
+registro original de RASFF como JSON (en lugar de un dict de Python).
+"""
+import io
+import os
+import ast
+import json
+
+import pandas as pd
+import pytest
+
+from conftest import SAMPLE_FDA_CSV
+from processors.data_filter import filter_fda_alerts, filter_rasff_alerts, map_to_unified_schema
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+SAMPLE_RASFF_CSV = os.path.join(FIXTURES_DIR, "rasff_alerts_sample.csv")
+
+# Columnas del esquema unificado que no han cambiado respecto a la implementación original
+UNCHANGED_COLUMNS = [
+    'product_name', 'product_type', 'hazard_type', 'company', 'country_origin',
+    'country_notification', 'source_database', 'details', 'category'
+]
+
+def load_fixture(name):
+    return pd.read_csv(os.path.join(FIXTURES_DIR, name), dtype=str, keep_default_na=False)
+
+def as_text(df, **kwargs):
+    """Texto de cada celda tal como se guardaría en CSV (misma conversión que los fixtures)."""
+    buffer = io.StringIO()
+    df.to_csv(buffer, **kwargs)
+    buffer.seek(0)
+    return pd.read_csv(buffer, dtype=str, keep_default_na=False)
+
+@pytest.fixture(scope="module")
+def baseline_unified():
+    return load_fixture("baseline_unified.csv")
+
+@pytest.mark.parametrize("vectorized", [True, False])
+def test_filter_fda_matches_baseline(vectorized):
+    filtered = filter_fda_alerts(SAMPLE_FDA_CSV, vectorized=vectorized)
+    pd.testing.assert_frame_equal(as_text(filtered, index_label='row'), load_fixture("baseline_fda_filtered.csv"))
+
+@pytest.mark.parametrize("vectorized", [True, False])
+def test_filter_rasff_matches_baseline(vectorized):
+    filtered = filter_rasff_alerts(SAMPLE_RASFF_CSV, vectorized=vectorized)
+    pd.testing.assert_frame_equal(as_text(filtered, index_label='row'), load_fixture("baseline_rasff_filtered.csv"))
+
+@pytest.mark.parametrize("vectorized", [True, False])
+def test_unified_schema_matches_baseline(vectorized, baseline_unified):
+    fda_df = filter_fda_alerts(SAMPLE_FDA_CSV, vectorized=vectorized)
+    rasff_df = filter_rasff_alerts(SAMPLE_RASFF_CSV, vectorized=vectorized)
+    unified = map_to_unified_schema(fda_df, rasff_df, vectorized=vectorized)
+    text = as_text(unified, index=False)
+    
+    assert list(text.columns) == list(baseline_unified.columns)
+    pd.testing.assert_frame_equal(text[UNCHANGED_COLUMNS], baseline_unified[UNCHANGED_COLUMNS])
+    
+    # Fechas: texto MM/DD/YYYY en la versión original, datetime sin hora ahora
+    expected_dates = pd.to_datetime(baseline_unified['date'].replace("", None), format='%m/%d/%Y').astype('datetime64[ns]')
+    pd.testing.assert_series_equal(unified['date'], expected_dates, check_names=False)
+    
+    is_fda = baseline_unified['source_database'] == 'FDA'
+    
+    # Identificadores: los de RASFF no cambian; los de FDA son estables y únicos
+    for column in ['alert_id', 'source_id']:
+        pd.testing.assert_series_equal(text.loc[~is_fda, column], baseline_unified.loc[~is_fda, column])
+    assert text.loc[is_fda, 'alert_id'].str.match(r'^FDA-[0-9a-f]{16}(-\d+)?$').all()
+    assert text['alert_id'].is_unique
+    
+    # Registro original: JSON idéntico en FDA; en RASFF, mismo contenido sin los valores nulos
+    pd.testing.assert_series_equal(text.loc[is_fda, 'original_data'], baseline_unified.loc[is_fda, 'original_data'])
+    for current, original in zip(text.loc[~is_fda, 'original_data'], baseline_unified.loc[~is_fda, 'original_data']):
+        if vectorized:
+            current = {key: value for key, value in json.loads(current).items() if value is not None}
+        else:
+            current = ast.literal_eval(current)
+        assert current == ast.literal_eval(original)
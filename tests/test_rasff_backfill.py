@@ -0,0 +1,84 @@
+"""
+Pruebas del backfill de RASFF por ventanas de fechas (scrapers.rasff_backfill).
+
+Las exportaciones se simulan escribiendo el CSV de cada ventana en un directorio
+de descarga temporal, como haría el navegador.
+"""
+import os
+import tempfile
+from datetime import datetime
+
+import pandas as pd
+import pytest
+
+from scrapers import rasff_backfill
+from scrapers.rasff_backfill import RasffBackfill, window_key
+
+HEADER = "reference,date,subject\n"
+
+class FrozenDatetime(datetime):
+    """datetime cuyo now() devuelve una fecha fija."""
+    today_value = datetime(2025, 4, 30, 15, 30)
+    
+    @classmethod
+    def now(cls, tz=None):
+        return cls.today_value
+
+@pytest.fixture
+def frozen_now(monkeypatch):
+    monkeypatch.setattr(rasff_backfill, "datetime", FrozenDatetime)
+    return FrozenDatetime
+
+def fake_exports(backfill, contents, calls):
+    """Sustituye la descarga por el contenido indicado por ventana (None = fallo)."""
+    def export_window(window):
+        key = window_key(window)
+        calls.append(key)
+        content = contents(key)
+        if content is None:
+            return None
+        download_dir = tempfile.mkdtemp(prefix="rasff_download_", dir=backfill.work_dir)
+        path = os.path.join(download_dir, "export.csv")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(content)
+        return path
+    backfill.export_window = export_window
+
+def window_rows(key):
+    return HEADER + f"2025.{key[:8]},01-02-2025 08:30:00,Alert {key}\n"
+
+def test_rerun_without_end_on_a_later_day_resumes_the_same_backfill(tmp_path, frozen_now, monkeypatch):
+    monkeypatch.setattr(rasff_backfill, "RAW_DATA_DIR", str(tmp_path / "raw"))
+    start = datetime(2024, 1, 1)
+    first = RasffBackfill(start, window_months=3, output_dir=str(tmp_path / "out"))
+    calls = []
+    fake_exports(first, lambda key: None if key.startswith("20240401") else window_rows(key), calls)
+    assert first.run() is None
+    assert len(calls) == 6
+    
+    frozen_now.today_value = datetime(2025, 5, 2, 9, 0)
+    second = RasffBackfill(start, window_months=3, output_dir=str(tmp_path / "out"))
+    calls = []
+    fake_exports(second, window_rows, calls)
+    
+    assert second.work_dir == first.work_dir
+    assert second.end == datetime(2025, 4, 30)
+    assert second.run() is not None
+    assert calls == ["20240401_20240630"]
+
+def test_malformed_lines_and_empty_exports_do_not_fail_windows(tmp_path):
+    backfill = RasffBackfill(datetime(2025, 1, 1), datetime(2025, 3, 31), window_months=1,
+                             work_dir=str(tmp_path / "work"), output_dir=str(tmp_path / "out"))
+    contents = {
+        "20250101_20250131": HEADER + "2025.1,01-01-2025 10:00:00,Ok\n2025.2,bad,line,with,extra,fields\n",
+        "20250201_20250228": "",
+        "20250301_20250331": HEADER,
+    }
+    fake_exports(backfill, contents.get, [])
+    
+    output_path = backfill.run()
+    
+    assert output_path is not None
+    completed = backfill.checkpoint["completed"]
+    assert [completed[key]["rows"] for key in sorted(contents)] == [1, 0, 0]
+    assert pd.read_csv(output_path)["reference"].tolist() == [2025.1]
@@ -0,0 +1,52 @@
+"""
+Pruebas de la generación concurrente de informes de scripts.report_generator.
+
+Comprueban que el Excel y la presentación ejecutiva se generan en el proceso
+principal mientras se convierte el notebook, que solo se registra el tiempo de los informes generados correctamente y
+que una conversión del notebook colgada se mata al vencer el plazo.
+"""
+import os
+import subprocess
+import sys
+
+from scripts.report_generator import AlertReportGenerator
+
+
+class StubReportGenerator(AlertReportGenerator):
+    """Generador con informes simulados: el Excel se genera y la presentación falla."""
+    
+    @property
+    def alert_cube(self):
+        return None
+    
+    def generate_excel_report(self):
+        path = os.path.join(self.output_dir, 'excel', f'informe_{os.getpid()}.xlsx')
+        with open(path, 'w') as f:
+            f.write('excel')
+        return path
+    
+    def generate_executive_presentation(self):
+        return None
+
+
+def test_concurrent_reports_run_in_process_and_time_only_successes(tmp_path):
+    generator = StubReportGenerator(output_dir=str(tmp_path), use_cache=False,
+                                    notebook_path=str(tmp_path / 'no_existe.ipynb'))
+    
+    results = generator._generate_all_concurrently()
+    
+    assert results['executive'] is None
+    assert results['notebook_pdf'] is None
+    assert os.path.exists(results['excel'])
+    assert results['excel'].endswith(f'informe_{os.getpid()}.xlsx')
+    assert set(generator.report_timings) == {'excel', 'total'}
+
+
+def test_notebook_conversion_is_killed_after_timeout(tmp_path):
+    generator = AlertReportGenerator(output_dir=str(tmp_path), use_cache=False, notebook_timeout=0.5)
+    process = subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(60)'])
+    
+    result = generator._finish_notebook_pdf(process, str(tmp_path / 'notebook_temp.html'))
+    
+    assert result is None
+    assert process.returncode is not None
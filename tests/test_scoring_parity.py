@@ -0,0 +1,69 @@
+"""
+Paridad de la clasificación de riesgos con la implementación original.
+
+fixtures/baseline_scores.csv contiene las puntuaciones que asignaba la versión
+original (fila a fila) de AlertReportGenerator.load_and_process_data al dataset
+fixtures/baseline_unified.csv (ver test_filter_parity).
+"""
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from processors.data_merger import load_consolidated_dataset
+from scripts.report_generator import AlertReportGenerator, classify_probability
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+SCORE_COLUMNS = ['year', 'severidad_num', 'severidad', 'probabilidad_num', 'probabilidad',
+                 'nivel_riesgo_num', 'nivel_riesgo']
+
+def make_generator(tmp_path, df):
+    generator = AlertReportGenerator(output_dir=str(tmp_path), use_cache=False)
+    generator.df = df
+    return generator
+
+def as_text(series):
+    return series.astype(object).where(series.notna(), "").astype(str)
+
+@pytest.mark.parametrize("vectorized", [True, False])
+def test_scores_match_baseline(tmp_path, vectorized):
+    generator = make_generator(tmp_path, load_consolidated_dataset(os.path.join(FIXTURES_DIR, "baseline_unified.csv")))
+    generator.score_dataset(vectorized=vectorized)
+    
+    baseline = pd.read_csv(os.path.join(FIXTURES_DIR, "baseline_scores.csv"), dtype=str, keep_default_na=False)
+    scored = generator.df.set_index('alert_id').loc[baseline['alert_id']]
+    
+    # Incluye la alerta sin fecha (año nulo) y las alertas sin tipo de peligro
+    assert (baseline['year'] == "").any()
+    for column in SCORE_COLUMNS:
+        assert as_text(scored[column]).tolist() == baseline[column].tolist(), column
+
+def original_probability(score):
+    """Clasificación original de la puntuación combinada (cadena de comparaciones)."""
+    if score > 0.75:
+        return 4
+    elif score > 0.5:
+        return 3
+    elif score > 0.25:
+        return 2
+    return 1
+
+def test_probability_thresholds_match_original_chain(tmp_path):
+    # Frecuencias 4, 3, 2 y 1 del país y del producto: puntuaciones combinadas 1, 0.75, 0.5 y 0.25 exactas
+    countries = ["A"] * 4 + ["B"] * 3 + ["C"] * 2 + ["D"] + [np.nan]
+    df = pd.DataFrame({
+        'country_origin': countries,
+        'product_type': [f"p{c}" if isinstance(c, str) else c for c in countries],
+    })
+    expected_scores = [1.0] * 4 + [0.75] * 3 + [0.5] * 2 + [0.25] + [0.0]
+    
+    levels = classify_probability(df)
+    assert levels.tolist() == [original_probability(score) for score in expected_scores]
+    assert levels.tolist() == [4] * 4 + [3] * 3 + [2] * 2 + [1, 1]
+    
+    generator = make_generator(tmp_path, df)
+    row_wise = df.apply(lambda row: generator._clasificar_probabilidad(
+        row, df['country_origin'].value_counts().to_dict(), df['product_type'].value_counts().to_dict()
+    ), axis=1)
+    assert levels.tolist() == row_wise.tolist()
@@ -0,0 +1,71 @@
+"""
+Pruebas de la ejecución de los scrapers con tiempo límite.
+"""
+import time
+
+import main
+
+class SleepingScraper:
+    """Scraper de prueba que tarda el tiempo indicado."""
+    
+    def __init__(self, name, seconds):
+        self.name = name
+        self.seconds = seconds
+    
+    def run(self):
+        time.sleep(self.seconds)
+        return True
+
+def run_in_process(monkeypatch, scrapers, max_parallel, timeout):
+    monkeypatch.setattr(main, "create_scrapers", lambda *args, **kwargs: scrapers)
+    start = time.monotonic()
+    ok = main.run_scraper('all', max_parallel=max_parallel, timeout=timeout, in_process=True)
+    return ok, time.monotonic() - start
+
+def test_subprocesses_are_the_default():
+    assert main.SCRAPER_IN_PROCESS is False
+
+def test_hung_scraper_is_abandoned_at_its_own_deadline(monkeypatch):
+    scrapers = [("A", SleepingScraper("a", 60)), ("B", SleepingScraper("b", 0.1)), ("C", SleepingScraper("c", 0.1))]
+    ok, elapsed = run_in_process(monkeypatch, scrapers, max_parallel=2, timeout=1)
+    assert not ok
+    assert elapsed < 5
+
+def test_queued_scrapers_run_after_a_hung_one(monkeypatch):
+    finished = []
+    
+    class RecordingScraper(SleepingScraper):
+        def run(self):
+            super().run()
+            finished.append(self.name)
+            return True
+    
+    scrapers = [("A", SleepingScraper("a", 60)), ("B", RecordingScraper("b", 0.1)), ("C", RecordingScraper("c", 0.1))]
+    ok, elapsed = run_in_process(monkeypatch, scrapers, max_parallel=1, timeout=1)
+    assert not ok
+    assert finished == ["b", "c"]
+    assert elapsed < 5
+
+def write_scraper(tmp_path, body):
+    path = tmp_path / "scraper.py"
+    path.write_text(
+        "import subprocess, sys, time\n"
+        "print('start', flush=True)\n"
+        # El proceso nieto (como Chrome) hereda la salida del scraper
+        "child = subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(60)'])\n"
+        f"{body}\n"
+    )
+    return str(path)
+
+def test_timeout_kills_the_scraper_and_its_children(tmp_path):
+    scraper = write_scraper(tmp_path, "time.sleep(60)")
+    start = time.monotonic()
+    assert not main._run_scraper_process("TEST", scraper, timeout=1)
+    assert time.monotonic() - start < 5
+
+def test_orphaned_children_do_not_block_the_output(tmp_path, monkeypatch):
+    monkeypatch.setattr(main, "SCRAPER_OUTPUT_DRAIN_TIMEOUT", 0.5)
+    scraper = write_scraper(tmp_path, "sys.exit(0)")
+    start = time.monotonic()
+    assert main._run_scraper_process("TEST", scraper, timeout=30)
+    assert time.monotonic() - start < 5
@@ -0,0 +1,43 @@
+"""
+Arranque de main.py sin módulos pesados ni efectos secundarios.
+"""
+import os
+import sys
+import json
+import subprocess
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Módulos que solo se importan al ejecutar las etapas del pipeline
+HEAVY_MODULES = ['pandas', 'numpy', 'matplotlib', 'seaborn', 'openpyxl', 'fpdf', 'selenium',
+                 'scripts.report_generator']
+
+def run_main(argv):
+    """Ejecuta main.py en un intérprete nuevo y devuelve los módulos pesados importados y los efectos secundarios."""
+    code = (
+        "import os, sys, json, runpy, logging\n"
+        "created = []\n"
+        "os.makedirs = lambda path, *args, **kwargs: created.append(str(path))\n"
+        f"sys.argv = ['main.py'] + {argv!r}\n"
+        "try:\n"
+        "    runpy.run_path('main.py', run_name='__main__')\n"
+        "except SystemExit:\n"
+        "    pass\n"
+        f"heavy = [m for m in {HEAVY_MODULES!r} if m in sys.modules]\n"
+        "print(json.dumps({'heavy': heavy, 'makedirs': created, 'handlers': len(logging.getLogger().handlers)}))"
+    )
+    result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True, cwd=ROOT_DIR)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+def test_import_main_is_lightweight():
+    code = f"import sys, json, main; print(json.dumps([m for m in {HEAVY_MODULES!r} if m in sys.modules]))"
+    result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True, cwd=ROOT_DIR)
+    assert json.loads(result.stdout.strip().splitlines()[-1]) == []
+
+def test_help_does_not_load_heavy_modules():
+    effects = run_main(['--help'])
+    assert effects == {'heavy': [], 'makedirs': [], 'handlers': 0}
+
+def test_invalid_arguments_do_not_load_heavy_modules():
+    effects = run_main(['--report-type', 'unknown'])
+    assert effects == {'heavy': [], 'makedirs': [], 'handlers': 0}
@@ -0,0 +1,38 @@
+"""
+Pruebas del modo streaming (processors.data_filter.iter_unified_chunks).
+"""
+import pytest
+
+from conftest import SAMPLE_FDA_CSV
+from processors import data_filter
+from processors.data_filter import iter_unified_chunks
+from processors.data_merger import stream_into_consolidated_dataset
+
+def fail_on_second_chunk(monkeypatch):
+    select_rows = data_filter._select_fda_rows
+    calls = []
+    
+    def failing_select(chunk, *args, **kwargs):
+        calls.append(len(chunk))
+        if len(calls) == 2:
+            raise ValueError("bloque corrupto")
+        return select_rows(chunk, *args, **kwargs)
+    
+    monkeypatch.setattr(data_filter, "_select_fda_rows", failing_select)
+
+def test_chunk_error_is_raised(monkeypatch):
+    fail_on_second_chunk(monkeypatch)
+    chunks = iter_unified_chunks(SAMPLE_FDA_CSV, None, chunksize=300)
+    
+    next(chunks)
+    with pytest.raises(ValueError):
+        next(chunks)
+
+def test_stream_merge_fails_on_chunk_error(tmp_path, monkeypatch):
+    fail_on_second_chunk(monkeypatch)
+    
+    result = stream_into_consolidated_dataset(
+        iter_unified_chunks(SAMPLE_FDA_CSV, None, chunksize=300), str(tmp_path / "store")
+    )
+    
+    assert result is None
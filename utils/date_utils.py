@@ -4,6 +4,46 @@ Utilidades para manejo de fechas.
 from datetime import datetime, timedelta
 import re
 
+import numpy as np
+import pandas as pd
+
+# Formatos de fecha reconocidos, por orden de preferencia
+DATE_FORMATS = [
+    '%m/%d/%Y',          # MM/DD/YYYY (FDA)
+    '%d-%m-%Y %H:%M:%S',  # DD-MM-YYYY HH:MM:SS (RASFF)
+    '%d-%m-%Y',           # DD-MM-YYYY (RASFF sin hora)
+    '%Y-%m-%d',           # YYYY-MM-DD (ISO)
+    '%Y/%m/%d',           # YYYY/MM/DD
+    '%d/%m/%Y',           # DD/MM/YYYY
+    '%b %d, %Y',          # Mmm DD, YYYY (e.g., Jan 01, 2023)
+    '%B %d, %Y',          # Month DD, YYYY (e.g., January 01, 2023)
+    '%d %b %Y',           # DD Mmm YYYY (e.g., 01 Jan 2023)
+    '%d %B %Y'            # DD Month YYYY (e.g., 01 January 2023)
+]
+
+# Formatos esperados de cada fuente: ganan los empates de la detección (por ejemplo,
+# una columna de RASFF en la que todos los días son <= 12 se interpreta como día primero)
+FDA_DATE_FORMATS = ['%m/%d/%Y']
+RASFF_DATE_FORMATS = ['%d-%m-%Y %H:%M:%S', '%d-%m-%Y', '%d/%m/%Y']
+
+# Número de valores distintos usados para detectar el formato dominante de una columna
+DATE_SAMPLE_SIZE = 1000
+
+# Patrones para fechas relativas comunes (compilados una sola vez)
+RELATIVE_DATE_PATTERNS = [
+    # "X days/weeks/months/years ago"
+    (re.compile(r'(\d+)\s+day[s]?\s+ago'), lambda m, now: now - timedelta(days=int(m.group(1)))),
+    (re.compile(r'(\d+)\s+week[s]?\s+ago'), lambda m, now: now - timedelta(weeks=int(m.group(1)))),
+    (re.compile(r'(\d+)\s+month[s]?\s+ago'), lambda m, now: now - timedelta(days=int(m.group(1))*30)),
+    (re.compile(r'(\d+)\s+year[s]?\s+ago'), lambda m, now: now - timedelta(days=int(m.group(1))*365)),
+    
+    # "yesterday", "last week", etc.
+    (re.compile(r'yesterday'), lambda m, now: now - timedelta(days=1)),
+    (re.compile(r'last\s+week'), lambda m, now: now - timedelta(weeks=1)),
+    (re.compile(r'last\s+month'), lambda m, now: now - timedelta(days=30)),
+    (re.compile(r'last\s+year'), lambda m, now: now - timedelta(days=365))
+]
+
 def parse_date(date_str, formats=None):
     """
     Parsea una cadena de fecha a un objeto datetime.
@@ -18,20 +58,9 @@ def parse_date(date_str, formats=None):
     if not date_str:
         return None
     
-    # Si no se proporcionan formatos, usar estos por defecto
+    # Si no se proporcionan formatos, usar los formatos comunes
     if formats is None:
-        formats = [
-            '%m/%d/%Y',          # MM/DD/YYYY (FDA)
-            '%d-%m-%Y %H:%M:%S',  # DD-MM-YYYY HH:MM:SS (RASFF)
-            '%d-%m-%Y',           # DD-MM-YYYY (RASFF sin hora)
-            '%Y-%m-%d',           # YYYY-MM-DD (ISO)
-            '%Y/%m/%d',           # YYYY/MM/DD
-            '%d/%m/%Y',           # DD/MM/YYYY
-            '%b %d, %Y',          # Mmm DD, YYYY (e.g., Jan 01, 2023)
-            '%B %d, %Y',          # Month DD, YYYY (e.g., January 01, 2023)
-            '%d %b %Y',           # DD Mmm YYYY (e.g., 01 Jan 2023)
-            '%d %B %Y'            # DD Month YYYY (e.g., 01 January 2023)
-        ]
+        formats = DATE_FORMATS
     
     # Intentar parsear con cada formato
     for fmt in formats:
@@ -61,29 +90,107 @@ def parse_relative_date(date_str):
     date_str = date_str.lower().strip()
     now = datetime.now()
     
-    # Patrones para fechas relativas comunes
-    patterns = [
-        # "X days/weeks/months/years ago"
-        (r'(\d+)\s+day[s]?\s+ago', lambda m: now - timedelta(days=int(m.group(1)))),
-        (r'(\d+)\s+week[s]?\s+ago', lambda m: now - timedelta(weeks=int(m.group(1)))),
-        (r'(\d+)\s+month[s]?\s+ago', lambda m: now - timedelta(days=int(m.group(1))*30)),
-        (r'(\d+)\s+year[s]?\s+ago', lambda m: now - timedelta(days=int(m.group(1))*365)),
-        
-        # "yesterday", "last week", etc.
-        (r'yesterday', lambda m: now - timedelta(days=1)),
-        (r'last\s+week', lambda m: now - timedelta(weeks=1)),
-        (r'last\s+month', lambda m: now - timedelta(days=30)),
-        (r'last\s+year', lambda m: now - timedelta(days=365))
-    ]
-    
     # Probar cada patrón
-    for pattern, date_func in patterns:
-        match = re.search(pattern, date_str)
+    for pattern, date_func in RELATIVE_DATE_PATTERNS:
+        match = pattern.search(date_str)
         if match:
-            return date_func(match)
+            return date_func(match, now)
     
     return None
 
+def _prefer_formats(formats, preferred):
+    """Devuelve los formatos con los preferidos al principio, en su orden."""
+    if formats is None:
+        formats = DATE_FORMATS
+    if not preferred:
+        return list(formats)
+    return list(preferred) + [fmt for fmt in formats if fmt not in preferred]
+
+def detect_date_format(values, formats=None, sample_size=DATE_SAMPLE_SIZE, preferred=None):
+    """
+    Detecta el formato dominante de una columna de fechas a partir de una muestra.
+    
+    Args:
+        values (pandas.Series): Fechas como texto.
+        formats (list, optional): Formatos candidatos. Por defecto, DATE_FORMATS.
+        sample_size (int, optional): Número de valores distintos de la muestra.
+        preferred (list, optional): Formatos esperados de la fuente (por ejemplo,
+            RASFF_DATE_FORMATS), que ganan los empates a los demás candidatos.
+        
+    Returns:
+        str: Formato que interpreta más valores de la muestra (en caso de empate, el
+            preferido o, si no, el primero de la lista), o None si ninguno interpreta ningún valor.
+    """
+    formats = _prefer_formats(formats, preferred)
+    
+    sample = values.dropna().drop_duplicates().head(sample_size)
+    if sample.empty:
+        return None
+    
+    best_format, best_count = None, 0
+    for fmt in formats:
+        count = int(pd.to_datetime(sample, format=fmt, errors='coerce').notna().sum())
+        if count > best_count:
+            best_format, best_count = fmt, count
+    
+    return best_format
+
+def parse_date_column(values, formats=None, sample_size=DATE_SAMPLE_SIZE, preferred=None):
+    """
+    Convierte una columna de fechas a datetime64 interpretando la columna completa.
+    
+    Se detecta el formato dominante con una muestra y se aplica a todas las fechas
+    distintas de la columna con pd.to_datetime(format=...). Si quedan valores sin
+    interpretar (por ejemplo, al mezclar fuentes con formatos distintos), se repite
+    la detección sobre ellos. Solo los valores que no encajan en ningún formato
+    dominante pasan por parse_date.
+    
+    Si todas las fechas son ambiguas (por ejemplo, 03/04/2025 con día y mes <= 12),
+    varios formatos interpretan la muestra por igual; el empate lo ganan los formatos
+    preferred de la fuente y, si no se indican, el primero de formats.
+    
+    Args:
+        values (pandas.Series): Fechas como texto (o ya como datetime).
+        formats (list, optional): Formatos candidatos. Por defecto, DATE_FORMATS.
+        sample_size (int, optional): Número de valores distintos usados para detectar cada formato.
+        preferred (list, optional): Formatos esperados de la fuente (FDA_DATE_FORMATS,
+            RASFF_DATE_FORMATS), que ganan los empates a los demás candidatos.
+        
+    Returns:
+        pandas.Series: Fechas como datetime64 (NaT si no se pueden interpretar).
+    """
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return values
+    
+    formats = _prefer_formats(formats, preferred)
+    
+    # Cada fecha distinta se interpreta una sola vez
+    text = values.astype(object).where(values.isna(), values.astype(str).str.strip())
+    codes, uniques = pd.factorize(text)
+    uniques = pd.Series(uniques, dtype=object)
+    pending = uniques != ""
+    parsed = pd.Series(pd.NaT, index=uniques.index, dtype='datetime64[ns]')
+    
+    candidates = list(formats)
+    while pending.any() and candidates:
+        fmt = detect_date_format(uniques[pending], candidates, sample_size)
+        if fmt is None:
+            break
+        candidates.remove(fmt)
+        
+        converted = pd.to_datetime(uniques[pending], format=fmt, errors='coerce')
+        parsed.loc[pending] = converted.astype('datetime64[ns]')
+        pending &= parsed.isna()
+    
+    # Valores restantes: ruta lenta
+    if pending.any():
+        fallback = uniques[pending].map(lambda value: parse_date(value, formats))
+        parsed.loc[pending] = pd.to_datetime(fallback, errors='coerce').astype('datetime64[ns]')
+    
+    # Los valores nulos tienen código -1, que toma el NaT añadido al final
+    result = np.append(parsed.to_numpy(), np.datetime64('NaT', 'ns')).take(codes)
+    return pd.Series(result, index=values.index, dtype='datetime64[ns]')
+
 def format_date(date_obj, format_str='%m/%d/%Y'):
     """
     Formatea un objeto datetime como cadena.
@@ -4,6 +4,7 @@ Utilidades para manejo de archivos.
 import os
 import csv
 import json
+import time
 import shutil
 import pandas as pd
 from datetime import datetime
@@ -137,4 +138,49 @@ def is_csv_modified(file_path, last_modified_time):
         return current_modified_time > last_modified_time
     except Exception:
         # Si hay algún error, asumimos que el archivo ha cambiado
-        return True
\ No newline at end of file
+        return True
+
+# Extensiones de archivos de descarga incompletos (Chrome, Firefox y genéricos)
+PARTIAL_DOWNLOAD_SUFFIXES = ('.crdownload', '.part', '.tmp')
+
+def wait_for_download(directory, suffix=".csv", timeout=60, poll_interval=0.2):
+    """
+    Espera a que termine una descarga en un directorio dedicado a ella.
+    
+    La descarga se considera completa cuando existe un archivo con el sufijo
+    indicado, no queda ningún archivo parcial (.crdownload, .part, .tmp) y el
+    tamaño del archivo no cambia entre dos comprobaciones consecutivas.
+    
+    Args:
+        directory (str): Directorio de descarga (vacío antes de iniciar la descarga).
+        suffix (str, optional): Sufijo del archivo esperado.
+        timeout (float, optional): Tiempo máximo de espera en segundos.
+        poll_interval (float, optional): Intervalo entre comprobaciones en segundos.
+        
+    Returns:
+        str: Ruta al archivo descargado, o None si no se completó a tiempo.
+    """
+    deadline = time.monotonic() + timeout
+    last_size = None
+    
+    while time.monotonic() < deadline:
+        try:
+            files = os.listdir(directory)
+        except FileNotFoundError:
+            files = []
+        
+        partial = [f for f in files if f.endswith(PARTIAL_DOWNLOAD_SUFFIXES)]
+        complete = [f for f in files if f.endswith(suffix) and not f.endswith(PARTIAL_DOWNLOAD_SUFFIXES)]
+        
+        if complete and not partial:
+            path = max((os.path.join(directory, f) for f in complete), key=os.path.getmtime)
+            size = os.path.getsize(path)
+            if size > 0 and size == last_size:
+                return path
+            last_size = size
+        else:
+            last_size = None
+        
+        time.sleep(poll_interval)
+    
+    return None